@@ -0,0 +1,216 @@
+"""Time the stages of the autodoc block processor over synthetic packages.
+
+Each stage of `AutodocBlockProcessor` is timed separately, using the
+instrumentation reported by the processor:
+
+* import - `import_from_string` with the package removed from `sys.modules`.
+* descriptor - `ModuleDescriptor.create` (following the module tree).
+* render - `template.render`, or building the elements with the element
+  renderer, excluding the time spent in `md_format`.
+* md_format - the markdown conversion of docstring fragments.
+* parse - `etree.fromstring` of the rendered html. The element renderer has no
+  parse stage, and renders no html.
+
+Usage:
+
+```bash
+python -m benchmarks.bench_autodoc --modules 1,5,10 --classes 10 --output bench.json
+python -m benchmarks.bench_autodoc --renderer element
+```
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+import xml.etree.ElementTree as etree
+
+import markdown
+
+from jetblack_markdown.autodoc import AutodocExtension
+from jetblack_markdown.autodoc_processor import AutodocBlockProcessor
+from jetblack_markdown.instrumentation import (
+    NULL_INSTRUMENTATION,
+    StatsCollector
+)
+
+from .synthetic import PackageSpec, generate_package
+
+STAGES = ['import', 'descriptor', 'render', 'md_format', 'parse']
+
+
+def _create_processor(**kwargs) -> AutodocBlockProcessor:
+    md = markdown.Markdown(extensions=[AutodocExtension(**kwargs)])
+    processor = md.parser.blockprocessors['autodoc']
+    assert isinstance(processor, AutodocBlockProcessor)
+    return processor
+
+
+def _purge_modules(package_name: str) -> None:
+    for name in list(sys.modules):
+        if name == package_name or name.startswith(package_name + '.'):
+            del sys.modules[name]
+
+
+def _summarise(samples: List[float]) -> Dict[str, float]:
+    return {
+        'min': min(samples),
+        'mean': statistics.mean(samples),
+        'median': statistics.median(samples),
+        'max': max(samples),
+    }
+
+
+def time_stages(
+        processor: AutodocBlockProcessor,
+        import_str: str,
+        package_name: str
+) -> Dict[str, Any]:
+    """Time a single pass of the autodoc pipeline.
+
+    Args:
+        processor (AutodocBlockProcessor): The processor to use
+        import_str (str): The import string of the object to document
+        package_name (str): The package to purge before importing
+
+    Returns:
+        Dict[str, Any]: The timing of each stage in seconds and the size of
+            the rendered html
+    """
+    collector = StatsCollector()
+    processor.instrumentation = collector
+    try:
+        _purge_modules(package_name)
+        processor.resolver.clear()
+        parent = etree.Element('div')
+        block = f'@[{import_str}]'
+        assert processor.test(parent, block)
+        processor.run(parent, [block])
+    finally:
+        processor.instrumentation = NULL_INSTRUMENTATION
+
+    report = collector.report()
+    timings = {
+        stage: report['stages'].get(stage, {}).get('total', 0.0)
+        for stage in STAGES
+    }
+    # The markdown formatting happens within the template rendering.
+    timings['render'] -= timings['md_format']
+    return {
+        **timings,
+        'md_format_calls': report['stages']['md_format']['count'],
+        'html_length': report['counters'].get('html_length', 0),
+    }
+
+
+def run_benchmark(
+        spec: PackageSpec,
+        repeat: int,
+        **kwargs
+) -> Dict[str, Any]:
+    """Generate a synthetic package and time the autodoc stages over it.
+
+    Args:
+        spec (PackageSpec): The shape of the package
+        repeat (int): The number of times to repeat the timing
+        **kwargs: Configuration for the autodoc extension
+
+    Returns:
+        Dict[str, Any]: The benchmark results
+    """
+    kwargs.setdefault('follow_module_tree', True)
+    processor = _create_processor(**kwargs)
+
+    with tempfile.TemporaryDirectory() as root:
+        generate_package(root, spec)
+        sys.path.insert(0, root)
+        try:
+            runs = [
+                time_stages(processor, spec.name, spec.name)
+                for _ in range(repeat)
+            ]
+        finally:
+            sys.path.remove(root)
+            _purge_modules(spec.name)
+
+    return {
+        'spec': spec._asdict(),
+        'config': kwargs,
+        'stages': {
+            stage: _summarise([run[stage] for run in runs])
+            for stage in STAGES
+        },
+        'total': _summarise([sum(run[stage] for stage in STAGES) for run in runs]),
+        'md_format_calls': runs[0]['md_format_calls'],
+        'html_length': runs[0]['html_length'],
+    }
+
+
+def _parse_ints(text: str) -> List[int]:
+    return [int(value) for value in text.split(',')]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', type=_parse_ints, default=[1, 5, 10],
+                        help='comma separated module counts to scale over')
+    parser.add_argument('--classes', type=int, default=10,
+                        help='classes per module')
+    parser.add_argument('--depth', type=int, default=3,
+                        help='length of the inheritance chains')
+    parser.add_argument('--width', type=int, default=8,
+                        help='arguments per signature')
+    parser.add_argument('--docstring-lines', type=int, default=10,
+                        help='lines in each long description')
+    parser.add_argument('--named-tuples', type=int, default=2,
+                        help='named tuples per module')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='repetitions of each measurement')
+    parser.add_argument('--renderer', choices=['template', 'element'],
+                        default='template',
+                        help='the renderer to time')
+    parser.add_argument('--output', type=argparse.FileType('wt'),
+                        default=sys.stdout,
+                        help='the file to which the json results are written')
+    args = parser.parse_args(argv)
+
+    results = [
+        run_benchmark(
+            PackageSpec(
+                modules=modules,
+                classes=args.classes,
+                depth=args.depth,
+                width=args.width,
+                docstring_lines=args.docstring_lines,
+                named_tuples=args.named_tuples
+            ),
+            args.repeat,
+            renderer=args.renderer
+        )
+        for modules in args.modules
+    ]
+
+    json.dump(
+        {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'results': results
+        },
+        args.output,
+        indent=2
+    )
+    args.output.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+"""Render a corpus of standard library modules, and check the output.
+
+The autodoc pipeline is run over a fixed list of standard library modules,
+which are available offline and are larger and more varied than the synthetic
+packages. Each module is rendered by the reference configuration, and by
+variants which take faster paths: with the descriptor and fragment caches,
+with the import workers, and with the element renderer. The time to render
+each module is recorded for each variant.
+
+The output of each variant is checked against the reference. Most variants
+must produce the same bytes. The element renderer does not reproduce the
+whitespace between elements, so its output is compared after the whitespace
+is removed. The hashes of the reference output are stored in
+`benchmarks/corpus.json`, and are checked when the version of Python matches
+the one they were recorded with, as the docstrings of the standard library
+change between versions.
+
+The command exits with a non zero status if any output differs.
+
+Usage:
+
+```bash
+python -m benchmarks.bench_corpus
+python -m benchmarks.bench_corpus --modules json,string --variants caches
+python -m benchmarks.bench_corpus --update
+```
+"""
+
+import argparse
+from contextlib import redirect_stdout
+import hashlib
+from importlib import import_module
+import io
+import json
+import os
+import platform
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import markdown
+
+from jetblack_markdown.caching import LRUCache
+from jetblack_markdown.metadata.classes import MEMBER_CACHE
+
+DEFAULT_GOLDEN = os.path.join(os.path.dirname(__file__), 'corpus.json')
+
+# Modules are rendered on their own, rather than by following the module
+# tree, so the corpus does not change when a package gains a module.
+CORPUS = [
+    'argparse',
+    'asyncio.events',
+    'asyncio.locks',
+    'asyncio.queues',
+    'collections',
+    'collections.abc',
+    'configparser',
+    'dataclasses',
+    'difflib',
+    'email.headerregistry',
+    'email.message',
+    'email.parser',
+    'enum',
+    'http.client',
+    'http.cookies',
+    'ipaddress',
+    'json',
+    'json.decoder',
+    'json.encoder',
+    'logging',
+    'string',
+    'textwrap',
+    'urllib.parse',
+]
+
+# Objects without a repr show their address, which changes between runs.
+_ADDRESS = re.compile(r' at 0x[0-9a-fA-F]+')
+# The whitespace either side of a tag. Docstrings may hold html which is not
+# well formed, so the output is not parsed.
+_TAG_WHITESPACE = re.compile(r'\s*(<[^>]*>)\s*')
+
+
+class Variant(NamedTuple):
+    """A configuration of the autodoc extension to compare with the reference
+
+    Attributes:
+        name (str): The name of the variant
+        config (Callable[[], Dict[str, Any]]): A function returning the
+            configuration, called once for the corpus so the caches are
+            shared by the modules.
+        exact (bool): If True the output must match the reference byte for
+            byte, otherwise after the whitespace between elements is removed.
+        passes (int): The number of times to render the corpus. Every pass
+            is checked, and the last is timed.
+    """
+    name: str
+    config: Callable[[], Dict[str, Any]]
+    exact: bool = True
+    passes: int = 1
+
+
+REFERENCE = Variant('reference', dict)
+
+VARIANTS = [
+    Variant(
+        'caches',
+        lambda: {
+            'descriptor_cache': LRUCache(),
+            'fragment_cache': LRUCache(),
+        },
+        passes=2
+    ),
+    Variant('workers', lambda: {'import_workers': 2}),
+    Variant('element', lambda: {'renderer': 'element'}, exact=False),
+]
+
+
+def exact_hash(html: str) -> str:
+    """Hash the output of a module.
+
+    Args:
+        html (str): The html
+
+    Returns:
+        str: The hash
+    """
+    text = _ADDRESS.sub(' at 0x', html)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def structure_hash(html: str) -> str:
+    """Hash the output of a module, ignoring the whitespace between elements.
+
+    Args:
+        html (str): The html
+
+    Returns:
+        str: The hash
+    """
+    return exact_hash(_TAG_WHITESPACE.sub(r'\1', html))
+
+
+def render(modules: List[str], config: Dict[str, Any]) -> Dict[str, Any]:
+    """Render each module with a configuration of the autodoc extension.
+
+    Args:
+        modules (List[str]): The names of the modules
+        config (Dict[str, Any]): The configuration
+
+    Returns:
+        Dict[str, Any]: The html and the time to render each module
+    """
+    results: Dict[str, Any] = {}
+    for name in modules:
+        start = time.perf_counter()
+        # The members which cannot be described are printed.
+        with redirect_stdout(io.StringIO()):
+            html = markdown.markdown(
+                f'@[{name}]',
+                extensions=['jetblack_markdown.autodoc'],
+                extension_configs={'jetblack_markdown.autodoc': config}
+            )
+        results[name] = {
+            'html': html,
+            'time': time.perf_counter() - start
+        }
+    return results
+
+
+def _hashes(html: str) -> Dict[str, str]:
+    return {
+        'exact': exact_hash(html),
+        'structure': structure_hash(html),
+    }
+
+
+def run_corpus(
+        modules: List[str],
+        variants: List[Variant]
+) -> Dict[str, Any]:
+    """Render the corpus with the reference and the variants.
+
+    The modules are imported first, so the timings do not include importing
+    them in this process. The member cache is cleared before each variant.
+
+    Args:
+        modules (List[str]): The names of the modules
+        variants (List[Variant]): The variants to compare with the reference
+
+    Returns:
+        Dict[str, Any]: The hashes of the reference output, the timings, and
+            the modules where each variant differs from the reference.
+    """
+    for name in modules:
+        import_module(name)
+
+    MEMBER_CACHE.clear()
+    reference = render(modules, REFERENCE.config())
+    hashes = {
+        name: _hashes(result['html'])
+        for name, result in reference.items()
+    }
+    timings = {
+        REFERENCE.name: {
+            name: result['time'] for name, result in reference.items()
+        }
+    }
+    mismatches: Dict[str, List[str]] = {}
+
+    for variant in variants:
+        MEMBER_CACHE.clear()
+        config = variant.config()
+        kind = 'exact' if variant.exact else 'structure'
+        differences = set()
+        for _ in range(variant.passes):
+            results = render(modules, config)
+            differences.update(
+                name
+                for name, result in results.items()
+                if _hashes(result['html'])[kind] != hashes[name][kind]
+            )
+        timings[variant.name] = {
+            name: result['time'] for name, result in results.items()
+        }
+        mismatches[variant.name] = sorted(differences)
+
+    return {
+        'hashes': hashes,
+        'timings': timings,
+        'totals': {
+            name: sum(module_timings.values())
+            for name, module_timings in timings.items()
+        },
+        'mismatches': mismatches,
+    }
+
+
+def compare_golden(golden: Dict[str, Any], hashes: Dict[str, Any]) -> List[str]:
+    """Find the modules where the reference output differs from the golden
+    hashes.
+
+    Args:
+        golden (Dict[str, Any]): The golden hashes
+        hashes (Dict[str, Any]): The hashes of the reference output
+
+    Returns:
+        List[str]: The names of the modules which differ
+    """
+    return sorted(
+        name
+        for name, module_hashes in hashes.items()
+        if name in golden['modules'] and
+        golden['modules'][name] != module_hashes
+    )
+
+
+def _python_version() -> str:
+    return '.'.join(platform.python_version_tuple()[:2])
+
+
+def _parse_list(text: str) -> List[str]:
+    return [value.strip() for value in text.split(',') if value.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None.
+
+    Returns:
+        int: The exit status; 1 if any output differs.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', type=_parse_list, default=CORPUS,
+                        help='comma separated modules to render')
+    parser.add_argument('--variants', type=_parse_list,
+                        default=[variant.name for variant in VARIANTS],
+                        help='comma separated variants to compare')
+    parser.add_argument('--golden', default=DEFAULT_GOLDEN,
+                        help='the file of golden hashes')
+    parser.add_argument('--update', action='store_true',
+                        help='write the reference hashes as the golden hashes')
+    parser.add_argument('--output', default=None,
+                        help='write the timings as JSON to this file')
+    args = parser.parse_args(argv)
+
+    result = run_corpus(
+        args.modules,
+        [variant for variant in VARIANTS if variant.name in args.variants]
+    )
+
+    if args.output:
+        with open(args.output, 'wt', encoding='utf-8') as file_ptr:
+            json.dump(
+                {
+                    'python': platform.python_version(),
+                    'timings': result['timings'],
+                    'totals': result['totals'],
+                },
+                file_ptr,
+                indent=2
+            )
+
+    if args.update:
+        with open(args.golden, 'wt', encoding='utf-8') as file_ptr:
+            json.dump(
+                {'python': _python_version(), 'modules': result['hashes']},
+                file_ptr,
+                indent=2
+            )
+            file_ptr.write('\n')
+
+    for name, total in result['totals'].items():
+        print(f'{name:<12} {total:8.3f}s')
+
+    failed = False
+    for name, differences in result['mismatches'].items():
+        if differences:
+            failed = True
+            print(f"{name} differs from the reference: {', '.join(differences)}")
+
+    if not args.update and os.path.exists(args.golden):
+        with open(args.golden, 'rt', encoding='utf-8') as file_ptr:
+            golden = json.load(file_ptr)
+        if golden['python'] != _python_version():
+            print(
+                f"The golden hashes are for Python {golden['python']}, "
+                "and were not checked"
+            )
+        else:
+            differences = compare_golden(golden, result['hashes'])
+            if differences:
+                failed = True
+                print(f"reference differs from the golden hashes: {', '.join(differences)}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Measure sharing inherited member descriptors across subclasses.
+
+A wide hierarchy is built from mixins, and every subclass is described with
+`ignore_inherited` off, with and without the member descriptor cache. The time
+taken and the memory retained by the descriptors are reported.
+
+Usage:
+
+```bash
+python -m benchmarks.bench_inherited --mixins 10 --methods 10 --subclasses 100
+```
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from jetblack_markdown.metadata import ClassDescriptor
+from jetblack_markdown.metadata.classes import MEMBER_CACHE
+
+_METHOD = '''
+    def {name}(self, arg1: str, arg2: Optional[int] = None) -> List[str]:
+        """Method {name} of {mixin}
+
+        A longer description of the method.
+
+        Args:
+            arg1 (str): The first argument
+            arg2 (Optional[int], optional): The second argument. Defaults to None.
+
+        Returns:
+            List[str]: The result
+        """
+        return [arg1]
+'''
+
+
+def create_hierarchy(mixins: int, methods: int, subclasses: int) -> List[type]:
+    """Create the subclasses of a set of mixins.
+
+    Args:
+        mixins (int): The number of mixins
+        methods (int): The number of methods on each mixin
+        subclasses (int): The number of classes inheriting every mixin
+
+    Returns:
+        List[type]: The subclasses
+    """
+    lines = ['from typing import List, Optional']
+    for mixin in range(mixins):
+        lines.append(f'class Mixin{mixin}:\n    """Mixin {mixin}"""')
+        lines.extend(
+            _METHOD.format(name=f'mixin{mixin}_method{method}', mixin=mixin)
+            for method in range(methods)
+        )
+    bases = ', '.join(f'Mixin{mixin}' for mixin in range(mixins))
+    for subclass in range(subclasses):
+        lines.append(
+            f'class Subclass{subclass}({bases}):\n'
+            f'    """Subclass {subclass}"""'
+        )
+    namespace: Dict[str, Any] = {'__name__': 'bench_inherited_hierarchy'}
+    exec('\n'.join(lines), namespace)  # pylint: disable=exec-used
+    return [namespace[f'Subclass{subclass}'] for subclass in range(subclasses)]
+
+
+def measure(classes: List[type], maxsize: int) -> Dict[str, float]:
+    """Describe the classes with a member cache of the given size.
+
+    Args:
+        classes (List[type]): The classes
+        maxsize (int): The size of the member cache, zero to disable it
+
+    Returns:
+        Dict[str, float]: The time in seconds, and the memory in MB
+    """
+    MEMBER_CACHE.clear()
+    MEMBER_CACHE.maxsize = maxsize
+    tracemalloc.start()
+    start = time.perf_counter()
+    descriptors = [
+        ClassDescriptor.create(
+            klass,
+            class_from_init=False,
+            ignore_dunder=True,
+            ignore_private=True,
+            ignore_inherited=False
+        )
+        for klass in classes
+    ]
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del descriptors
+    MEMBER_CACHE.clear()
+    return {
+        'time': elapsed,
+        'retained_mb': retained / (1024 * 1024),
+        'peak_mb': peak / (1024 * 1024),
+    }
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mixins', type=int, default=10)
+    parser.add_argument('--methods', type=int, default=10)
+    parser.add_argument('--subclasses', type=int, default=100)
+    args = parser.parse_args()
+
+    classes = create_hierarchy(args.mixins, args.methods, args.subclasses)
+    maxsize = MEMBER_CACHE.maxsize
+    uncached = measure(classes, 0)
+    cached = measure(classes, maxsize)
+    MEMBER_CACHE.maxsize = maxsize
+    json.dump(
+        {
+            'mixins': args.mixins,
+            'methods': args.methods,
+            'subclasses': args.subclasses,
+            'uncached': uncached,
+            'cached': cached,
+            'speedup': uncached['time'] / cached['time'],
+        },
+        sys.stdout,
+        indent=2
+    )
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""Measure the size of the rendered pages with and without minified output.
+
+A page documenting a synthetic package, and a page of formulas, are rendered
+with each of the templates, with the `minify` option off and on. The html
+rendered by the templates, before it is parsed, and the final page are
+measured, along with the compressed size of the page.
+
+Usage:
+
+```bash
+python -m benchmarks.bench_page_size --modules 10 --formulas 500
+```
+"""
+
+import argparse
+import gzip
+import json
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import markdown
+
+from jetblack_markdown.instrumentation import StatsCollector
+
+from .synthetic import PackageSpec, generate_package
+
+TEMPLATES = ['main.jinja2', 'main_verbose.jinja2']
+
+FORMULAS = [
+    r'\frac{a_{i}+b_{i}}{2} \le \sqrt{x^2 + y^2}',
+    r'\sum_{i=0}^{n} \alpha_i x^i = \int_0^1 f(t) \, dt',
+    r'\lim_{n \to \infty} \left( 1 + \frac{1}{n} \right)^n = e',
+    r'\begin{matrix} a & b \\ c & d \end{matrix}',
+]
+
+
+def _formula_page(count: int) -> str:
+    return '\n\n'.join(
+        f'Inline ${FORMULAS[index % len(FORMULAS)]}$ and\n\n'
+        f'$$\n{FORMULAS[(index + 1) % len(FORMULAS)]}\n$$'
+        for index in range(count)
+    )
+
+
+def _measure(html: str) -> Dict[str, int]:
+    page = html.encode('utf-8')
+    return {
+        'bytes': len(page),
+        'gzip_bytes': len(gzip.compress(page)),
+    }
+
+
+def measure_autodoc(import_str: str, template_file: str, minify: bool) -> Dict[str, Any]:
+    """Measure a page documenting an import string
+
+    Args:
+        import_str (str): The import string
+        template_file (str): The template to render
+        minify (bool): If True minify the output
+
+    Returns:
+        Dict[str, Any]: The sizes, and the time to render the page
+    """
+    collector = StatsCollector()
+    start = time.perf_counter()
+    html = markdown.markdown(
+        f'@[{import_str}]',
+        extensions=['jetblack_markdown.autodoc'],
+        extension_configs={
+            'jetblack_markdown.autodoc': {
+                'follow_module_tree': True,
+                'template_file': template_file,
+                'minify': minify,
+                'instrumentation': collector,
+            }
+        }
+    )
+    elapsed = time.perf_counter() - start
+    report = collector.report()
+    return {
+        'rendered_html_length': report['counters']['html_length'],
+        'parse': report['stages']['parse']['total'],
+        'time': elapsed,
+        **_measure(html)
+    }
+
+
+def measure_formulas(count: int, minify: bool) -> Dict[str, Any]:
+    """Measure a page of formulas
+
+    Args:
+        count (int): The number of inline and block formula pairs
+        minify (bool): If True minify the output
+
+    Returns:
+        Dict[str, Any]: The sizes
+    """
+    html = markdown.markdown(
+        _formula_page(count),
+        extensions=['jetblack_markdown.latex2mathml'],
+        extension_configs={
+            'jetblack_markdown.latex2mathml': {'minify': minify}
+        }
+    )
+    return _measure(html)
+
+
+def _compare(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'before': before,
+        'after': after,
+        'reduction': {
+            key: 1 - after[key] / before[key]
+            for key in before
+            if before[key]
+        }
+    }
+
+
+def run_benchmark(spec: PackageSpec, formulas: int) -> Dict[str, Any]:
+    """Measure the pages with and without minified output
+
+    Args:
+        spec (PackageSpec): The shape of the package
+        formulas (int): The number of inline and block formula pairs
+
+    Returns:
+        Dict[str, Any]: The benchmark results
+    """
+    with tempfile.TemporaryDirectory() as root:
+        generate_package(root, spec)
+        sys.path.insert(0, root)
+        try:
+            autodoc = {
+                template_file: _compare(
+                    measure_autodoc(spec.name, template_file, False),
+                    measure_autodoc(spec.name, template_file, True)
+                )
+                for template_file in TEMPLATES
+            }
+        finally:
+            sys.path.remove(root)
+
+    return {
+        'spec': spec._asdict(),
+        'autodoc': autodoc,
+        'latex2mathml': _compare(
+            measure_formulas(formulas, False),
+            measure_formulas(formulas, True)
+        )
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', type=int, default=10,
+                        help='modules in the package')
+    parser.add_argument('--classes', type=int, default=10,
+                        help='classes per module')
+    parser.add_argument('--formulas', type=int, default=500,
+                        help='pairs of inline and block formulas')
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(
+        PackageSpec(
+            name='synthetic_page_size_pkg',
+            modules=args.modules,
+            classes=args.classes
+        ),
+        args.formulas
+    )
+    json.dump(
+        {'python': platform.python_version(), **result},
+        sys.stdout,
+        indent=2
+    )
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""Measure how rendering scales with the number of threads.
+
+A synthetic package is generated, and a page for each of its classes is
+rendered by a `MarkdownPool` on an increasing number of threads. Each run
+starts with empty caches. On a standard build the GIL serialises the work, so
+the throughput stays close to that of a single thread; on a free threaded
+build it should grow with the number of threads.
+
+Usage:
+
+```bash
+python -m benchmarks.bench_threads --threads 1,2,4,8 --modules 10
+```
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from jetblack_markdown.caching import LRUCache, is_free_threaded
+from jetblack_markdown.metadata.classes import MEMBER_CACHE
+from jetblack_markdown.pool import MarkdownPool
+from jetblack_markdown.utils import ImportResolver
+
+from .synthetic import PackageSpec, generate_package
+
+
+def _create_pool(threads: int) -> MarkdownPool:
+    return MarkdownPool(
+        ['jetblack_markdown.autodoc'],
+        {
+            'jetblack_markdown.autodoc': {
+                'resolver': ImportResolver(),
+                'descriptor_cache': LRUCache(),
+            }
+        },
+        size=threads
+    )
+
+
+def time_pages(pages: List[str], threads: int, repeat: int) -> float:
+    """Time rendering the pages on a number of threads.
+
+    Args:
+        pages (List[str]): The markdown pages
+        threads (int): The number of threads
+        repeat (int): The number of times to repeat the timing
+
+    Returns:
+        float: The fastest time in seconds
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        MEMBER_CACHE.clear()
+        pool = _create_pool(threads)
+        with ThreadPoolExecutor(threads) as executor:
+            # Create the instances before starting the clock.
+            list(executor.map(pool.convert, [''] * threads))
+            start = time.perf_counter()
+            list(executor.map(pool.convert, pages))
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(
+        spec: PackageSpec,
+        thread_counts: List[int],
+        repeat: int
+) -> Dict[str, Any]:
+    """Generate a synthetic package and time rendering it on threads.
+
+    Args:
+        spec (PackageSpec): The shape of the package
+        thread_counts (List[int]): The numbers of threads
+        repeat (int): The number of times to repeat each timing
+
+    Returns:
+        Dict[str, Any]: The benchmark results
+    """
+    pages = [
+        f'# Class{class_index}\n\n'
+        f'@[{spec.name}.module_{module_index}:Class{class_index}]'
+        for module_index in range(spec.modules)
+        for class_index in range(spec.classes)
+    ]
+
+    with tempfile.TemporaryDirectory() as root:
+        generate_package(root, spec)
+        sys.path.insert(0, root)
+        try:
+            __import__(spec.name)
+            timings = {
+                threads: time_pages(pages, threads, repeat)
+                for threads in thread_counts
+            }
+        finally:
+            sys.path.remove(root)
+
+    baseline = timings[thread_counts[0]]
+    return {
+        'spec': spec._asdict(),
+        'pages': len(pages),
+        'threads': [
+            {
+                'threads': threads,
+                'time': elapsed,
+                'pages_per_second': len(pages) / elapsed,
+                'speedup': baseline / elapsed,
+            }
+            for threads, elapsed in timings.items()
+        ]
+    }
+
+
+def _parse_ints(text: str) -> List[int]:
+    return [int(value) for value in text.split(',')]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark from the command line.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=_parse_ints, default=[1, 2, 4, 8],
+                        help='comma separated thread counts to scale over')
+    parser.add_argument('--modules', type=int, default=10,
+                        help='modules in the package')
+    parser.add_argument('--classes', type=int, default=10,
+                        help='classes per module')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='repetitions of each measurement')
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(
+        PackageSpec(
+            name='synthetic_threads_pkg',
+            modules=args.modules,
+            classes=args.classes
+        ),
+        args.threads,
+        args.repeat
+    )
+    json.dump(
+        {
+            'python': platform.python_version(),
+            'free_threaded': is_free_threaded(),
+            **result
+        },
+        sys.stdout,
+        indent=2
+    )
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Compare the type name rendering with rendering from `str(annotation)`.
+
+The annotations are taken from a wide signature, and each is rendered many
+times, as happens when the same types appear throughout a large package.
+
+Usage:
+
+```bash
+python -m benchmarks.bench_type_names --width 64 --repeat 1000
+```
+"""
+
+import argparse
+import json
+import re
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from jetblack_markdown.type_names import format_annotation
+
+_ANNOTATIONS = [
+    int,
+    Optional[int],
+    List[str],
+    Dict[str, Any],
+    Union[int, str, None],
+    Callable[[int, str], bool],
+    Optional[Dict[str, List[Union[int, float]]]],
+    Callable[..., Optional[List[str]]],
+]
+
+
+def format_from_str(annotation: Any) -> str:
+    """Render an annotation by post-processing `str(annotation)`.
+
+    Args:
+        annotation (Any): The type annotation
+
+    Returns:
+        str: The name of the type
+    """
+    type_name = getattr(annotation, '__name__', None) or str(annotation)
+    return re.sub(
+        r'[^a-zA-Z_]*typing\.([a-zA-Z_][a-zA-Z_0-9]*)',
+        r'\1',
+        type_name
+    )
+
+
+def _time(formatter: Callable[[Any], str], annotations: List[Any], repeat: int) -> float:
+    def render() -> None:
+        for annotation in annotations:
+            formatter(annotation)
+    return min(timeit.repeat(render, number=repeat, repeat=5))
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--width', type=int, default=64,
+                        help='the number of arguments in the signature')
+    parser.add_argument('--repeat', type=int, default=1000,
+                        help='the number of times the signature is rendered')
+    args = parser.parse_args()
+
+    annotations = [
+        _ANNOTATIONS[index % len(_ANNOTATIONS)]
+        for index in range(args.width)
+    ]
+    from_str = _time(format_from_str, annotations, args.repeat)
+    structural = _time(format_annotation, annotations, args.repeat)
+    json.dump(
+        {
+            'width': args.width,
+            'repeat': args.repeat,
+            'from_str': from_str,
+            'format_annotation': structural,
+            'speedup': from_str / structural,
+        },
+        sys.stdout,
+        indent=2
+    )
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
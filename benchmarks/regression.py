@@ -0,0 +1,321 @@
+"""Check for performance regressions against a stored baseline.
+
+Three cases are timed: rendering an autodoc directive, constructing the
+descriptors of a package, and converting LaTeX to MathML. Each case is
+repeated, and the median is compared with the median stored in the baseline.
+The timings are divided by the time of a fixed pure Python workload, measured
+in the same run, so a baseline recorded on one machine can be checked on
+another of a different speed.
+
+A case regresses when its normalised median exceeds the baseline by more than
+the threshold, and the command then exits with a non zero status. The
+threshold can be set for each case in the baseline, or on the command line.
+
+Usage:
+
+```bash
+python -m benchmarks.regression
+python -m benchmarks.regression --threshold 0.1 --repeat 15
+python -m benchmarks.regression --update
+```
+"""
+
+import argparse
+from importlib import import_module
+from importlib.metadata import PackageNotFoundError, version
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import xml.etree.ElementTree as etree
+
+from latex2mathml.converter import convert_to_element
+import markdown
+
+from jetblack_markdown.autodoc import AutodocExtension
+from jetblack_markdown.autodoc_processor import AutodocBlockProcessor
+from jetblack_markdown.metadata import DescriptorOptions, create_descriptor
+from jetblack_markdown.metadata.classes import MEMBER_CACHE
+
+from .bench_page_size import FORMULAS
+from .synthetic import PackageSpec, generate_package
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+
+SPEC = PackageSpec(
+    name='synthetic_regression_pkg',
+    modules=3,
+    classes=5,
+    depth=2,
+    width=6,
+    docstring_lines=5,
+    named_tuples=1
+)
+
+DISTRIBUTIONS = [
+    'jetblack-markdown',
+    'docstring-parser',
+    'latex2mathml',
+    'markdown',
+    'jinja2'
+]
+
+
+class CaseResult(NamedTuple):
+    """The comparison of a case with its baseline
+
+    Attributes:
+        name (str): The name of the case
+        baseline (float): The normalised median of the baseline
+        current (float): The normalised median of this run
+        threshold (float): The permitted increase, as a fraction
+    """
+    name: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def change(self) -> float:
+        """The change from the baseline, as a fraction"""
+        return self.current / self.baseline - 1
+
+    @property
+    def is_regression(self) -> bool:
+        """True if the change exceeds the threshold"""
+        return self.change > self.threshold
+
+
+def _calibrate() -> None:
+    # A fixed workload of the kind the cases spend their time on: attribute
+    # access, dictionaries and string building.
+    parts: List[str] = []
+    table: Dict[int, str] = {}
+    for index in range(100000):
+        table[index % 97] = f'{index}:{len(parts)}'
+        parts.append(table[index % 97].upper())
+    ''.join(parts)
+
+
+def _purge_modules(package_name: str) -> None:
+    for name in list(sys.modules):
+        if name == package_name or name.startswith(package_name + '.'):
+            del sys.modules[name]
+
+
+def _fresh_package() -> Any:
+    # The package is imported again, so the descriptors and signatures are
+    # not found in the caches.
+    _purge_modules(SPEC.name)
+    MEMBER_CACHE.clear()
+    return import_module(SPEC.name)
+
+
+def _time_autodoc() -> Callable[[], None]:
+    md = markdown.Markdown(
+        extensions=[AutodocExtension(follow_module_tree=True)]
+    )
+    processor = md.parser.blockprocessors['autodoc']
+    assert isinstance(processor, AutodocBlockProcessor)
+    block = f'@[{SPEC.name}]'
+    _fresh_package()
+
+    def run() -> None:
+        processor.run(etree.Element('div'), [block])
+
+    return run
+
+
+def _time_descriptor() -> Callable[[], None]:
+    options = DescriptorOptions(
+        class_from_init=False,
+        ignore_dunder=True,
+        ignore_private=True,
+        ignore_all=False,
+        ignore_inherited=True,
+        prefer_docstring=True,
+        follow_module_tree=True
+    )
+    module = _fresh_package()
+
+    def run() -> None:
+        create_descriptor(module, options)
+
+    return run
+
+
+def _time_latex() -> Callable[[], None]:
+    def run() -> None:
+        for _ in range(25):
+            for formula in FORMULAS:
+                convert_to_element(formula, display='block')
+
+    return run
+
+
+# Each case returns the function to time, after preparing the state it
+# needs.
+CASES: Dict[str, Callable[[], Callable[[], None]]] = {
+    'autodoc': _time_autodoc,
+    'descriptor': _time_descriptor,
+    'latex': _time_latex,
+}
+
+
+def _time(func: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def measure(repeat: int) -> Dict[str, Any]:
+    """Time the cases.
+
+    The cases are run in turn, each of them `repeat` times, with the
+    calibration workload timed before each case.
+
+    Args:
+        repeat (int): The number of times to repeat each case
+
+    Returns:
+        Dict[str, Any]: The timings
+    """
+    samples: Dict[str, List[float]] = {name: [] for name in CASES}
+    calibration: List[float] = []
+
+    with tempfile.TemporaryDirectory() as root:
+        generate_package(root, SPEC)
+        sys.path.insert(0, root)
+        try:
+            _fresh_package()
+            for name in CASES:
+                CASES[name]()()  # Warm up.
+            for _ in range(repeat):
+                for name, case in CASES.items():
+                    calibration.append(_time(_calibrate))
+                    samples[name].append(_time(case()))
+        finally:
+            sys.path.remove(root)
+            _purge_modules(SPEC.name)
+
+    unit = statistics.median(calibration)
+    return {
+        'calibration': unit,
+        'cases': {
+            name: {
+                'median': statistics.median(times),
+                'min': min(times),
+                'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+                'normalised': statistics.median(times) / unit,
+            }
+            for name, times in samples.items()
+        }
+    }
+
+
+def _versions() -> Dict[str, Optional[str]]:
+    versions: Dict[str, Optional[str]] = {
+        'python': platform.python_version()
+    }
+    for distribution in DISTRIBUTIONS:
+        try:
+            versions[distribution] = version(distribution)
+        except PackageNotFoundError:
+            versions[distribution] = None
+    return versions
+
+
+def compare(
+        baseline: Dict[str, Any],
+        current: Dict[str, Any],
+        threshold: Optional[float] = None
+) -> List[CaseResult]:
+    """Compare the timings with a baseline.
+
+    Args:
+        baseline (Dict[str, Any]): The baseline
+        current (Dict[str, Any]): The timings
+        threshold (Optional[float], optional): The permitted increase, as a
+            fraction, overriding the thresholds in the baseline. Defaults to
+            None.
+
+    Returns:
+        List[CaseResult]: The comparison of each case in the baseline
+    """
+    return [
+        CaseResult(
+            name,
+            case['normalised'],
+            current['cases'][name]['normalised'],
+            threshold if threshold is not None else case.get(
+                'threshold',
+                baseline.get('threshold', DEFAULT_THRESHOLD)
+            )
+        )
+        for name, case in baseline['cases'].items()
+        if name in current['cases']
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the regression check from the command line.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None.
+
+    Returns:
+        int: The exit status; 1 if a case regressed.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='the baseline file')
+    parser.add_argument('--threshold', type=float, default=None,
+                        help='the permitted increase as a fraction, overriding the baseline')
+    parser.add_argument('--repeat', type=int, default=15,
+                        help='repetitions of each case')
+    parser.add_argument('--update', action='store_true',
+                        help='write the timings as the new baseline')
+    args = parser.parse_args(argv)
+
+    current = measure(args.repeat)
+
+    if args.update:
+        with open(args.baseline, 'wt', encoding='utf-8') as file_ptr:
+            json.dump(
+                {
+                    'threshold': (
+                        args.threshold
+                        if args.threshold is not None
+                        else DEFAULT_THRESHOLD
+                    ),
+                    'versions': _versions(),
+                    'repeat': args.repeat,
+                    **current
+                },
+                file_ptr,
+                indent=2
+            )
+            file_ptr.write('\n')
+        return 0
+
+    with open(args.baseline, 'rt', encoding='utf-8') as file_ptr:
+        baseline = json.load(file_ptr)
+
+    results = compare(baseline, current, args.threshold)
+    for result in results:
+        print(
+            f"{result.name:<12} {result.baseline:10.3f} {result.current:10.3f} "
+            f"{result.change:+8.1%} (threshold {result.threshold:.0%})"
+            f"{' REGRESSION' if result.is_regression else ''}"
+        )
+    return 1 if any(result.is_regression for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""A generator for synthetic packages.
+
+The generated packages exercise the autodoc pipeline: many modules, many
+classes per module, deep inheritance chains, wide signatures, long Google
+style docstrings and named tuples.
+"""
+
+import os
+from typing import List, NamedTuple
+
+_TYPES = [
+    'int',
+    'str',
+    'float',
+    'Optional[int]',
+    'List[str]',
+    'Dict[str, Any]',
+    'Union[int, str, None]',
+    'Callable[[int, str], bool]',
+]
+
+
+class PackageSpec(NamedTuple):
+    """The shape of a synthetic package
+
+    Args:
+        name (str): The package name
+        modules (int): The number of modules
+        classes (int): The number of classes per module
+        depth (int): The length of each inheritance chain
+        width (int): The number of arguments in each signature
+        docstring_lines (int): The number of lines in each long description
+        named_tuples (int): The number of named tuples per module
+    """
+    name: str = 'synthetic_pkg'
+    modules: int = 10
+    classes: int = 10
+    depth: int = 3
+    width: int = 8
+    docstring_lines: int = 10
+    named_tuples: int = 2
+
+
+def _indent(lines: List[str], level: int) -> List[str]:
+    prefix = '    ' * level
+    return [prefix + line if line else line for line in lines]
+
+
+def _docstring(
+        summary: str,
+        spec: PackageSpec,
+        args: List[str],
+        returns: str
+) -> List[str]:
+    lines = ['"""' + summary, '']
+    for index in range(spec.docstring_lines):
+        lines.append(
+            f'Line {index} of the long description with *emphasis*, '
+            f'`code` and a [link](https://example.com/{index}).'
+        )
+    if args:
+        lines.extend(['', 'Args:'])
+        for index, arg in enumerate(args):
+            type_name = _TYPES[index % len(_TYPES)]
+            lines.append(
+                f'    {arg} ({type_name}): The argument {arg}. '
+                'Defaults to None.'
+            )
+    if returns:
+        lines.extend(['', 'Returns:', f'    {returns}: The result'])
+    lines.extend(['', 'Raises:', '    ValueError: If something is wrong'])
+    lines.append('"""')
+    return lines
+
+
+def _arguments(spec: PackageSpec) -> List[str]:
+    return [f'arg_{index}' for index in range(spec.width)]
+
+
+def _signature(args: List[str], leading: List[str]) -> str:
+    params = list(leading)
+    for index, arg in enumerate(args):
+        type_name = _TYPES[index % len(_TYPES)]
+        params.append(f'{arg}: {type_name} = None')
+    return ', '.join(params)
+
+
+def _function(
+        name: str,
+        spec: PackageSpec,
+        leading: List[str],
+        returns: str = 'Optional[str]'
+) -> List[str]:
+    args = _arguments(spec)
+    lines = [f'def {name}({_signature(args, leading)}) -> {returns}:']
+    lines.extend(
+        _indent(
+            _docstring(
+                f'The {name} function',
+                spec,
+                args,
+                '' if returns == 'None' else returns
+            ),
+            1
+        )
+    )
+    lines.append('    return None')
+    return lines
+
+
+def _class(
+        name: str,
+        base: str,
+        spec: PackageSpec
+) -> List[str]:
+    lines = [f'class {name}({base}):' if base else f'class {name}:']
+    body = _docstring(f'The {name} class', spec, [], '')
+    body.append('')
+    body.extend(_function('__init__', spec, ['self'], 'None'))
+    body.append('')
+    body.append('@property')
+    body.append(f'def value_{name.lower()}(self) -> Optional[int]:')
+    body.extend(
+        _indent(_docstring('A property', spec, [], 'Optional[int]'), 1)
+    )
+    body.append('    return None')
+    body.append('')
+    body.append('@classmethod')
+    body.extend(_function(f'create_{name.lower()}', spec, ['cls']))
+    body.append('')
+    body.extend(_function(f'method_{name.lower()}', spec, ['self']))
+    lines.extend(_indent(body, 1))
+    return lines
+
+
+def _named_tuple(name: str, spec: PackageSpec) -> List[str]:
+    args = _arguments(spec)
+    lines = [f'class {name}(NamedTuple):']
+    body = _docstring(f'The {name} named tuple', spec, args, '')
+    for index, arg in enumerate(args):
+        type_name = _TYPES[index % len(_TYPES)]
+        body.append(f'{arg}: {type_name} = None')
+    lines.extend(_indent(body, 1))
+    return lines
+
+
+def _module(module_index: int, spec: PackageSpec) -> str:
+    lines = _docstring(f'Synthetic module {module_index}', spec, [], '')
+    lines.extend([
+        '',
+        'from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union',
+        '',
+    ])
+    for index in range(spec.classes):
+        chain_position = index % max(spec.depth, 1)
+        base = f'Class{index - 1}' if chain_position else ''
+        lines.append('')
+        lines.extend(_class(f'Class{index}', base, spec))
+        lines.append('')
+    for index in range(spec.named_tuples):
+        lines.append('')
+        lines.extend(_named_tuple(f'Tuple{index}', spec))
+        lines.append('')
+    for index in range(spec.classes):
+        lines.append('')
+        lines.extend(_function(f'function_{index}', spec, []))
+        lines.append('')
+    return '\n'.join(lines) + '\n'
+
+
+def generate_package(root: str, spec: PackageSpec) -> str:
+    """Write a synthetic package to disk
+
+    Args:
+        root (str): The folder in which to create the package
+        spec (PackageSpec): The shape of the package
+
+    Returns:
+        str: The path of the package folder
+    """
+    package_folder = os.path.join(root, spec.name)
+    os.makedirs(package_folder, exist_ok=True)
+
+    module_names = [f'module_{index}' for index in range(spec.modules)]
+    for index, module_name in enumerate(module_names):
+        with open(
+                os.path.join(package_folder, module_name + '.py'),
+                'wt',
+                encoding='utf-8'
+        ) as file_ptr:
+            file_ptr.write(_module(index, spec))
+
+    init_lines = _docstring(f'The {spec.name} package', spec, [], '')
+    init_lines.append('')
+    init_lines.extend(
+        f'from . import {module_name}'
+        for module_name in module_names
+    )
+    with open(
+            os.path.join(package_folder, '__init__.py'),
+            'wt',
+            encoding='utf-8'
+    ) as file_ptr:
+        file_ptr.write('\n'.join(init_lines) + '\n')
+
+    return package_folder
@@ -1,11 +1,15 @@
 """JetBlack Markdown"""
 
 from .autodoc import AutodocExtension, AutodocBlockProcessor
+from .instrumentation import Instrumentation, MemoryProfiler, StatsCollector
 from .latex2mathml import Latex2MathMLExtension, Latex2MathMLInlineProcessor
 
 __all__ = [
     'AutodocExtension',
     'AutodocBlockProcessor',
     'Latex2MathMLExtension',
-    'Latex2MathMLInlineProcessor'
+    'Latex2MathMLInlineProcessor',
+    'Instrumentation',
+    'MemoryProfiler',
+    'StatsCollector'
 ]
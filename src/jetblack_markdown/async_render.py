@@ -0,0 +1,123 @@
+"""Rendering from asyncio.
+
+Importing and introspecting the documented code, and converting formulas,
+blocks the event loop. An `AsyncRenderer` runs the renders in a bounded pool of
+threads, with warm `Markdown` instances and caches (see
+`jetblack_markdown.daemon`). Concurrent requests for the same markdown share a
+single render, which is cancelled if every request for it is cancelled.
+
+```python
+renderer = AsyncRenderer()
+
+async def handle(request):
+    html = await renderer.render(await request.text())
+    return web.Response(text=html, content_type='text/html')
+```
+"""
+
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from .daemon import RenderDaemon
+
+
+class _PendingRender:
+    """A render and the number of requests waiting for it"""
+
+    __slots__ = ('future', 'waiters')
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.waiters = 0
+
+
+class AsyncRenderer:
+    """Renders markdown without blocking the event loop.
+
+    A renderer belongs to the event loop which first uses it.
+    """
+
+    def __init__(
+            self,
+            extensions: Optional[Sequence[str]] = None,
+            extension_configs: Optional[Mapping[str, Mapping[str, Any]]] = None,
+            max_workers: int = 4,
+            cache_size: int = 1024
+    ) -> None:
+        """Renders markdown without blocking the event loop
+
+        Args:
+            extensions (Optional[Sequence[str]], optional): The markdown
+                extensions. Defaults to None.
+            extension_configs (Optional[Mapping[str, Mapping[str, Any]]], optional):
+                The extension configurations. Defaults to None.
+            max_workers (int, optional): The number of concurrent renders.
+                Defaults to 4.
+            cache_size (int, optional): The number of descriptors and
+                formulas to cache. Defaults to 1024.
+        """
+        self.daemon = RenderDaemon(
+            extensions,
+            extension_configs,
+            instances=max_workers,
+            cache_size=cache_size
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers,
+            thread_name_prefix='jetblack-markdown'
+        )
+        self._pending: Dict[str, _PendingRender] = {}
+
+    async def render(self, text: str) -> str:
+        """Render markdown as HTML.
+
+        If the same markdown is already being rendered the result of that
+        render is awaited.
+
+        Args:
+            text (str): The markdown
+
+        Returns:
+            str: The HTML
+        """
+        pending = self._pending.get(text)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = self._pending[text] = _PendingRender(
+                loop.run_in_executor(self._executor, self.daemon.render, text)
+            )
+
+        pending.waiters += 1
+        try:
+            return await asyncio.shield(pending.future)
+        finally:
+            pending.waiters -= 1
+            if pending.waiters == 0:
+                # A render which has not started is cancelled. One which has
+                # started runs to completion, and warms the caches.
+                pending.future.cancel()
+                if self._pending.get(text) is pending:
+                    del self._pending[text]
+
+    def stats(self) -> Dict[str, Any]:
+        """The render count and cache statistics
+
+        Returns:
+            Dict[str, Any]: The statistics
+        """
+        return dict(self.daemon.stats(), pending=len(self._pending))
+
+    async def close(self) -> None:
+        """Wait for the running renders, and stop the threads"""
+        await asyncio.get_running_loop().run_in_executor(
+            None,
+            self._executor.shutdown
+        )
+
+    async def __aenter__(self) -> AsyncRenderer:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
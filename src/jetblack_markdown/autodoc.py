@@ -4,6 +4,12 @@ from markdown import Markdown
 from markdown.extensions import Extension
 
 from .autodoc_processor import AutodocBlockProcessor
+from .caching import create_cache
+from .instrumentation import create_instrumentation
+from .search_index import create_search_index
+from .symbols import create_symbol_index
+from .utils import ImportResolver
+from .workers import get_shared_pool
 
 _DOCSTRING_RE = r'@\[([^\]]+)\]'
 
@@ -30,8 +36,75 @@ class AutodocExtension(Extension):
             'follow_module_tree': [False, 'Follow the module tree'],
             'template_folder': ['', 'The template folder'],
             'template_file': ['main.jinja2', 'The template file to use'],
+            'instrumentation': [
+                '',
+                'An Instrumentation, or the import string of one'
+            ],
+            'instrumentation_report': [
+                '',
+                'A file to which the collected timings are written as JSON'
+            ],
+            'import_workers': [
+                0,
+                'The number of worker processes importing the documented code'
+            ],
+            'worker_max_jobs': [
+                100,
+                'The number of jobs after which a worker is recycled'
+            ],
+            'worker_max_memory': [
+                0,
+                'The peak memory in MB after which a worker is recycled'
+            ],
+            'descriptor_cache': [
+                0,
+                'A descriptor cache to share, or the number of descriptors to cache'
+            ],
+            'resolver': [
+                '',
+                'An import resolver to share'
+            ],
+            'symbol_index': [
+                '',
+                'A SymbolIndex, or the file in which one is persisted'
+            ],
+            'symbol_page': [
+                '',
+                'The URL of the page being rendered'
+            ],
+            'search_index': [
+                '',
+                'A SearchIndex, or the file to which one is written'
+            ],
+            'renderer': [
+                'template',
+                'Either "template" or "element" to build the elements directly'
+            ],
+            'fragment_cache': [
+                0,
+                'A fragment cache to share, or the number of docstring fragments to cache'
+            ],
+            'minify': [False, 'Remove the whitespace which lays out the templates'],
+            'chunk_folder': [
+                '',
+                'A folder to which module trees are written in chunks'
+            ],
+            'chunk_url': ['', 'The URL of the chunk folder'],
+            'chunk_classes': [
+                0,
+                'The maximum number of classes in a chunk, or 0 for a chunk per module'
+            ],
+            'template_cache': [
+                '',
+                'A TemplateCache to share the compiled templates'
+            ],
         }
         super().__init__(*args, **kwargs)
+        self.resolver = self.getConfig('resolver') or ImportResolver()
+        self.descriptor_cache = create_cache(self.getConfig('descriptor_cache'))
+        self.fragment_cache = create_cache(self.getConfig('fragment_cache'))
+        self.symbol_index = create_symbol_index(self.getConfig('symbol_index'))
+        self.search_index = create_search_index(self.getConfig('search_index'))
 
     def extendMarkdown(self, md: Markdown) -> None:
         class_from_init = self.getConfig('class_from_init')
@@ -43,6 +116,16 @@ class AutodocExtension(Extension):
         follow_module_tree = self.getConfig('follow_module_tree')
         template_folder = self.getConfig('template_folder')
         template_file = self.getConfig('template_file')
+        instrumentation = create_instrumentation(
+            self.getConfig('instrumentation'),
+            self.getConfig('instrumentation_report')
+        )
+        import_workers = int(self.getConfig('import_workers'))
+        worker_pool = get_shared_pool(
+            import_workers,
+            int(self.getConfig('worker_max_jobs')),
+            int(self.getConfig('worker_max_memory')) or None
+        ) if import_workers > 0 else None
         md.parser.blockprocessors.register(
             AutodocBlockProcessor(
                 md.parser,
@@ -54,7 +137,21 @@ class AutodocExtension(Extension):
                 prefer_docstring=prefer_docstring,
                 follow_module_tree=follow_module_tree,
                 template_folder=template_folder,
-                template_file=template_file
+                template_file=template_file,
+                instrumentation=instrumentation,
+                resolver=self.resolver,
+                worker_pool=worker_pool,
+                descriptor_cache=self.descriptor_cache,
+                symbol_index=self.symbol_index,
+                symbol_page=self.getConfig('symbol_page'),
+                search_index=self.search_index,
+                renderer=self.getConfig('renderer'),
+                fragment_cache=self.fragment_cache,
+                minify=self.getConfig('minify'),
+                chunk_folder=self.getConfig('chunk_folder'),
+                chunk_url=self.getConfig('chunk_url'),
+                chunk_classes=int(self.getConfig('chunk_classes')),
+                template_cache=self.getConfig('template_cache') or None
             ),
             'autodoc',
             200
@@ -1,29 +1,56 @@
 """A sample extension"""
 
-import inspect
+import copy
+from functools import partial
+import hashlib
+import os
 import re
-from typing import Any, List, Optional
+from typing import Any, Hashable, Iterator, List, Optional, TextIO, Tuple
 import xml.etree.ElementTree as etree
 from xml.etree.cElementTree import Element
 
 from jinja2 import (
+    BytecodeCache,
+    ChoiceLoader,
     Environment,
     BaseLoader,
     PackageLoader,
     FileSystemLoader,
+    pass_context,
     select_autoescape
 )
+from jinja2.runtime import Context
 from markdown.blockparser import BlockParser
 from markdown.blockprocessors import BlockProcessor
+from markdown.util import AtomicString
 
-
+from .caching import LRUCache
+from .element_renderer import ElementRenderer
+from .instrumentation import Instrumentation, NULL_INSTRUMENTATION
+from .minify import MinifyExtension
 from .metadata import (
     Descriptor,
+    DescriptorOptions,
     ModuleDescriptor,
-    CallableDescriptor,
-    ClassDescriptor
+    create_descriptor
+)
+from .metadata.selection import MemberSelection, parse_selection
+from .pagination import paginate
+from .search_index import SearchIndex
+from .symbols import SymbolIndex, qualified_name
+from .utils import ImportResolver
+from .workers import ImportWorkerPool
+
+# A directive, with an optional selection of members.
+DIRECTIVE_PATTERN = re.compile(r'@\[([^\]]+)\](?:\{([^}]*)\})?')
+_DIRECTIVE_LINE = re.compile(r'^' + DIRECTIVE_PATTERN.pattern, re.MULTILINE)
+_FENCED_CODE = re.compile(
+    r'^(`{3,}|~{3,}).*?^\1',
+    re.MULTILINE | re.DOTALL
 )
-from .utils import import_from_string
+# Block processors which keep the definitions they parse in their extension,
+# so fragments must be parsed again for each document when they are present.
+STATEFUL_BLOCK_PROCESSORS = ('footnote', 'abbr')
 
 
 class AutodocBlockProcessor(BlockProcessor):
@@ -41,7 +68,21 @@ class AutodocBlockProcessor(BlockProcessor):
             prefer_docstring: bool = True,
             follow_module_tree: bool = False,
             template_folder: Optional[str] = None,
-            template_file: str = "main.jinja2"
+            template_file: str = "main.jinja2",
+            instrumentation: Optional[Instrumentation] = None,
+            resolver: Optional[ImportResolver] = None,
+            worker_pool: Optional[ImportWorkerPool] = None,
+            descriptor_cache: Optional[LRUCache] = None,
+            symbol_index: Optional[SymbolIndex] = None,
+            symbol_page: str = '',
+            search_index: Optional[SearchIndex] = None,
+            renderer: str = 'template',
+            fragment_cache: Optional[LRUCache] = None,
+            minify: bool = False,
+            chunk_folder: str = '',
+            chunk_url: str = '',
+            chunk_classes: int = 0,
+            template_cache: Optional[BytecodeCache] = None
     ) -> None:
         """An inline processor for **Python** documentation
 
@@ -65,6 +106,50 @@ class AutodocBlockProcessor(BlockProcessor):
                 Defaults to None.
             template_file (Optional[str], optional): The template file to use,
                 Defaults to "main.jinja2".
+            instrumentation (Optional[Instrumentation], optional): The
+                instrumentation to which stage timings are reported. Defaults
+                to None.
+            resolver (Optional[ImportResolver], optional): The cache of
+                resolved import strings. Defaults to None.
+            worker_pool (Optional[ImportWorkerPool], optional): If specified
+                the documented code is imported, and the descriptors created,
+                in worker processes. Defaults to None.
+            descriptor_cache (Optional[LRUCache], optional): If specified
+                descriptors are cached by import string and options. Defaults
+                to None.
+            symbol_index (Optional[SymbolIndex], optional): If specified the
+                documented symbols are added to the index, and type names are
+                linked to the symbols in the index. Defaults to None.
+            symbol_page (str, optional): The URL of the page being rendered,
+                which is recorded in the symbol and search indexes. Defaults
+                to ''.
+            search_index (Optional[SearchIndex], optional): If specified the
+                documented symbols are added to the search index. Defaults to
+                None.
+            renderer (str, optional): Either "template" to render with the
+                Jinja2 templates, or "element" to build the elements directly.
+                The element renderer ignores the template options. Defaults
+                to "template".
+            fragment_cache (Optional[LRUCache], optional): If specified the
+                markdown in the docstrings is cached by its text and the
+                parser configuration. Defaults to None.
+            minify (bool, optional): If True the whitespace which lays out the
+                templates is removed when they are compiled. Defaults to
+                False.
+            chunk_folder (str, optional): If specified the documentation of
+                a module tree is split into chunks, which are written to files
+                in this folder, and the page holds an index of the chunks.
+                Defaults to ''.
+            chunk_url (str, optional): The URL of the chunk folder, prefixed
+                to the chunk file names in the links. Defaults to ''.
+            chunk_classes (int, optional): The maximum number of classes in a
+                chunk, or zero for a chunk per module. Defaults to 0.
+            template_cache (Optional[BytecodeCache], optional): If specified
+                the compiled templates are shared through this cache. Defaults
+                to None.
+
+        Raises:
+            ValueError: If the renderer is unknown.
         """
         super().__init__(parser)
         self.class_from_init = class_from_init
@@ -74,82 +159,411 @@ class AutodocBlockProcessor(BlockProcessor):
         self.ignore_inherited = ignore_inherited
         self.follow_module_tree = follow_module_tree
         self.prefer_docstring = prefer_docstring
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.resolver = resolver or ImportResolver()
+        self.worker_pool = worker_pool
+        self.descriptor_cache = descriptor_cache
+        self.symbol_index = symbol_index
+        self.symbol_page = symbol_page
+        self.search_index = search_index
+        if renderer not in ('template', 'element'):
+            raise ValueError(f"Unknown renderer {renderer!r}")
+        self.renderer = renderer
+        self.fragment_cache = fragment_cache
+        self._parser_config: Optional[Tuple[Hashable, ...]] = None
+        self.minify = minify
+        self.chunk_folder = chunk_folder
+        self.chunk_url = chunk_url
+        self.chunk_classes = chunk_classes
+        loader: BaseLoader = PackageLoader('jetblack_markdown', 'templates')
         if template_folder:
-            loader: BaseLoader = FileSystemLoader(template_folder)
-        else:
-            loader = PackageLoader('jetblack_markdown', 'templates')
+            # The built in templates are used for any not in the folder.
+            loader = ChoiceLoader([FileSystemLoader(template_folder), loader])
         self.env = Environment(
             loader=loader,
-            autoescape=select_autoescape(['html', 'xml'])
+            autoescape=select_autoescape(['html', 'xml']),
+            extensions=[MinifyExtension] if minify else [],
+            bytecode_cache=template_cache
         )
         self.env.filters['md_format'] = self._md_format
+        self.env.filters['link_type'] = self._link_type
+        self.env.filters['symbol_id'] = self._symbol_id
         self.template = self.env.get_template(template_file)
-        self._pattern = re.compile(r'@\[([^\]]+)\]')
-        self._match: Optional[re.Match[str]] = None
+        self._pattern = DIRECTIVE_PATTERN
 
     def test(self, parent: Element, block: str) -> bool:
-        self._match = self._pattern.match(block)
-        return self._match is not None
+        return self._pattern.match(block) is not None
 
     def run(self, parent: Element, blocks: List[str]) -> Optional[bool]:
-
-        assert self._match is not None
-        import_str = self._match.group(1)
+        # The match is repeated, rather than kept from the test, so the
+        # processor holds no state between calls.
+        match = self._pattern.match(blocks[0])
+        if match is None:
+            return False
+        import_str = match.group(1)
         if not import_str:
             return False
+        selection = (
+            parse_selection(match.group(2))
+            if match.group(2) is not None
+            else None
+        )
 
-        html_text = self._render(import_str)
-        element = etree.fromstring(html_text)
-        parent.append(element)
+        self.instrumentation.count('directives', import_str)
+        with self.instrumentation.stage('directive', import_str):
+            descriptor = self._create_descriptor(import_str, selection)
+            if self.chunk_folder and isinstance(descriptor, ModuleDescriptor):
+                element = self._render_chunks(
+                    import_str,
+                    descriptor,
+                    selection
+                )
+            else:
+                self._add_to_indexes(descriptor, self.symbol_page)
+                element = self._render_descriptor(import_str, descriptor)
+            parent.append(element)
 
         blocks.pop(0)
 
         return True
 
-    def _render(self, import_str: str) -> str:
-        obj = import_from_string(import_str)
-        descriptor = self._make_descriptor(obj)
+    def _render_descriptor(
+            self,
+            import_str: str,
+            descriptor: Descriptor
+    ) -> Element:
+        if self.renderer == 'element':
+            return self._render_element(import_str, descriptor)
+        html_text = self._render(import_str, descriptor)
+        self.instrumentation.count('html_length', import_str, len(html_text))
+        with self.instrumentation.stage('parse', import_str):
+            return _protect_code_blocks(etree.fromstring(html_text))
+
+    def _render(self, import_str: str, descriptor: Descriptor) -> str:
+        with self.instrumentation.stage('render', import_str):
+            html_text = self.template.render(
+                obj=descriptor,
+                directive=import_str
+            )
+        return html_text
+
+    def _render_element(
+            self,
+            import_str: str,
+            descriptor: Descriptor
+    ) -> Element:
+        renderer = ElementRenderer(
+            partial(self._md_element, import_str),
+            self.symbol_index,
+            self.minify
+        )
+        with self.instrumentation.stage('render', import_str):
+            element = renderer.render(descriptor)
+        return element
+
+    def _render_chunks(
+            self,
+            import_str: str,
+            module: ModuleDescriptor,
+            selection: Optional[MemberSelection]
+    ) -> Element:
+        os.makedirs(self.chunk_folder, exist_ok=True)
+        # The chunks of a selection hold different members, so they are
+        # written to their own files.
+        suffix = '' if selection is None else '-' + hashlib.sha1(
+            ','.join(selection).encode('utf-8')
+        ).hexdigest()[:8]
+        links = []
+        # Each chunk is written as it is rendered, so only one is held in
+        # memory.
+        for chunk in paginate(module, self.chunk_classes):
+            file_name = f'{chunk.name}{suffix}.html'
+            url = self.chunk_url + file_name
+            self._add_to_indexes(chunk.module, url)
+            element = self._render_descriptor(import_str, chunk.module)
+            with self.instrumentation.stage('write', import_str):
+                html_text = self._serialize(element)
+                with open(
+                        os.path.join(self.chunk_folder, file_name),
+                        'wt',
+                        encoding='utf-8'
+                ) as file_ptr:
+                    file_ptr.write(html_text)
+            links.append((chunk, url))
+
         html_text = self.template.render(
-            obj=descriptor
+            obj=module,
+            chunks=links,
+            directive=import_str
         )
-        return html_text
+        return etree.fromstring(html_text)
 
-    def _make_descriptor(self, obj: Any) -> Descriptor:
-        if inspect.ismodule(obj):
-            return ModuleDescriptor.create(
-                obj,
-                self.class_from_init,
-                self.ignore_dunder,
-                self.ignore_private,
-                self.ignore_all,
-                self.ignore_inherited,
-                self.prefer_docstring,
-                self.follow_module_tree
-            )
-        elif inspect.isclass(obj):
-            return ClassDescriptor.create(
-                obj,
-                self.class_from_init,
-                self.ignore_dunder,
-                self.ignore_private,
-                self.ignore_inherited,
-                prefer_docstring=self.prefer_docstring
+    def _serialize(self, element: Element) -> str:
+        # The chunk is not part of the document, so it is finished as
+        # Markdown.convert would finish a document.
+        md = self.parser.md
+        root = Element(md.doc_tag)
+        root.append(element)
+        for treeprocessor in md.treeprocessors:
+            new_root = treeprocessor.run(root)
+            if new_root is not None:
+                root = new_root
+        html_text = md.serializer(root)
+        start = html_text.index(f'<{md.doc_tag}>') + len(md.doc_tag) + 2
+        end = html_text.rindex(f'</{md.doc_tag}>')
+        html_text = html_text[start:end].strip()
+        for postprocessor in md.postprocessors:
+            html_text = postprocessor.run(html_text)
+        return html_text.strip() + '\n'
+
+    def render_stream(
+            self,
+            import_str: str,
+            selection: Optional[MemberSelection] = None
+    ) -> Iterator[str]:
+        """Render the documentation for an import string as a stream of
+        fragments.
+
+        The fragments are generated as the template is rendered, so the whole
+        document is never held in memory. With the built in templates each
+        module member is a separate fragment.
+
+        Args:
+            import_str (str): The import string
+            selection (Optional[MemberSelection], optional): The members to
+                describe, or None for all. Defaults to None.
+
+        Returns:
+            Iterator[str]: The html fragments
+        """
+        descriptor = self._create_descriptor(import_str, selection)
+        self._add_to_indexes(descriptor, self.symbol_page)
+        return self.template.generate(
+            obj=descriptor,
+            directive=import_str,
+            stream=True
+        )
+
+    def render_to(
+            self,
+            import_str: str,
+            sink: TextIO,
+            selection: Optional[MemberSelection] = None
+    ) -> int:
+        """Render the documentation for an import string to a file like
+        object.
+
+        Args:
+            import_str (str): The import string
+            sink (TextIO): The file like object
+            selection (Optional[MemberSelection], optional): The members to
+                describe, or None for all. Defaults to None.
+
+        Returns:
+            int: The number of characters written
+        """
+        length = 0
+        for fragment in self.render_stream(import_str, selection):
+            sink.write(fragment)
+            length += len(fragment)
+        return length
+
+    def prepare(
+            self,
+            import_str: str,
+            selection: Optional[MemberSelection] = None
+    ) -> Descriptor:
+        """Create the descriptor for an import string without rendering it.
+
+        When the processor has a descriptor cache the descriptor is cached, so
+        the cache can be filled before the pages are rendered.
+
+        Args:
+            import_str (str): The import string
+            selection (Optional[MemberSelection], optional): The members to
+                describe, or None for all. Defaults to None.
+
+        Returns:
+            Descriptor: The descriptor
+        """
+        return self._create_descriptor(import_str, selection)
+
+    def _create_descriptor(
+            self,
+            import_str: str,
+            selection: Optional[MemberSelection] = None
+    ) -> Descriptor:
+        options = self.descriptor_options._replace(selection=selection)
+        if self.descriptor_cache is None:
+            descriptor = self._build_descriptor(import_str, options)
+        else:
+            key = (import_str, options)
+            cached = self.descriptor_cache.get(key)
+            if cached is None:
+                descriptor = self._build_descriptor(import_str, options)
+                self.descriptor_cache.put(key, descriptor)
+            else:
+                descriptor = cached
+                self.instrumentation.count('descriptor_cache_hits', import_str)
+        return descriptor
+
+    def _add_to_indexes(self, descriptor: Descriptor, page: str) -> None:
+        if self.symbol_index is not None:
+            self.symbol_index.add(descriptor, page)
+        if self.search_index is not None:
+            self.search_index.add(descriptor, page)
+
+    def _build_descriptor(
+            self,
+            import_str: str,
+            options: DescriptorOptions
+    ) -> Descriptor:
+        if self.worker_pool is not None:
+            with self.instrumentation.stage('descriptor', import_str):
+                return self.worker_pool.create_descriptor(import_str, options)
+
+        with self.instrumentation.stage('import', import_str):
+            target = self.resolver.resolve(import_str)
+        with self.instrumentation.stage('descriptor', import_str):
+            descriptor = create_descriptor(
+                target.obj,
+                options,
+                target.parent,
+                target.name
             )
-        elif inspect.isfunction(obj):
-            return CallableDescriptor.create(
-                obj,
-                prefer_docstring=self.prefer_docstring
+        return descriptor
+
+    @property
+    def descriptor_options(self) -> DescriptorOptions:
+        """The options for creating descriptors
+
+        Returns:
+            DescriptorOptions: The descriptor options
+        """
+        return DescriptorOptions(
+            self.class_from_init,
+            self.ignore_dunder,
+            self.ignore_private,
+            self.ignore_all,
+            self.ignore_inherited,
+            self.prefer_docstring,
+            self.follow_module_tree
+        )
+
+    @pass_context
+    def _md_format(self, context: Context, text: str) -> str:
+        directive = context.get('directive', '')
+        with self.instrumentation.stage('md_format', directive):
+            return self._format_fragment(directive, text, False)
+
+    def _md_element(self, directive: str, text: str) -> Element:
+        with self.instrumentation.stage('md_format', directive):
+            return self._format_fragment(directive, text, True)
+
+    def _format_fragment(self, directive: str, text: str, as_element: bool) -> Any:
+        if self.fragment_cache is None or self._get_parser_config() is None:
+            element = self._parse_chunk_element(text)
+            return element if as_element else _to_string(element)
+
+        key = (as_element, text, self._get_parser_config())
+        cached = self.fragment_cache.get(key)
+        if cached is not None:
+            self.instrumentation.count('fragment_cache_hits', directive)
+            # The elements are changed by the inline processors.
+            return copy.deepcopy(cached) if as_element else cached
+
+        md = self.parser.md
+        stashed, references = md.htmlStash.html_counter, len(md.references)
+        element = self._parse_chunk_element(text)
+        value = element if as_element else _to_string(element)
+        if (
+                md.htmlStash.html_counter == stashed and
+                len(md.references) == references
+        ):
+            # Fragments which stash html or define references are part of
+            # the document, so are not cached.
+            self.fragment_cache.put(
+                key,
+                copy.deepcopy(value) if as_element else value
             )
-        else:
-            raise RuntimeError("Unhandled descriptor")
+        return value
+
+    def _get_parser_config(self) -> Optional[Tuple[Hashable, ...]]:
+        # Extensions registered after this one add their processors, so the
+        # configuration is taken when the first fragment is parsed. There is
+        # no configuration when the fragments cannot be cached.
+        if self._parser_config is None:
+            md = self.parser.md
+            blockprocessors = self.parser.blockprocessors
+            if any(name in blockprocessors for name in STATEFUL_BLOCK_PROCESSORS):
+                self._parser_config = ()
+            else:
+                self._parser_config = (
+                    md.tab_length,
+                    md.output_format,
+                    tuple(
+                        f'{type(processor).__module__}.{type(processor).__qualname__}'
+                        for processor in blockprocessors
+                    )
+                )
+        return self._parser_config or None
 
-    def _md_format(self, text: str) -> str:
+    def _parse_chunk_element(self, text: str) -> Element:
         parent = Element("div")
         self.parser.parseChunk(parent, text)
         children = next(iter(parent))
-        buf = (
-            etree.tostring(children[0])
-            if len(children) == 1
-            else etree.tostring(parent)
+        return children[0] if len(children) == 1 else parent
+
+    def _link_type(self, text: str, module: Optional[str] = None) -> str:
+        if self.symbol_index is None or not text:
+            return text
+        if module and f'{module}.{text}' in self.symbol_index:
+            return self.symbol_index.link_name(f'{module}.{text}', text)
+        return self.symbol_index.link(text)
+
+    def _symbol_id(self, descriptor: Descriptor) -> str:
+        if self.symbol_index is None:
+            return ''
+        name = qualified_name(descriptor)
+        return f' id="{name}"' if name else ''
+
+
+def _to_string(element: Element) -> str:
+    return etree.tostring(element).decode('utf-8')
+
+
+def _protect_code_blocks(element: Element) -> Element:
+    # The code blocks of the docstrings lose their atomic text when the
+    # rendered html is parsed, and would be processed as inline markdown.
+    for pre in element.iter('pre'):
+        for code in pre:
+            if code.tag == 'code' and code.text:
+                code.text = AtomicString(code.text)
+    return element
+
+
+def find_directives(text: str) -> List[Tuple[str, Optional[MemberSelection]]]:
+    """Find the directives in a markdown document.
+
+    Directives at the start of a line are found, except in fenced code
+    blocks.
+
+    Args:
+        text (str): The markdown
+
+    Raises:
+        ValueError: If a selection has an unknown kind.
+
+    Returns:
+        List[Tuple[str, Optional[MemberSelection]]]: The import string and
+            selection of each directive.
+    """
+    return [
+        (
+            match.group(1),
+            parse_selection(match.group(2))
+            if match.group(2) is not None
+            else None
         )
-        return buf.decode('utf-8')
+        for match in _DIRECTIVE_LINE.finditer(_FENCED_CODE.sub('', text))
+    ]
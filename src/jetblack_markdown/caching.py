@@ -0,0 +1,244 @@
+"""Caches shared between renders"""
+
+from __future__ import annotations
+from collections import OrderedDict
+import os
+import sys
+import sysconfig
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    TypeVar,
+    Union
+)
+
+from jinja2.bccache import Bucket, BytecodeCache
+
+V = TypeVar('V')
+
+
+def is_free_threaded() -> bool:
+    """Check if the interpreter is running without the GIL.
+
+    Returns:
+        bool: True on a free threaded build with the GIL disabled.
+    """
+    if not sysconfig.get_config_var('Py_GIL_DISABLED'):
+        return False
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is None or not is_gil_enabled()
+
+
+def default_shards() -> int:
+    """The number of shards for a cache shared between threads.
+
+    With the GIL a single lock is not contended, so there is one shard.
+
+    Returns:
+        int: The number of shards
+    """
+    if not is_free_threaded():
+        return 1
+    return min(os.cpu_count() or 1, 16)
+
+
+class _Shard(Generic[V]):
+    """A part of the cache, with its own lock"""
+
+    __slots__ = ('maxsize', 'hits', 'misses', 'entries', 'lock')
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.entries: OrderedDict[Hashable, V] = OrderedDict()
+        self.lock = threading.Lock()
+
+
+class LRUCache(Generic[V]):
+    """A thread safe, bounded, least recently used cache.
+
+    The cache counts its hits and misses, so the hit rate can be reported.
+    The keys can be split between shards, each with its own lock, so threads
+    running without the GIL rarely contend.
+    """
+
+    def __init__(self, maxsize: int = 1024, shards: Optional[int] = None) -> None:
+        """A thread safe, bounded, least recently used cache.
+
+        Args:
+            maxsize (int, optional): The maximum number of entries. Defaults
+                to 1024.
+            shards (Optional[int], optional): The number of shards. Defaults
+                to one, or more when the interpreter is free threaded.
+        """
+        shards = max(1, min(shards or default_shards(), maxsize))
+        self.maxsize = maxsize
+        self._shards: List[_Shard[V]] = [
+            _Shard(maxsize // shards + (1 if index < maxsize % shards else 0))
+            for index in range(shards)
+        ]
+
+    def _shard(self, key: Hashable) -> _Shard[V]:
+        if len(self._shards) == 1:
+            return self._shards[0]
+        return self._shards[hash(key) % len(self._shards)]
+
+    @property
+    def hits(self) -> int:
+        """The number of lookups which found a value"""
+        return sum(shard.hits for shard in self._shards)
+
+    @property
+    def misses(self) -> int:
+        """The number of lookups which found no value"""
+        return sum(shard.misses for shard in self._shards)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Get a value from the cache
+
+        Args:
+            key (Hashable): The key
+
+        Returns:
+            Optional[V]: The value, or None if the key was not found.
+        """
+        shard = self._shard(key)
+        with shard.lock:
+            value = shard.entries.get(key)
+            if value is None:
+                shard.misses += 1
+            else:
+                shard.hits += 1
+                shard.entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Put a value in the cache
+
+        Args:
+            key (Hashable): The key
+            value (V): The value
+        """
+        shard = self._shard(key)
+        with shard.lock:
+            shard.entries[key] = value
+            shard.entries.move_to_end(key)
+            while len(shard.entries) > shard.maxsize:
+                shard.entries.popitem(last=False)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], V]) -> V:
+        """Get a value from the cache, creating it if necessary.
+
+        The factory is called outside the lock, so two threads may create the
+        same value concurrently. The last one is kept.
+
+        Args:
+            key (Hashable): The key
+            factory (Callable[[], V]): A function which creates the value
+
+        Returns:
+            V: The value
+        """
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Clear the cache and its statistics"""
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.hits = 0
+                shard.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """The cache statistics
+
+        Returns:
+            Dict[str, Any]: The hits, misses, hit rate and size of the cache
+        """
+        hits = misses = size = 0
+        for shard in self._shards:
+            with shard.lock:
+                hits += shard.hits
+                misses += shard.misses
+                size += len(shard.entries)
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'size': size,
+            'maxsize': self.maxsize,
+        }
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+
+def create_cache(value: Union[int, LRUCache, None]) -> Optional[LRUCache]:
+    """Create a cache from an extension config value.
+
+    Args:
+        value (Union[int, LRUCache, None]): A cache to share, or the size of a
+            new cache. A size of zero disables the cache.
+
+    Returns:
+        Optional[LRUCache]: The cache, or None if caching is disabled.
+    """
+    if isinstance(value, LRUCache):
+        return value
+    size = int(value or 0)
+    return LRUCache(size) if size > 0 else None
+
+
+class TemplateCache(BytecodeCache):
+    """An in memory cache of compiled templates, shared by Jinja2
+    environments.
+
+    Each processor has its own environment, so without a shared cache the
+    templates are compiled again for every page. Jinja2 checks the template
+    source against the cached code, so changed templates are compiled again.
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        """An in memory cache of compiled templates.
+
+        Args:
+            maxsize (int, optional): The maximum number of templates. Defaults
+                to 64.
+        """
+        self.entries: LRUCache[bytes] = LRUCache(maxsize, shards=1)
+
+    @classmethod
+    def _key(cls, bucket: Bucket) -> Hashable:
+        # The extensions, for example minification, change the compiled code.
+        return (bucket.key, tuple(sorted(bucket.environment.extensions)))
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        data = self.entries.get(self._key(bucket))
+        if data is not None:
+            bucket.bytecode_from_string(data)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        self.entries.put(self._key(bucket), bucket.bytecode_to_string())
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """The cache statistics
+
+        Returns:
+            Dict[str, Any]: The hits, misses, hit rate and size of the cache
+        """
+        return self.entries.stats()
@@ -0,0 +1,414 @@
+"""A long lived render daemon.
+
+Editor previews which start a new process for every render pay for importing
+the documented code, compiling the templates and introspecting the code each
+time. The daemon keeps a pool of `Markdown` instances, with their compiled
+templates, and shares an import resolver, a descriptor cache, a docstring
+fragment cache and a MathML cache between them, so repeated renders only pay
+for the markdown.
+
+Requests and responses are JSON objects, one per line, over a Unix socket or
+stdin and stdout.
+
+```json
+{"id": 1, "command": "render", "markdown": "@[tests.mocks:mock_func]"}
+{"id": 1, "html": "<div class=\\"autodoc-callable\\">..."}
+```
+
+The commands are "render", "stats", "reset" (which clears the caches and
+forgets the documented modules) and "ping". A failed request is answered with an "error".
+
+```bash
+python -m jetblack_markdown.daemon --socket /tmp/jetblack-markdown.sock
+python -m jetblack_markdown.daemon --stdio
+```
+"""
+
+from __future__ import annotations
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+import importlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence, TextIO
+
+from .caching import LRUCache
+from .metadata.classes import MEMBER_CACHE
+from .pool import MarkdownPool
+from .utils import ImportResolver
+
+AUTODOC_EXTENSION = 'jetblack_markdown.autodoc'
+LATEX2MATHML_EXTENSION = 'jetblack_markdown.latex2mathml'
+
+DEFAULT_EXTENSIONS = [
+    'admonition',
+    'codehilite',
+    AUTODOC_EXTENSION,
+    LATEX2MATHML_EXTENSION
+]
+
+# The packages whose modules are never forgotten on a reset.
+_KEPT_PACKAGES = frozenset(
+    getattr(sys, 'stdlib_module_names', sys.builtin_module_names)
+) | {__name__.partition('.')[0]}
+
+
+class RenderDaemon:
+    """Renders markdown with warm imports, templates and caches"""
+
+    def __init__(
+            self,
+            extensions: Optional[Sequence[str]] = None,
+            extension_configs: Optional[Mapping[str, Mapping[str, Any]]] = None,
+            instances: int = 4,
+            cache_size: int = 1024
+    ) -> None:
+        """Renders markdown with warm imports, templates and caches
+
+        Args:
+            extensions (Optional[Sequence[str]], optional): The markdown
+                extensions. Defaults to None.
+            extension_configs (Optional[Mapping[str, Mapping[str, Any]]], optional):
+                The extension configurations. Defaults to None.
+            instances (int, optional): The number of markdown instances, and
+                so the number of concurrent renders. Defaults to 4.
+            cache_size (int, optional): The number of descriptors, docstring
+                fragments and formulas to cache. Defaults to 1024.
+        """
+        self.extensions = list(
+            DEFAULT_EXTENSIONS if extensions is None else extensions
+        )
+        self.resolver = ImportResolver()
+        self.descriptor_cache: LRUCache = LRUCache(cache_size)
+        self.fragment_cache: LRUCache = LRUCache(cache_size)
+        self.mathml_cache: LRUCache = LRUCache(cache_size)
+        self.renders = 0
+        self._lock = threading.Lock()
+        self._reset_lock = threading.Lock()
+
+        configs = {
+            name: dict(config)
+            for name, config in (extension_configs or {}).items()
+        }
+        if AUTODOC_EXTENSION in self.extensions:
+            configs.setdefault(AUTODOC_EXTENSION, {}).update(
+                resolver=self.resolver,
+                descriptor_cache=self.descriptor_cache,
+                fragment_cache=self.fragment_cache
+            )
+        if LATEX2MATHML_EXTENSION in self.extensions:
+            configs.setdefault(LATEX2MATHML_EXTENSION, {}).update(
+                mathml_cache=self.mathml_cache
+            )
+        self.extension_configs = configs
+
+        self.pool = MarkdownPool(
+            self.extensions,
+            self.extension_configs,
+            instances
+        )
+        # The instances are created up front, so the first requests find the
+        # templates compiled.
+        with ExitStack() as stack:
+            for _ in range(instances):
+                stack.enter_context(self.pool.acquire())
+        # The modules imported after this, which include the documented
+        # code, are forgotten on a reset.
+        self._initial_modules = frozenset(sys.modules)
+
+    def render(self, text: str) -> str:
+        """Render markdown as HTML
+
+        Args:
+            text (str): The markdown
+
+        Returns:
+            str: The HTML
+        """
+        try:
+            return self.pool.convert(text)
+        finally:
+            with self._lock:
+                self.renders += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """The render count and cache statistics
+
+        Returns:
+            Dict[str, Any]: The statistics
+        """
+        return {
+            'renders': self.renders,
+            'descriptor_cache': self.descriptor_cache.stats(),
+            'fragment_cache': self.fragment_cache.stats(),
+            'mathml_cache': self.mathml_cache.stats(),
+        }
+
+    def reset(self) -> None:
+        """Clear the caches, and forget the documented modules, so changes to
+        the documented code are seen.
+
+        The renders in progress finish first, and new renders wait for the
+        reset. The modules of the documented packages which were imported
+        since the daemon started are removed from `sys.modules`, and are
+        imported again when they are next documented. Modules of the
+        standard library, and of this package, are kept, as are modules
+        which were imported before the daemon started.
+        """
+        with self._reset_lock, ExitStack() as stack:
+            for _ in range(self.pool.size):
+                stack.enter_context(self.pool.acquire())
+
+            packages = self.resolver.packages() - _KEPT_PACKAGES
+            for name in list(sys.modules):
+                if (
+                        name.partition('.')[0] in packages and
+                        name not in self._initial_modules
+                ):
+                    sys.modules.pop(name, None)
+            importlib.invalidate_caches()
+            MEMBER_CACHE.clear()
+            self.resolver.clear()
+            self.descriptor_cache.clear()
+            self.fragment_cache.clear()
+            self.mathml_cache.clear()
+            with self._lock:
+                self.renders = 0
+
+    def handle(self, request: Mapping[str, Any]) -> Dict[str, Any]:
+        """Handle a request
+
+        Args:
+            request (Mapping[str, Any]): The request
+
+        Returns:
+            Dict[str, Any]: The response
+        """
+        response: Dict[str, Any] = {'id': request.get('id')}
+        command = request.get('command', 'render')
+        try:
+            if command == 'render':
+                response['html'] = self.render(request['markdown'])
+            elif command == 'stats':
+                response['stats'] = self.stats()
+            elif command == 'reset':
+                self.reset()
+                response['ok'] = True
+            elif command == 'ping':
+                response['ok'] = True
+            else:
+                response['error'] = f"Unknown command {command!r}"
+        except Exception as error:  # pylint: disable=broad-except
+            response['error'] = f'{type(error).__name__}: {error}'
+        return response
+
+    def handle_line(self, line: str) -> str:
+        """Handle a request encoded as a line of JSON
+
+        Args:
+            line (str): The request
+
+        Returns:
+            str: The response as a line of JSON
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object")
+        except ValueError as error:
+            response: Dict[str, Any] = {
+                'id': None,
+                'error': f'Invalid request: {error}'
+            }
+        else:
+            response = self.handle(request)
+        return json.dumps(response) + '\n'
+
+
+def serve_stdio(
+        daemon: RenderDaemon,
+        reader: TextIO = sys.stdin,
+        writer: TextIO = sys.stdout,
+        max_workers: int = 4
+) -> None:
+    """Serve requests from a reader until it closes.
+
+    Requests are handled concurrently, so responses may be written out of
+    order. Clients should match them by "id".
+
+    Args:
+        daemon (RenderDaemon): The daemon
+        reader (TextIO, optional): The request stream. Defaults to sys.stdin.
+        writer (TextIO, optional): The response stream. Defaults to
+            sys.stdout.
+        max_workers (int, optional): The number of concurrent requests.
+            Defaults to 4.
+    """
+    lock = threading.Lock()
+
+    def respond(line: str) -> None:
+        response = daemon.handle_line(line)
+        with lock:
+            writer.write(response)
+            writer.flush()
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        for line in reader:
+            if line.strip():
+                executor.submit(respond, line)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self) -> None:
+        daemon: RenderDaemon = self.server.daemon  # type: ignore
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = daemon.handle_line(line.decode('utf-8'))
+            self.wfile.write(response.encode('utf-8'))
+            self.wfile.flush()
+
+
+class RenderServer(socketserver.ThreadingUnixStreamServer):
+    """A Unix socket server for a render daemon.
+
+    Each connection is handled by its own thread, and requests on a
+    connection are answered in order.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str, daemon: RenderDaemon) -> None:
+        """A Unix socket server for a render daemon
+
+        Args:
+            path (str): The path of the socket
+            daemon (RenderDaemon): The daemon
+        """
+        self.daemon = daemon
+        super().__init__(path, _RequestHandler)
+
+
+class RenderClient:
+    """A client for a render daemon listening on a Unix socket"""
+
+    def __init__(self, path: str) -> None:
+        """A client for a render daemon listening on a Unix socket
+
+        Args:
+            path (str): The path of the socket
+        """
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(path)
+        self._file = self._socket.makefile('rwb')
+        self._next_id = 0
+
+    def request(self, command: str, **kwargs: Any) -> Dict[str, Any]:
+        """Send a request and wait for the response
+
+        Args:
+            command (str): The command
+            **kwargs (Any): The arguments of the command
+
+        Raises:
+            RuntimeError: If the request failed.
+
+        Returns:
+            Dict[str, Any]: The response
+        """
+        self._next_id += 1
+        request = dict(kwargs, id=self._next_id, command=command)
+        self._file.write(json.dumps(request).encode('utf-8') + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise RuntimeError("The render daemon closed the connection")
+        response = json.loads(line)
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    def render(self, text: str) -> str:
+        """Render markdown as HTML
+
+        Args:
+            text (str): The markdown
+
+        Returns:
+            str: The HTML
+        """
+        return self.request('render', markdown=text)['html']
+
+    def close(self) -> None:
+        """Close the connection"""
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> RenderClient:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the render daemon
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    transport = parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument('--socket', help='The path of a Unix socket')
+    transport.add_argument(
+        '--stdio',
+        action='store_true',
+        help='Serve requests on stdin and stdout'
+    )
+    parser.add_argument(
+        '--extension',
+        action='append',
+        dest='extensions',
+        help='A markdown extension (repeatable)'
+    )
+    parser.add_argument(
+        '--extension-configs',
+        help='A JSON file of extension configurations'
+    )
+    parser.add_argument('--instances', type=int, default=4)
+    parser.add_argument('--cache-size', type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    extension_configs = None
+    if args.extension_configs:
+        with open(args.extension_configs, 'rt', encoding='utf-8') as file:
+            extension_configs = json.load(file)
+
+    daemon = RenderDaemon(
+        args.extensions,
+        extension_configs,
+        instances=args.instances,
+        cache_size=args.cache_size
+    )
+
+    if args.stdio:
+        serve_stdio(daemon, max_workers=args.instances)
+    else:
+        with RenderServer(args.socket, daemon) as server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.unlink(args.socket)
+
+
+if __name__ == '__main__':
+    main()
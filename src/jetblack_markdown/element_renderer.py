@@ -0,0 +1,406 @@
+"""Rendering descriptors directly as elements.
+
+The template renderer produces a string of HTML which is then parsed back
+into elements. When the built in templates are good enough the
+`ElementRenderer` builds the same `autodoc-*` classed structure as
+`macros.jinja2` directly, with the `add_tag` helpers, which skips both the
+string templating and the XML parsing. Whitespace between the elements is not
+reproduced, although the line break markdown finds in the whitespace of the
+templates after a signature is, unless the templates are minified.
+"""
+
+from typing import Callable, List, Optional, Sequence
+import xml.etree.ElementTree as etree
+from xml.etree.ElementTree import Element
+
+from .metadata import (
+    ArgumentDescriptor,
+    CallableDescriptor,
+    ClassDescriptor,
+    Descriptor,
+    ModuleDescriptor,
+    PropertyDescriptor
+)
+from .symbols import SymbolIndex, qualified_name
+from .utils import add_span_tag, add_tag, add_text_tag
+
+_PUNCTUATION = 'autodoc-punctuation'
+_VARNAME = 'autodoc-varname'
+_VARTYPE = 'autodoc-vartype'
+_TITLE = 'autodoc-title'
+
+
+class ElementRenderer:
+    """Renders descriptors as elements, with the markup of `macros.jinja2`"""
+
+    def __init__(
+            self,
+            md_format: Callable[[str], Element],
+            symbol_index: Optional[SymbolIndex] = None,
+            minify: bool = False
+    ) -> None:
+        """Renders descriptors as elements
+
+        Args:
+            md_format (Callable[[str], Element]): A function which converts
+                markdown text to an element.
+            symbol_index (Optional[SymbolIndex], optional): If specified type
+                names are linked to the symbols in the index, and the
+                documented objects are given their qualified names as ids.
+                Defaults to None.
+            minify (bool, optional): If True the elements match the minified
+                templates. Defaults to False.
+        """
+        self.md_format = md_format
+        self.symbol_index = symbol_index
+        self.minify = minify
+
+    def render(self, descriptor: Descriptor) -> Element:
+        """Render a descriptor
+
+        Args:
+            descriptor (Descriptor): A module, class, callable or property
+                descriptor
+
+        Raises:
+            ValueError: If the descriptor cannot be rendered.
+
+        Returns:
+            Element: The element
+        """
+        # The template renders within a document, so the element is built
+        # within a holder and detached.
+        holder = Element('div')
+        if isinstance(descriptor, ModuleDescriptor):
+            self.render_module(descriptor, holder)
+        elif isinstance(descriptor, ClassDescriptor):
+            self.render_class(descriptor, holder)
+        elif isinstance(descriptor, CallableDescriptor):
+            self.render_callable(descriptor, holder)
+        elif isinstance(descriptor, PropertyDescriptor):
+            self.render_properties([descriptor], holder)
+        else:
+            raise ValueError(f"Cannot render {descriptor!r}")
+        return holder[0]
+
+    def _add_symbol_id(self, element: Element, descriptor: Descriptor) -> None:
+        if self.symbol_index is None:
+            return
+        name = qualified_name(descriptor)
+        if name:
+            element.set('id', name)
+
+    def _add_type(
+            self,
+            text: str,
+            klass: str,
+            parent: Element,
+            module: Optional[str] = None
+    ) -> Element:
+        element = add_span_tag(text, klass, parent)
+        if self.symbol_index is None or not text:
+            return element
+        if module and f'{module}.{text}' in self.symbol_index:
+            linked = self.symbol_index.link_name(f'{module}.{text}', text)
+        else:
+            linked = self.symbol_index.link(text)
+        if linked != text:
+            parent.remove(element)
+            element = etree.fromstring(f'<span>{linked}</span>')
+            element.set('class', klass)
+            parent.append(element)
+        return element
+
+    def _add_line_break(self, parent: Element) -> None:
+        # The indentation of the templates ends some lines with spaces, which
+        # Markdown renders as a line break.
+        if not self.minify:
+            add_tag('br', None, parent)
+
+    def _add_markdown(self, text: str, parent: Element) -> None:
+        parent.append(self.md_format(text))
+
+    def render_qualified_title(
+            self,
+            qualifier: str,
+            name: str,
+            object_type: str,
+            parent: Element
+    ) -> None:
+        """Render the title"""
+        title = add_tag('h3', _TITLE, parent)
+        add_span_tag(f'{object_type} ', 'autodoc-title-type', title)
+        add_span_tag(qualifier, 'autodoc-qualifier', title)
+        add_span_tag('.', _PUNCTUATION, title)
+        add_span_tag(name, 'autodoc-title-name', title)
+
+    def render_class_title(
+            self,
+            name: str,
+            bases: Sequence[ClassDescriptor],
+            object_type: str,
+            parent: Element
+    ) -> None:
+        """Render the class title"""
+        title = add_tag('h3', _TITLE, parent)
+        add_span_tag(f'{object_type} ', 'autodoc-title-type', title)
+        add_span_tag(name, 'autodoc-title-name', title)
+        if bases:
+            add_span_tag('(', _PUNCTUATION, title)
+            for index, base in enumerate(bases):
+                self._add_type(base.name, 'autodoc-type', title, base.module)
+                if index < len(bases) - 1:
+                    # The class name is misspelt in the template.
+                    add_span_tag(', ', 'autodoc-puntuation', title)
+            add_span_tag(')', _PUNCTUATION, title)
+
+    def render_summary(self, summary: Optional[str], parent: Element) -> None:
+        """Render the summary"""
+        if summary:
+            add_text_tag('h4', 'Summary', _TITLE, parent)
+            self._add_markdown(
+                summary,
+                add_tag('div', 'autodoc-description', parent)
+            )
+        else:
+            self._add_line_break(parent)
+
+    def render_signature(
+            self,
+            callable_: CallableDescriptor,
+            parent: Element
+    ) -> None:
+        """Render the signature"""
+        signature = add_tag('div', 'autodoc-signature', parent)
+        if callable_.is_async:
+            add_span_tag('async', 'autodoc-keyword', signature)
+            add_span_tag(' ', None, signature)
+        add_span_tag(callable_.qualifier, 'autodoc-qualifier', signature)
+        add_span_tag('.', _PUNCTUATION, signature)
+        add_text_tag('var', callable_.name, _VARNAME, signature)
+        add_span_tag('(', _PUNCTUATION, signature)
+        if callable_.arguments:
+            arglist = add_tag('div', 'autodoc-arglist', signature)
+            for index, arg in enumerate(callable_.arguments):
+                argument = add_tag('div', 'autodoc-argument', arglist)
+                add_text_tag('var', arg.name, _VARNAME, argument)
+                if arg.type:
+                    add_span_tag(': ', _PUNCTUATION, argument)
+                    self._add_type(arg.type, _VARTYPE, argument)
+                if index < len(callable_.arguments) - 1:
+                    add_span_tag(',', _PUNCTUATION, argument)
+        add_span_tag(')', _PUNCTUATION, signature)
+        if callable_.return_type:
+            add_span_tag(' -> ', _PUNCTUATION, signature)
+            self._add_type(callable_.return_type, _VARTYPE, signature)
+
+    def render_parameters(
+            self,
+            arguments: Optional[List[ArgumentDescriptor]],
+            parent: Element
+    ) -> None:
+        """Render the parameters"""
+        if not arguments:
+            return
+        parameters = add_tag('div', 'autodoc-parameters', parent)
+        add_text_tag('h4', 'Parameters', _TITLE, parameters)
+        for argument in arguments:
+            if argument.name in ('*', '/'):
+                continue
+            add_text_tag('var', argument.name, _VARNAME, parameters)
+            if argument.type:
+                add_span_tag(': ', _PUNCTUATION, parameters)
+                self._add_type(argument.type, _VARTYPE, parameters)
+            if argument.is_optional:
+                add_span_tag(' (optional)', _PUNCTUATION, parameters)
+            vardesc = add_tag('div', 'autodoc-vardesc', parameters)
+            if argument.description:
+                self._add_markdown(argument.description, vardesc)
+
+    def render_attributes(
+            self,
+            attributes: List[ArgumentDescriptor],
+            parent: Element
+    ) -> None:
+        """Render the attributes"""
+        element = add_tag('div', 'autodoc-attributes', parent)
+        if not attributes:
+            return
+        add_text_tag('h3', 'Attributes', _TITLE, element)
+        for attribute in attributes:
+            add_text_tag('var', attribute.name, _VARNAME, element)
+            if attribute.type:
+                add_span_tag(': ', _PUNCTUATION, element)
+                self._add_type(attribute.type, _VARTYPE, element)
+            if attribute.is_optional:
+                add_span_tag(' (optional)', _PUNCTUATION, element)
+            vardesc = add_tag('div', 'autodoc-vardesc', element)
+            if attribute.description:
+                vardesc.text = attribute.description
+
+    def render_description(
+            self,
+            description: Optional[str],
+            parent: Element
+    ) -> None:
+        """Render the description"""
+        element = add_tag('div', 'autodoc-description', parent)
+        if description:
+            add_text_tag('h4', 'Description', _TITLE, element)
+            self._add_markdown(
+                description,
+                add_tag('div', 'autodoc-description', element)
+            )
+
+    def render_examples(
+            self,
+            examples: Optional[List[str]],
+            parent: Element
+    ) -> None:
+        """Render the examples"""
+        element = add_tag('div', 'autodoc-examples', parent)
+        if examples:
+            add_text_tag('h3', 'Examples', _TITLE, element)
+            for example in examples:
+                add_text_tag('div', example, 'autodoc-example', element)
+
+    def render_raises(self, parent: Element) -> None:
+        """Render the raises.
+
+        The template never renders the exceptions, so neither does this.
+        """
+        add_tag('div', 'autodoc-raises', parent)
+
+    def render_returns(
+            self,
+            callable_: CallableDescriptor,
+            parent: Element
+    ) -> None:
+        """Render the returns"""
+        element = add_tag('div', 'autodoc-returns', parent)
+        if callable_.return_type in ('None', 'typing.None'):
+            return
+        add_text_tag(
+            'h4',
+            'Yields' if callable_.is_generator else 'Returns',
+            _TITLE,
+            element
+        )
+        self._add_type(callable_.return_type, _VARTYPE, element)
+        add_span_tag(': ', _PUNCTUATION, element)
+        if callable_.return_description:
+            add_span_tag(
+                callable_.return_description,
+                'autodoc-summary',
+                element
+            )
+
+    def render_properties(
+            self,
+            properties: List[PropertyDescriptor],
+            parent: Element
+    ) -> None:
+        """Render the properties"""
+        element = add_tag('div', 'autodoc-properties', parent)
+        for prop in properties:
+            container = add_tag('div', 'autodoc-property', element)
+            self.render_qualified_title(
+                prop.qualifier,
+                prop.name,
+                'property',
+                container
+            )
+            self.render_summary(prop.summary, container)
+            self.render_description(prop.description, container)
+            getter = add_tag('div', 'autodoc-property', container)
+            add_text_tag('var', prop.name, _VARNAME, getter)
+            add_span_tag(' -> ', _PUNCTUATION, getter)
+            self._add_type(prop.type, _VARTYPE, getter)
+            if prop.is_settable:
+                setter = add_tag('div', 'autodoc-property', container)
+                add_text_tag('var', prop.name, _VARNAME, setter)
+                add_span_tag(': ', _PUNCTUATION, setter)
+                self._add_type(prop.type, _VARTYPE, setter)
+                add_span_tag(' = ...', _PUNCTUATION, setter)
+            if prop.is_deletable:
+                deleter = add_tag('div', 'autodoc-property', container)
+                add_span_tag('del', 'autodoc-keyword', deleter)
+                add_span_tag(' ', _PUNCTUATION, deleter)
+                add_text_tag('var', prop.name, _VARNAME, deleter)
+            self.render_raises(container)
+            self.render_examples(prop.examples, container)
+
+    def render_callable(
+            self,
+            callable_: CallableDescriptor,
+            parent: Element
+    ) -> None:
+        """Render a callable"""
+        element = add_tag('div', 'autodoc-callable', parent)
+        self._add_symbol_id(element, callable_)
+        self.render_qualified_title(
+            callable_.qualifier,
+            callable_.name,
+            callable_.callable_type_description,
+            element
+        )
+        self.render_summary(callable_.summary, element)
+        self.render_description(callable_.description, element)
+        self.render_signature(callable_, element)
+        self._add_line_break(element)
+        self.render_parameters(callable_.arguments, element)
+        self.render_returns(callable_, element)
+        self.render_raises(element)
+        self.render_examples(callable_.examples, element)
+
+    def render_methods(
+            self,
+            methods: List[CallableDescriptor],
+            klass: str,
+            parent: Element
+    ) -> None:
+        """Render methods"""
+        element = add_tag('div', klass, parent)
+        for method in methods:
+            self.render_callable(method, element)
+
+    def render_class(self, klass: ClassDescriptor, parent: Element) -> None:
+        """Render a class"""
+        element = add_tag('div', 'autodoc-class', parent)
+        self._add_symbol_id(element, klass)
+        self.render_class_title(klass.name, klass.bases, 'class', element)
+        self.render_summary(klass.summary, element)
+        self.render_description(klass.description, element)
+        if klass.constructor:
+            self.render_signature(klass.constructor, element)
+        self._add_line_break(element)
+        self.render_parameters(
+            klass.constructor.arguments if klass.constructor else None,
+            element
+        )
+        self.render_attributes(klass.attributes, element)
+        self.render_properties(klass.properties, element)
+        self.render_methods(klass.class_methods, 'autodoc-classmethods', element)
+        self.render_methods(klass.methods, 'autodoc-methods', element)
+        self.render_examples(klass.examples, element)
+
+    def render_module(self, module: ModuleDescriptor, parent: Element) -> None:
+        """Render a module"""
+        element = add_tag('div', 'autodoc-module', parent)
+        self._add_symbol_id(element, module)
+        title = add_tag('h3', _TITLE, element)
+        add_span_tag('module ', 'autodoc-title-type', title)
+        add_span_tag(module.name, 'autodoc-title-name', title)
+        self.render_summary(module.summary, element)
+        self.render_description(module.description, element)
+        self.render_examples(module.examples, element)
+        self.render_attributes(module.attributes, element)
+        for function in module.functions:
+            self.render_callable(function, element)
+            add_tag('hr', None, element)
+        for klass in module.classes:
+            self.render_class(klass, element)
+            add_tag('hr', None, element)
+        for child_module in module.modules:
+            self.render_module(child_module, element)
+            add_tag('hr', None, element)
@@ -0,0 +1,543 @@
+"""Instrumentation for the processors.
+
+The processors report the time spent in each stage of their work, and counts
+of the items they process, to an `Instrumentation` object. The base class does
+nothing; `StatsCollector` aggregates the events and can write them as a JSON
+report, and `MemoryProfiler` measures the memory allocated in each stage.
+
+The autodoc processor reports the stages "import", "descriptor", "render",
+"md_format" and "parse" with the import string of the directive as the
+target, all within a "directive" stage. The "md_format" stage happens within
+the "render" stage. When import workers are used the import happens within
+the "descriptor" stage. The latex2mathml processors report the stage
+"convert" with the latex as the target.
+"""
+
+from __future__ import annotations
+import atexit
+import json
+import threading
+import time
+import tracemalloc
+from types import TracebackType
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    TextIO,
+    Type,
+    Union
+)
+
+from .utils import import_from_string
+
+
+class _NullStage:
+    """A context manager which does nothing"""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(
+            self,
+            exc_type: Optional[Type[BaseException]],
+            exc_value: Optional[BaseException],
+            traceback: Optional[TracebackType]
+    ) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Instrumentation:
+    """The instrumentation base class.
+
+    This implementation does nothing, and is used when no instrumentation is
+    configured. Subclasses override `stage` and `count` to receive the events.
+    """
+
+    def stage(self, name: str, target: str) -> Any:
+        """Return a context manager which times a stage.
+
+        Args:
+            name (str): The name of the stage
+            target (str): The directive or formula being processed
+
+        Returns:
+            Any: A context manager
+        """
+        return _NULL_STAGE
+
+    def count(self, name: str, target: str, value: int = 1) -> None:
+        """Count an event.
+
+        Args:
+            name (str): The name of the counter
+            target (str): The directive or formula being processed
+            value (int, optional): The amount to add. Defaults to 1.
+        """
+
+
+NULL_INSTRUMENTATION = Instrumentation()
+
+
+class _TimedStage:
+    """A context manager which reports the time spent in a stage"""
+
+    __slots__ = ('_collector', '_name', '_target', '_start')
+
+    def __init__(
+            self,
+            collector: StatsCollector,
+            name: str,
+            target: str
+    ) -> None:
+        self._collector = collector
+        self._name = name
+        self._target = target
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(
+            self,
+            exc_type: Optional[Type[BaseException]],
+            exc_value: Optional[BaseException],
+            traceback: Optional[TracebackType]
+    ) -> None:
+        self._collector.record_timing(
+            self._name,
+            self._target,
+            time.perf_counter() - self._start
+        )
+
+
+class StageStats:
+    """Aggregated timings for a stage"""
+
+    __slots__ = ('count', 'total', 'min', 'max')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def add(self, elapsed: float) -> None:
+        """Add a timing
+
+        Args:
+            elapsed (float): The elapsed time in seconds
+        """
+        self.count += 1
+        self.total += elapsed
+        if elapsed < self.min:
+            self.min = elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def to_dict(self) -> Dict[str, float]:
+        """Convert the stats to a dictionary
+
+        Returns:
+            Dict[str, float]: The stats
+        """
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+        }
+
+
+class StatsCollector(Instrumentation):
+    """An instrumentation which aggregates the events.
+
+    Timings are aggregated by stage, and by stage for each target. A collector
+    can be shared by processors rendering on different threads.
+    """
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageStats] = {}
+        self.targets: Dict[str, Dict[str, StageStats]] = {}
+        self.counters: Dict[str, int] = {}
+        self.target_counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, target: str) -> Any:
+        return _TimedStage(self, name, target)
+
+    def record_timing(self, name: str, target: str, elapsed: float) -> None:
+        """Record the time spent in a stage
+
+        Args:
+            name (str): The name of the stage
+            target (str): The directive or formula being processed
+            elapsed (float): The elapsed time in seconds
+        """
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+            stats.add(elapsed)
+
+            target_stages = self.targets.setdefault(target, {})
+            stats = target_stages.get(name)
+            if stats is None:
+                stats = target_stages[name] = StageStats()
+            stats.add(elapsed)
+
+    def count(self, name: str, target: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+            target_counters = self.target_counters.setdefault(target, {})
+            target_counters[name] = target_counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        """Clear the collected events"""
+        with self._lock:
+            self.stages.clear()
+            self.targets.clear()
+            self.counters.clear()
+            self.target_counters.clear()
+
+    def report(self) -> Dict[str, Any]:
+        """Make a report of the collected events.
+
+        Returns:
+            Dict[str, Any]: The report
+        """
+        with self._lock:
+            return self._report()
+
+    def _report(self) -> Dict[str, Any]:
+        return {
+            'stages': {
+                name: stats.to_dict()
+                for name, stats in self.stages.items()
+            },
+            'counters': dict(self.counters),
+            'targets': {
+                target: {
+                    'stages': {
+                        name: stats.to_dict()
+                        for name, stats in stages.items()
+                    },
+                    'counters': dict(self.target_counters.get(target, {}))
+                }
+                for target, stages in self.targets.items()
+            }
+        }
+
+
+class _MemoryFrame:
+    """The memory of a stage in progress"""
+
+    __slots__ = ('start', 'peak')
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.peak = start
+
+
+class _MemoryStage:
+    """A context manager which reports the memory allocated in a stage"""
+
+    __slots__ = ('_profiler', '_name', '_target')
+
+    def __init__(
+            self,
+            profiler: MemoryProfiler,
+            name: str,
+            target: str
+    ) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._target = target
+
+    def __enter__(self) -> None:
+        self._profiler.enter_stage()
+
+    def __exit__(
+            self,
+            exc_type: Optional[Type[BaseException]],
+            exc_value: Optional[BaseException],
+            traceback: Optional[TracebackType]
+    ) -> None:
+        self._profiler.exit_stage(self._name, self._target)
+
+
+class MemoryStats:
+    """Aggregated memory for a stage"""
+
+    __slots__ = ('count', 'peak', 'retained')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.peak = 0
+        self.retained = 0
+
+    def add(self, peak: int, retained: int) -> None:
+        """Add a measurement
+
+        Args:
+            peak (int): The peak allocation in bytes, above the allocation at
+                the start of the stage
+            retained (int): The bytes still allocated at the end of the stage
+        """
+        self.count += 1
+        self.peak = max(self.peak, peak)
+        self.retained += retained
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert the stats to a dictionary
+
+        Returns:
+            Dict[str, int]: The stats
+        """
+        return {
+            'count': self.count,
+            'peak': self.peak,
+            'retained': self.retained,
+        }
+
+
+class MemoryProfiler(Instrumentation):
+    """An instrumentation which measures the memory allocated in each stage.
+
+    The allocations are traced with `tracemalloc`. If it is not already
+    tracing it is started for each outermost stage, and stopped when the
+    stage ends. For each stage the
+    peak allocation and the size retained when the stage ends are recorded,
+    relative to the allocation when it started. Tracing slows the processing
+    considerably, so the profiler is for finding the directives which need
+    the most memory rather than for use in production.
+
+    The allocations are counted for the whole process, so the measurements
+    are only meaningful when the directives are processed on a single thread.
+    Before Python 3.9 the peak cannot be reset, so a stage may report the
+    peak of an earlier stage.
+    """
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, MemoryStats] = {}
+        self.targets: Dict[str, Dict[str, MemoryStats]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, target: str) -> Any:
+        return _MemoryStage(self, name, target)
+
+    def _frames(self) -> List[_MemoryFrame]:
+        frames = getattr(self._local, 'frames', None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+    def enter_stage(self) -> None:
+        """Start measuring a stage"""
+        frames = self._frames()
+        if not frames and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._local.started = True
+        current, peak = tracemalloc.get_traced_memory()
+        # The peak is reset for the new stage, so the stages it is within
+        # take the peak so far.
+        for frame in frames:
+            frame.peak = max(frame.peak, peak)
+        _reset_peak()
+        frames.append(_MemoryFrame(current))
+
+    def exit_stage(self, name: str, target: str) -> None:
+        """Finish measuring a stage
+
+        Args:
+            name (str): The name of the stage
+            target (str): The directive or formula being processed
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        frames = self._frames()
+        frame = frames.pop()
+        frame.peak = max(frame.peak, peak)
+        for outer in frames:
+            outer.peak = max(outer.peak, frame.peak)
+        _reset_peak()
+        if not frames and getattr(self._local, 'started', False):
+            tracemalloc.stop()
+            self._local.started = False
+        self.record_memory(
+            name,
+            target,
+            frame.peak - frame.start,
+            current - frame.start
+        )
+
+    def record_memory(
+            self,
+            name: str,
+            target: str,
+            peak: int,
+            retained: int
+    ) -> None:
+        """Record the memory allocated in a stage
+
+        Args:
+            name (str): The name of the stage
+            target (str): The directive or formula being processed
+            peak (int): The peak allocation in bytes
+            retained (int): The bytes retained
+        """
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = MemoryStats()
+            stats.add(peak, retained)
+
+            target_stages = self.targets.setdefault(target, {})
+            stats = target_stages.get(name)
+            if stats is None:
+                stats = target_stages[name] = MemoryStats()
+            stats.add(peak, retained)
+
+    def reset(self) -> None:
+        """Clear the measurements"""
+        with self._lock:
+            self.stages.clear()
+            self.targets.clear()
+
+    def report(self) -> Dict[str, Any]:
+        """Make a report of the measurements.
+
+        The targets are sorted by their peak allocation, largest first. The
+        peak of a target is that of its "directive" stage, when it has one,
+        or otherwise its largest stage.
+
+        Returns:
+            Dict[str, Any]: The report
+        """
+        with self._lock:
+            targets = [
+                {
+                    'target': target,
+                    'peak': (
+                        stages['directive'].peak
+                        if 'directive' in stages
+                        else max(stats.peak for stats in stages.values())
+                    ),
+                    'retained': (
+                        stages['directive'].retained
+                        if 'directive' in stages
+                        else sum(stats.retained for stats in stages.values())
+                    ),
+                    'stages': {
+                        name: stats.to_dict()
+                        for name, stats in stages.items()
+                    }
+                }
+                for target, stages in self.targets.items()
+            ]
+            return {
+                'stages': {
+                    name: stats.to_dict()
+                    for name, stats in self.stages.items()
+                },
+                'targets': sorted(
+                    targets,
+                    key=lambda target: target['peak'],
+                    reverse=True
+                )
+            }
+
+
+def _reset_peak() -> None:
+    reset_peak = getattr(tracemalloc, 'reset_peak', None)
+    if reset_peak is not None:
+        reset_peak()
+
+
+def write_json_report(
+        collector: Union[StatsCollector, MemoryProfiler],
+        file: Union[str, TextIO]
+) -> None:
+    """Write the report of a collector as JSON.
+
+    Args:
+        collector (Union[StatsCollector, MemoryProfiler]): The collector
+        file (Union[str, TextIO]): A file name or a file like object
+    """
+    report = collector.report()
+    if isinstance(file, str):
+        with open(file, 'wt', encoding='utf-8') as file_ptr:
+            json.dump(report, file_ptr, indent=2)
+    else:
+        json.dump(report, file, indent=2)
+
+
+_REPORT_COLLECTORS: Dict[str, Union[StatsCollector, MemoryProfiler]] = {}
+_REPORT_COLLECTORS_LOCK = threading.Lock()
+
+
+def create_instrumentation(
+        instrumentation: Optional[Union[str, Instrumentation]],
+        report_file: Optional[str] = None
+) -> Instrumentation:
+    """Create the instrumentation from the extension config.
+
+    Args:
+        instrumentation (Optional[Union[str, Instrumentation]]): An
+            instrumentation, or the import string of an instrumentation
+            instance or class.
+        report_file (Optional[str], optional): If given a `StatsCollector` is
+            created when no instrumentation is supplied, and the report of the
+            collector, or of a `MemoryProfiler`, is written to this file when
+            the interpreter exits. Extensions with the same report file share
+            the collector. Defaults to None.
+
+    Raises:
+        ValueError: If the import string is not an instrumentation, or the
+            report file is already written by a different instrumentation.
+
+    Returns:
+        Instrumentation: The instrumentation
+    """
+    # An instance given directly must be the one writing the report, but
+    # one created from an import string only needs to be of the same type.
+    is_instance = isinstance(instrumentation, Instrumentation)
+    if isinstance(instrumentation, str) and instrumentation:
+        instrumentation = import_from_string(instrumentation)
+        if isinstance(instrumentation, type):
+            instrumentation = instrumentation()
+        if not isinstance(instrumentation, Instrumentation):
+            raise ValueError(
+                f"{instrumentation!r} is not an Instrumentation"
+            )
+
+    if not report_file:
+        return instrumentation or NULL_INSTRUMENTATION
+
+    # Extensions are created for every page by mkdocs, so the collectors are
+    # shared by report file to cover the whole build.
+    with _REPORT_COLLECTORS_LOCK:
+        collector = _REPORT_COLLECTORS.get(report_file)
+        if collector is None:
+            collector = instrumentation or StatsCollector()
+            if not isinstance(collector, (StatsCollector, MemoryProfiler)):
+                raise ValueError(
+                    "A report file requires a StatsCollector or MemoryProfiler"
+                    " instrumentation"
+                )
+            _REPORT_COLLECTORS[report_file] = collector
+            atexit.register(write_json_report, collector, report_file)
+        elif (
+                type(collector) is not type(instrumentation or collector) or
+                (is_instance and instrumentation is not collector)
+        ):
+            raise ValueError(
+                f"The report file {report_file!r} is already written by "
+                f"another instrumentation ({type(collector).__name__})"
+            )
+    return collector
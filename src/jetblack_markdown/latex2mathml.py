@@ -12,6 +12,8 @@ $$
 from markdown import Markdown
 from markdown.extensions import Extension
 
+from .caching import create_cache
+from .instrumentation import create_instrumentation
 from .latex2mathml_processor import Latex2MathMLInlineProcessor, Latex2MathMLBlockProcessor
 
 
@@ -26,20 +28,47 @@ class Latex2MathMLExtension(Extension):
     RE = r'\$([^$\n]+)\$'
 
     def __init__(self, *args, **kwargs) -> None:
-        self.config = {}
+        self.config = {
+            'instrumentation': [
+                '',
+                'An Instrumentation, or the import string of one'
+            ],
+            'instrumentation_report': [
+                '',
+                'A file to which the collected timings are written as JSON'
+            ],
+            'mathml_cache': [
+                0,
+                'A MathML cache to share, or the number of formulas to cache'
+            ],
+            'minify': [False, 'Emit compact MathML'],
+        }
         super().__init__(*args, **kwargs)
+        self.cache = create_cache(self.getConfig('mathml_cache'))
 
     def extendMarkdown(self, md: Markdown) -> None:
+        instrumentation = create_instrumentation(
+            self.getConfig('instrumentation'),
+            self.getConfig('instrumentation_report')
+        )
         md.inlinePatterns.register(
             Latex2MathMLInlineProcessor(
                 self.RE,
                 md,
+                instrumentation=instrumentation,
+                cache=self.cache,
+                minify=self.getConfig('minify')
             ),
             'mathml',
             50
         )
         md.parser.blockprocessors.register(
-            Latex2MathMLBlockProcessor(md.parser),
+            Latex2MathMLBlockProcessor(
+                md.parser,
+                instrumentation=instrumentation,
+                cache=self.cache,
+                minify=self.getConfig('minify')
+            ),
             'mathml',
             50
         )
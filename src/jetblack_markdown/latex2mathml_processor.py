@@ -1,5 +1,6 @@
 """A Latex to MathML markdown processor"""
 
+import copy
 from functools import partial
 import re
 from typing import (
@@ -18,9 +19,38 @@ from markdown.blockprocessors import BlockProcessor
 
 from latex2mathml.converter import convert_to_element
 
+from .caching import LRUCache
+from .instrumentation import Instrumentation, NULL_INSTRUMENTATION
+from .minify import compact_mathml
+
 HTML_CLASS = "latex2mathml"
 
 
+def _convert(
+        latex: str,
+        display: str,
+        cache: Optional[LRUCache],
+        minify: bool
+) -> Element:
+    if cache is None:
+        return _convert_to_element(latex, display, minify)
+
+    element = cache.get_or_create(
+        (latex, display, minify),
+        partial(_convert_to_element, latex, display, minify)
+    )
+    return copy.deepcopy(element)
+
+
+def _convert_to_element(latex: str, display: str, minify: bool) -> Element:
+    element = convert_to_element(latex.strip(), display=display)
+    element.set("class", HTML_CLASS)
+    del element.attrib['xmlns']
+    if minify:
+        compact_mathml(element)
+    return element
+
+
 class Latex2MathMLInlineProcessor(InlineProcessor):
     """An inline processor for converting Latex to MathML"""
 
@@ -28,8 +58,14 @@ class Latex2MathMLInlineProcessor(InlineProcessor):
             self,
             pattern,
             md: Optional[Markdown] = None,
+            instrumentation: Optional[Instrumentation] = None,
+            cache: Optional[LRUCache] = None,
+            minify: bool = False
     ) -> None:
         super().__init__(pattern, md=md)
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.cache = cache
+        self.minify = minify
 
     def handleMatch(
             self,
@@ -40,9 +76,9 @@ class Latex2MathMLInlineProcessor(InlineProcessor):
         if not latex:
             return None, None, None
 
-        element = convert_to_element(latex.strip())
-        element.set("class", HTML_CLASS)
-        del element.attrib['xmlns']
+        self.instrumentation.count('formulas', latex)
+        with self.instrumentation.stage('convert', latex):
+            element = _convert(latex, 'inline', self.cache, self.minify)
 
         start = matches.start(0)
         end = matches.end(0)
@@ -52,31 +88,38 @@ class Latex2MathMLInlineProcessor(InlineProcessor):
 class Latex2MathMLBlockProcessor(BlockProcessor):
     """An block processor for converting Latex to MathML"""
 
-    def __init__(self, parser: BlockParser):
+    def __init__(
+            self,
+            parser: BlockParser,
+            instrumentation: Optional[Instrumentation] = None,
+            cache: Optional[LRUCache] = None,
+            minify: bool = False
+    ):
         super().__init__(parser)
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.cache = cache
+        self.minify = minify
         self._pattern = re.compile(
             r' *\$\$\n(.*)\n\$\$ *'
         )
-        self._match: Optional[re.Match[str]] = None
 
     def test(self, parent: Element, block: str) -> bool:
-        self._match = self._pattern.match(block)
-        return self._match is not None
+        return self._pattern.match(block) is not None
 
     def run(self, parent: Element, blocks: List[str]) -> Optional[bool]:
-
-        assert self._match is not None
-        latex = self._match.group(1)
+        # The match is repeated, rather than kept from the test, so the
+        # processor holds no state between calls.
+        match = self._pattern.match(blocks[0])
+        if match is None:
+            return False
+        latex = match.group(1)
         if not latex:
             return False
 
-        element = convert_to_element(
-            latex.strip(),
-            display='block',
-            parent=parent
-        )
-        element.set("class", HTML_CLASS)
-        del element.attrib['xmlns']
+        self.instrumentation.count('formulas', latex)
+        with self.instrumentation.stage('convert', latex):
+            element = _convert(latex, 'block', self.cache, self.minify)
+        parent.append(element)
 
         blocks.pop(0)
 
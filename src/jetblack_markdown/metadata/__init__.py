@@ -7,6 +7,8 @@ from .callables import CallableDescriptor, CallableType
 from .properties import PropertyDescriptor
 from .classes import ClassDescriptor
 from .modules import ModuleDescriptor
+from .factory import DescriptorOptions, create_descriptor
+from .serialization import serialize_descriptor, deserialize_descriptor
 
 __all__ = [
     "Descriptor",
@@ -16,5 +18,9 @@ __all__ = [
     "CallableType",
     "PropertyDescriptor",
     "ClassDescriptor",
-    "ModuleDescriptor"
+    "ModuleDescriptor",
+    "DescriptorOptions",
+    "create_descriptor",
+    "serialize_descriptor",
+    "deserialize_descriptor"
 ]
@@ -21,6 +21,7 @@ from ..utils import (
 from .arguments import ArgumentDescriptor
 from .common import Descriptor
 from .raises import RaisesDescriptor
+from .signatures import get_signature
 from .utils import make_file_relative
 
 
@@ -160,7 +161,7 @@ class CallableDescriptor(Descriptor):
             CallableDescriptor: A callable descriptor
         """
         if signature is None:
-            signature = inspect.signature(obj)
+            signature = get_signature(obj)
         if docstring is None:
             docstring = docstring_parser.parse(inspect.getdoc(obj) or '')
 
@@ -1,13 +1,21 @@
 """Classes"""
 
 from __future__ import annotations
+import copy
+from functools import partial
 import inspect
+import threading
 from typing import (
     Any,
+    Callable,
     Dict,
+    Hashable,
     List,
-    Optional
+    MutableMapping,
+    Optional,
+    TypeVar
 )
+from weakref import WeakKeyDictionary
 
 import docstring_parser
 
@@ -15,18 +23,105 @@ from .arguments import ArgumentDescriptor
 from .callables import CallableDescriptor, CallableType
 from .common import Descriptor
 from .properties import PropertyDescriptor
+from .selection import MemberSelection, get_selected_members, is_selected
+from .signatures import get_signature
 from .utils import make_file_relative, is_named_tuple_type
 
 
+D = TypeVar('D', CallableDescriptor, PropertyDescriptor)
+
+
+class MemberDescriptorCache:
+    """Member descriptors shared by the classes which inherit them.
+
+    A member is described once for the object which defines it (the function
+    or property), and each class gets a shallow copy with its own qualifier.
+    The defining object is weakly referenced, so the cache does not keep
+    modules alive after they are forgotten. Each thread has its own entries,
+    so the cache needs no lock.
+    """
+
+    def __init__(self, maxsize: int = 8192) -> None:
+        """Member descriptors shared by the classes which inherit them.
+
+        Args:
+            maxsize (int, optional): The number of objects to hold
+                descriptors for before the cache is cleared. A size of zero
+                disables the cache. Defaults to 8192.
+        """
+        self.maxsize = maxsize
+        self._generation = 0
+        self._local = threading.local()
+
+    def clear(self) -> None:
+        """Clear the cache for every thread"""
+        # The entries of each thread are discarded when it next uses them.
+        self._generation += 1
+
+    def _entries(self) -> MutableMapping[Any, Dict[Hashable, Any]]:
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            local.generation = self._generation
+            # A weak dictionary is not safe to share between threads.
+            local.entries = WeakKeyDictionary()
+        return local.entries
+
+    def get(
+            self,
+            obj: Any,
+            key: Hashable,
+            qualifier: str,
+            factory: Callable[[], D]
+    ) -> D:
+        """Get the descriptor of a member for a class
+
+        Args:
+            obj (Any): The object which defines the member
+            key (Hashable): The options which affect the descriptor
+            qualifier (str): The qualifier of the class
+            factory (Callable[[], D]): A function which creates the descriptor
+
+        Returns:
+            D: The descriptor
+        """
+        if not self.maxsize:
+            return _qualify(factory(), qualifier)
+
+        entries = self._entries()
+        try:
+            descriptors = entries.get(obj)
+        except TypeError:
+            # The object cannot be weakly referenced.
+            return _qualify(factory(), qualifier)
+        if descriptors is None:
+            if len(entries) >= self.maxsize:
+                entries.clear()
+            descriptors = entries[obj] = {}
+        descriptor = descriptors.get(key)
+        if descriptor is None:
+            descriptor = descriptors[key] = factory()
+        return _qualify(descriptor, qualifier)
+
+
+def _qualify(descriptor: D, qualifier: str) -> D:
+    if descriptor.qualifier == qualifier:
+        return descriptor
+    descriptor = copy.copy(descriptor)
+    descriptor.qualifier = qualifier
+    return descriptor
+
+
+MEMBER_CACHE = MemberDescriptorCache()
+
+
 def _get_docstring(
         obj: Any,
-        members: Dict[str, Any],
         class_from_init: bool,
         is_named_tuple: bool
 ) -> docstring_parser.Docstring:
     docstring = docstring_parser.parse(
         inspect.getdoc(
-            members.get('__init__', obj)
+            getattr(obj, '__init__', obj)
             if class_from_init and not is_named_tuple else obj
         ) or ''
     )
@@ -38,6 +133,16 @@ def _get_docstring(
     return docstring
 
 
+def _member_kind(member: Any) -> str:
+    if member.__class__ is property:
+        return 'property'
+    if inspect.isfunction(member):
+        return 'method'
+    if inspect.ismethod(member):
+        return 'classmethod'
+    return 'attribute'
+
+
 class ClassDescriptor(Descriptor):
     """A class descriptor"""
 
@@ -105,7 +210,8 @@ class ClassDescriptor(Descriptor):
             ignore_inherited: bool,
             importing_module: Optional[str] = None,
             prefer_docstring: bool = True,
-            imported_from_all: bool = False
+            imported_from_all: bool = False,
+            selection: Optional[MemberSelection] = None
     ) -> ClassDescriptor:
         """Create a class
 
@@ -120,6 +226,9 @@ class ClassDescriptor(Descriptor):
             importing_module (Optional[str], optional): The importing module, defaults to None
             prefer_docstring (bool): If true prefer the docstring.
             imported_from_all (bool): If true the class if defined in the `__init__.py`.
+            selection (Optional[MemberSelection], optional): The members to
+                describe, or None for all. The selection also applies to the
+                base classes. Defaults to None.
 
         Returns:
             ClassDescriptor: The class descriptor
@@ -132,12 +241,12 @@ class ClassDescriptor(Descriptor):
 
         members: Dict[str, Any] = {
             name: value
-            for name, value in inspect.getmembers(obj)
+            for name, value in get_selected_members(obj, selection).items()
             if not ignore_inherited or name in valid_names
         }
 
         docstring = _get_docstring(
-            obj, members,
+            obj,
             class_from_init,
             is_named_tuple
         )
@@ -171,33 +280,63 @@ class ClassDescriptor(Descriptor):
                     member_name.endswith('__')
             ) or (ignore_private and member_name.startswith('_')):
                 continue
+            if not is_selected(selection, _member_kind(member), member_name):
+                continue
 
             if member.__class__ is property:
-                properties.append(
-                    PropertyDescriptor.create(
-                        member,
-                        obj,
-                        member_name
+                if is_named_tuple:
+                    properties.append(
+                        PropertyDescriptor.create(
+                            member,
+                            obj,
+                            member_name
+                        )
+                    )
+                else:
+                    properties.append(
+                        MEMBER_CACHE.get(
+                            member,
+                            member_name,
+                            obj.__name__,
+                            partial(
+                                PropertyDescriptor.create,
+                                member,
+                                obj,
+                                member_name
+                            )
+                        )
                     )
-                )
             elif inspect.isfunction(member):
                 # Instance methods
                 methods.append(
-                    CallableDescriptor.create(
+                    MEMBER_CACHE.get(
                         member,
-                        callable_type=CallableType.METHOD,
-                        prefer_docstring=prefer_docstring,
-                        qualifier=name
+                        (CallableType.METHOD, prefer_docstring),
+                        name,
+                        partial(
+                            CallableDescriptor.create,
+                            member,
+                            callable_type=CallableType.METHOD,
+                            prefer_docstring=prefer_docstring,
+                            qualifier=name
+                        )
                     )
                 )
             elif inspect.ismethod(member):
-                # Class methods
+                # Class methods, which are bound to each class, so they are
+                # shared by the function.
                 class_methods.append(
-                    CallableDescriptor.create(
-                        member,
-                        callable_type=CallableType.CLASS_METHOD,
-                        prefer_docstring=prefer_docstring,
-                        qualifier=name
+                    MEMBER_CACHE.get(
+                        member.__func__,
+                        (CallableType.CLASS_METHOD, prefer_docstring),
+                        name,
+                        partial(
+                            CallableDescriptor.create,
+                            member,
+                            callable_type=CallableType.CLASS_METHOD,
+                            prefer_docstring=prefer_docstring,
+                            qualifier=name
+                        )
                     )
                 )
 
@@ -224,14 +363,15 @@ class ClassDescriptor(Descriptor):
                 ignore_private=ignore_private,
                 ignore_inherited=ignore_inherited,
                 importing_module=importing_module,
-                prefer_docstring=prefer_docstring
+                prefer_docstring=prefer_docstring,
+                selection=selection
             )
             for base in getattr(obj, '__bases__', [])
             if base is not object
         ]
 
         try:
-            signature = inspect.signature(obj)
+            signature = get_signature(obj)
             constructor = CallableDescriptor.create(
                 obj,
                 signature,
@@ -0,0 +1,129 @@
+"""Creating descriptors"""
+
+import inspect
+from typing import Any, NamedTuple, Optional
+
+from .callables import CallableDescriptor, CallableType
+from .classes import ClassDescriptor
+from .common import Descriptor
+from .modules import ModuleDescriptor
+from .properties import PropertyDescriptor
+from .selection import MemberSelection
+
+
+class DescriptorOptions(NamedTuple):
+    """The options controlling how descriptors are created
+
+    Attributes:
+        class_from_init (bool): If True use the docstring from the
+            <span>&#95;&#95;</span>init<span>&#95;&#95;</span> function for
+            classes.
+        ignore_dunder (bool): If True ignore
+            <span>&#95;&#95;</span>XXX<span>&#95;&#95;</span> functions.
+        ignore_private (bool): If True ignore private methods (those prefixed
+            <span>&#95;</span>XXX).
+        ignore_all (bool): If True ignore the
+            <span>&#95;&#95;</span>all<span>&#95;&#95;</span> member.
+        ignore_inherited (bool): If True ignore inherited members.
+        prefer_docstring (bool): If true prefer the docstring.
+        follow_module_tree (bool): If true follow the module tree.
+        selection (Optional[MemberSelection]): The members of the module or
+            class to describe, or None for all.
+    """
+    class_from_init: bool = True
+    ignore_dunder: bool = True
+    ignore_private: bool = True
+    ignore_all: bool = False
+    ignore_inherited: bool = True
+    prefer_docstring: bool = True
+    follow_module_tree: bool = False
+    selection: Optional[MemberSelection] = None
+
+
+def create_descriptor(
+        obj: Any,
+        options: DescriptorOptions,
+        parent: Any = None,
+        name: Optional[str] = None
+) -> Descriptor:
+    """Create the descriptor for an object
+
+    Args:
+        obj (Any): A module, class, function, or a member of a class.
+        options (DescriptorOptions): The options
+        parent (Any, optional): The module or class containing the object.
+            Defaults to None.
+        name (Optional[str], optional): The name of the object in the parent.
+            Defaults to None.
+
+    Raises:
+        RuntimeError: If the object cannot be described.
+
+    Returns:
+        Descriptor: The descriptor
+    """
+    if inspect.ismodule(obj):
+        return ModuleDescriptor.create(
+            obj,
+            options.class_from_init,
+            options.ignore_dunder,
+            options.ignore_private,
+            options.ignore_all,
+            options.ignore_inherited,
+            options.prefer_docstring,
+            options.follow_module_tree,
+            options.selection
+        )
+    elif inspect.isclass(obj):
+        return ClassDescriptor.create(
+            obj,
+            options.class_from_init,
+            options.ignore_dunder,
+            options.ignore_private,
+            options.ignore_inherited,
+            prefer_docstring=options.prefer_docstring,
+            selection=options.selection
+        )
+    elif inspect.isclass(parent) and name is not None:
+        return _create_member_descriptor(obj, options, parent, name)
+    elif inspect.isfunction(obj):
+        return CallableDescriptor.create(
+            obj,
+            prefer_docstring=options.prefer_docstring
+        )
+    else:
+        raise RuntimeError("Unhandled descriptor")
+
+
+def _create_member_descriptor(
+        obj: Any,
+        options: DescriptorOptions,
+        klass: Any,
+        name: str
+) -> Descriptor:
+    if isinstance(obj, property):
+        return PropertyDescriptor.create(obj, klass, name)
+    elif inspect.ismethod(obj):
+        return CallableDescriptor.create(
+            obj,
+            callable_type=CallableType.CLASS_METHOD,
+            prefer_docstring=options.prefer_docstring,
+            qualifier=klass.__qualname__
+        )
+    elif inspect.isfunction(obj):
+        is_static = isinstance(
+            inspect.getattr_static(klass, name, None),
+            staticmethod
+        )
+        return CallableDescriptor.create(
+            obj,
+            callable_type=(
+                CallableType.FUNCTION
+                if is_static
+                else CallableType.METHOD
+            ),
+            prefer_docstring=options.prefer_docstring,
+            qualifier=klass.__qualname__
+        )
+    else:
+        raise RuntimeError("Unhandled descriptor")
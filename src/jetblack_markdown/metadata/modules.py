@@ -17,6 +17,7 @@ from .arguments import ArgumentDescriptor
 from .common import Descriptor
 from .classes import ClassDescriptor
 from .callables import CallableDescriptor
+from .selection import MemberSelection, get_selected_members, is_selected
 from .utils import make_file_relative, is_child_module
 
 
@@ -78,7 +79,8 @@ class ModuleDescriptor(Descriptor):
             ignore_all: bool,
             ignore_inherited: bool,
             prefer_docstring: bool,
-            follow_module_tree: bool
+            follow_module_tree: bool,
+            selection: Optional[MemberSelection] = None
     ) -> ModuleDescriptor:
         """Create a module descriptor
 
@@ -94,6 +96,8 @@ class ModuleDescriptor(Descriptor):
                 <span>&#95;&#95;</span>all<span>&#95;&#95;</span> member.
             prefer_docstring (bool): If true prefer the docstring
             follow_module_tree (bool): If true follow the module tree
+            selection (Optional[MemberSelection], optional): The members to
+                describe, or None for all. Defaults to None.
 
         Returns:
             ModuleDescriptor: A module descriptor
@@ -124,12 +128,16 @@ class ModuleDescriptor(Descriptor):
         package = module.__package__
         file = make_file_relative(module.__file__)
 
-        members: Dict[str, Any] = dict(inspect.getmembers(module))
-        valid_members = members.get('__all__', [])
+        members = get_selected_members(module, selection)
+        valid_members = getattr(module, '__all__', [])
 
         classes: List[ClassDescriptor] = []
         functions: List[CallableDescriptor] = []
         for member_name, member in members.items():
+            if not is_selected(selection, _member_kind(member), member_name):
+                # Unselected members are not inspected further.
+                continue
+
             imported_from_all = member_name in valid_members
 
             if (
@@ -180,8 +188,12 @@ class ModuleDescriptor(Descriptor):
                 prefer_docstring,
                 follow_module_tree
             )
-            for member in members.values()
-            if follow_module_tree and is_child_module(module, member)
+            for member_name, member in members.items()
+            if (
+                follow_module_tree and
+                is_selected(selection, 'module', member_name) and
+                is_child_module(module, member)
+            )
         ]
 
         return ModuleDescriptor(
@@ -196,3 +208,13 @@ class ModuleDescriptor(Descriptor):
             functions,
             modules
         )
+
+
+def _member_kind(member: Any) -> str:
+    if inspect.ismodule(member):
+        return 'module'
+    if inspect.isclass(member):
+        return 'class'
+    if inspect.isfunction(member):
+        return 'function'
+    return 'attribute'
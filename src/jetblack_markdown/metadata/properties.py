@@ -14,6 +14,7 @@ from ..utils import get_type_name, find_docstring_param
 
 from .common import Descriptor
 from .raises import RaisesDescriptor
+from .signatures import get_return_annotation
 from .utils import is_named_tuple_type
 
 
@@ -105,9 +106,8 @@ class PropertyDescriptor(Descriptor):
             examples: Optional[List[str]] = None
         else:
             docstring = docstring_parser.parse(inspect.getdoc(obj) or '')
-            signature = inspect.signature(obj.fget)
             type_name = get_type_name(
-                signature.return_annotation,
+                get_return_annotation(obj.fget),
                 docstring.returns
             )
             summary = docstring.short_description if docstring else None
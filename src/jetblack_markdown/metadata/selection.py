@@ -0,0 +1,119 @@
+"""Selecting the members of modules and classes.
+
+A selection is a tuple of items of the form `[kind:]pattern`, where the
+pattern is matched against the member name with `fnmatch`, and the optional
+kind restricts the item to members of that kind. The kinds of module members
+are "class", "function" and "module", and the kinds of class members are
+"property", "method" and "classmethod". An item with a kind and no pattern
+selects every member of the kind.
+"""
+
+from fnmatch import fnmatchcase
+import inspect
+from typing import Any, Dict, Optional, Tuple
+
+MODULE_MEMBER_KINDS = ('class', 'function', 'module')
+CLASS_MEMBER_KINDS = ('property', 'method', 'classmethod')
+
+MemberSelection = Tuple[str, ...]
+
+
+def parse_selection(text: str) -> MemberSelection:
+    """Parse a comma separated list of selection items.
+
+    Args:
+        text (str): The selection text, for example "MyClass, my_*" or
+            "class:".
+
+    Raises:
+        ValueError: If an item has an unknown kind.
+
+    Returns:
+        MemberSelection: The selection
+    """
+    items = []
+    for item in text.split(','):
+        kind, sep, pattern = item.strip().rpartition(':')
+        if not sep and not pattern:
+            continue
+        if sep and kind not in MODULE_MEMBER_KINDS + CLASS_MEMBER_KINDS:
+            raise ValueError(f"Unknown member kind {kind!r} in {text!r}")
+        items.append(f'{kind}:{pattern or "*"}' if sep else pattern)
+    return tuple(items)
+
+
+def is_selected(
+        selection: Optional[MemberSelection],
+        kind: str,
+        name: str
+) -> bool:
+    """Check if a member is selected.
+
+    Args:
+        selection (Optional[MemberSelection]): The selection, or None to
+            select every member.
+        kind (str): The kind of the member
+        name (str): The name of the member
+
+    Returns:
+        bool: True if the member is selected.
+    """
+    if selection is None:
+        return True
+    for item in selection:
+        item_kind, _sep, pattern = item.rpartition(':')
+        if (not item_kind or item_kind == kind) and fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+def is_name_selected(
+        selection: Optional[MemberSelection],
+        name: str
+) -> bool:
+    """Check if a member with the name could be selected, whatever its kind.
+
+    Args:
+        selection (Optional[MemberSelection]): The selection, or None to
+            select every member.
+        name (str): The name of the member
+
+    Returns:
+        bool: True if an item of the selection matches the name.
+    """
+    if selection is None:
+        return True
+    return any(
+        fnmatchcase(name, item.rpartition(':')[2])
+        for item in selection
+    )
+
+
+def get_selected_members(
+        obj: Any,
+        selection: Optional[MemberSelection]
+) -> Dict[str, Any]:
+    """Get the members of an object which could be selected.
+
+    This is `inspect.getmembers`, except the attributes are only fetched for
+    the names the selection could match, as fetching them can be costly.
+
+    Args:
+        obj (Any): The module or class
+        selection (Optional[MemberSelection]): The selection, or None to
+            select every member.
+
+    Returns:
+        Dict[str, Any]: The members by name, in name order.
+    """
+    if selection is None:
+        return dict(inspect.getmembers(obj))
+    members: Dict[str, Any] = {}
+    for name in sorted(dir(obj)):
+        if not is_name_selected(selection, name):
+            continue
+        try:
+            members[name] = getattr(obj, name)
+        except AttributeError:
+            continue
+    return members
@@ -0,0 +1,313 @@
+"""Serializing descriptors.
+
+Descriptors are converted to a compact tree of tuples, lists and primitive
+values, which can be pickled or marshalled between processes. Argument
+defaults which are not primitive values are replaced by their `repr`.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from .arguments import ArgumentDescriptor
+from .callables import CallableDescriptor, CallableType
+from .classes import ClassDescriptor
+from .common import Descriptor
+from .modules import ModuleDescriptor
+from .properties import PropertyDescriptor
+from .raises import RaisesDescriptor
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+_ARGUMENT = 'a'
+_CALLABLE = 'c'
+_PROPERTY = 'p'
+_CLASS = 'k'
+_MODULE = 'm'
+
+
+def _argument_to_data(argument: ArgumentDescriptor) -> Tuple[Any, ...]:
+    default = argument.default
+    if default is not ArgumentDescriptor.EMPTY and not isinstance(default, _PRIMITIVES):
+        default = repr(default)
+    return (
+        _ARGUMENT,
+        argument.name,
+        argument.type,
+        argument.description,
+        default
+    )
+
+
+def _argument_from_data(data: Tuple[Any, ...]) -> ArgumentDescriptor:
+    _tag, name, type_, description, default = data
+    if default == ArgumentDescriptor.EMPTY:
+        default = ArgumentDescriptor.EMPTY
+    return ArgumentDescriptor(name, type_, description, default)
+
+
+def _raises_to_data(
+        raises: Optional[List[RaisesDescriptor]]
+) -> Optional[List[Tuple[str, str]]]:
+    if raises is None:
+        return None
+    return [(item.type, item.description) for item in raises]
+
+
+def _raises_from_data(
+        data: Optional[List[Tuple[str, str]]]
+) -> Optional[List[RaisesDescriptor]]:
+    if data is None:
+        return None
+    return [RaisesDescriptor(type_, description) for type_, description in data]
+
+
+def _callable_to_data(descriptor: CallableDescriptor) -> Tuple[Any, ...]:
+    return (
+        _CALLABLE,
+        descriptor.qualifier,
+        descriptor.name,
+        descriptor.summary,
+        descriptor.description,
+        [_argument_to_data(argument) for argument in descriptor.arguments],
+        descriptor.return_type,
+        descriptor.return_description,
+        descriptor.callable_type.name,
+        descriptor.is_async,
+        descriptor.is_generator,
+        _raises_to_data(descriptor.raises),
+        descriptor.examples,
+        descriptor.module,
+        descriptor.package,
+        descriptor.file
+    )
+
+
+def _callable_from_data(data: Tuple[Any, ...]) -> CallableDescriptor:
+    (
+        _tag,
+        qualifier,
+        name,
+        summary,
+        description,
+        arguments,
+        return_type,
+        return_description,
+        callable_type,
+        is_async,
+        is_generator,
+        raises,
+        examples,
+        module,
+        package,
+        file
+    ) = data
+    return CallableDescriptor(
+        qualifier,
+        name,
+        summary,
+        description,
+        [_argument_from_data(argument) for argument in arguments],
+        return_type,
+        return_description,
+        CallableType[callable_type],
+        is_async,
+        is_generator,
+        _raises_from_data(raises),
+        examples,
+        module,
+        package,
+        file
+    )
+
+
+def _property_to_data(descriptor: PropertyDescriptor) -> Tuple[Any, ...]:
+    return (
+        _PROPERTY,
+        descriptor.qualifier,
+        descriptor.name,
+        descriptor.summary,
+        descriptor.description,
+        descriptor.type,
+        bool(descriptor.is_settable),
+        bool(descriptor.is_deletable),
+        _raises_to_data(descriptor.raises),
+        descriptor.examples
+    )
+
+
+def _property_from_data(data: Tuple[Any, ...]) -> PropertyDescriptor:
+    (
+        _tag,
+        qualifier,
+        name,
+        summary,
+        description,
+        type_,
+        is_settable,
+        is_deletable,
+        raises,
+        examples
+    ) = data
+    return PropertyDescriptor(
+        qualifier,
+        name,
+        summary,
+        description,
+        type_,
+        is_settable,
+        is_deletable,
+        _raises_from_data(raises),
+        examples
+    )
+
+
+def _class_to_data(descriptor: ClassDescriptor) -> Tuple[Any, ...]:
+    return (
+        _CLASS,
+        descriptor.name,
+        descriptor.summary,
+        descriptor.description,
+        (
+            _callable_to_data(descriptor.constructor)
+            if descriptor.constructor is not None
+            else None
+        ),
+        [_argument_to_data(attribute) for attribute in descriptor.attributes],
+        [_property_to_data(item) for item in descriptor.properties],
+        [_callable_to_data(item) for item in descriptor.class_methods],
+        [_callable_to_data(item) for item in descriptor.methods],
+        descriptor.examples,
+        descriptor.module,
+        descriptor.package,
+        descriptor.file,
+        [_class_to_data(base) for base in descriptor.bases]
+    )
+
+
+def _class_from_data(data: Tuple[Any, ...]) -> ClassDescriptor:
+    (
+        _tag,
+        name,
+        summary,
+        description,
+        constructor,
+        attributes,
+        properties,
+        class_methods,
+        methods,
+        examples,
+        module,
+        package,
+        file,
+        bases
+    ) = data
+    return ClassDescriptor(
+        name,
+        summary,
+        description,
+        _callable_from_data(constructor) if constructor is not None else None,
+        [_argument_from_data(attribute) for attribute in attributes],
+        [_property_from_data(item) for item in properties],
+        [_callable_from_data(item) for item in class_methods],
+        [_callable_from_data(item) for item in methods],
+        examples,
+        module,
+        package,
+        file,
+        [_class_from_data(base) for base in bases]
+    )
+
+
+def _module_to_data(descriptor: ModuleDescriptor) -> Tuple[Any, ...]:
+    return (
+        _MODULE,
+        descriptor.name,
+        descriptor.summary,
+        descriptor.description,
+        [_argument_to_data(attribute) for attribute in descriptor.attributes],
+        descriptor.examples,
+        descriptor.package,
+        descriptor.file,
+        [_class_to_data(item) for item in descriptor.classes],
+        [_callable_to_data(item) for item in descriptor.functions],
+        [_module_to_data(item) for item in descriptor.modules]
+    )
+
+
+def _module_from_data(data: Tuple[Any, ...]) -> ModuleDescriptor:
+    (
+        _tag,
+        name,
+        summary,
+        description,
+        attributes,
+        examples,
+        package,
+        file,
+        classes,
+        functions,
+        modules
+    ) = data
+    return ModuleDescriptor(
+        name,
+        summary,
+        description,
+        [_argument_from_data(attribute) for attribute in attributes],
+        examples,
+        package,
+        file,
+        [_class_from_data(item) for item in classes],
+        [_callable_from_data(item) for item in functions],
+        [_module_from_data(item) for item in modules]
+    )
+
+
+_TO_DATA: Dict[Type[Descriptor], Callable[[Any], Tuple[Any, ...]]] = {
+    ModuleDescriptor: _module_to_data,
+    ClassDescriptor: _class_to_data,
+    CallableDescriptor: _callable_to_data,
+    PropertyDescriptor: _property_to_data,
+}
+
+_FROM_DATA: Dict[str, Callable[[Tuple[Any, ...]], Descriptor]] = {
+    _MODULE: _module_from_data,
+    _CLASS: _class_from_data,
+    _CALLABLE: _callable_from_data,
+    _PROPERTY: _property_from_data,
+}
+
+
+def serialize_descriptor(descriptor: Descriptor) -> Tuple[Any, ...]:
+    """Convert a descriptor to a tree of primitive values
+
+    Args:
+        descriptor (Descriptor): A module, class, callable or property
+            descriptor
+
+    Raises:
+        ValueError: If the descriptor cannot be serialized.
+
+    Returns:
+        Tuple[Any, ...]: The serialized descriptor
+    """
+    to_data = _TO_DATA.get(type(descriptor))
+    if to_data is None:
+        raise ValueError(f"Cannot serialize {descriptor!r}")
+    return to_data(descriptor)
+
+
+def deserialize_descriptor(data: Tuple[Any, ...]) -> Descriptor:
+    """Convert a serialized descriptor back to a descriptor
+
+    Args:
+        data (Tuple[Any, ...]): The serialized descriptor
+
+    Raises:
+        ValueError: If the data is not a serialized descriptor.
+
+    Returns:
+        Descriptor: The descriptor
+    """
+    from_data = _FROM_DATA.get(data[0])
+    if from_data is None:
+        raise ValueError(f"Unknown descriptor tag {data[0]!r}")
+    return from_data(data)
@@ -0,0 +1,98 @@
+"""Extracting signatures and annotations.
+
+`inspect.signature` is one of the more expensive parts of building the
+descriptors, and is called repeatedly for the same objects: inherited
+methods, classes probed for a constructor, and property getters which only
+need their return annotation. The signatures are cached here by the object,
+which is weakly referenced, and the objects without a signature are
+remembered so they are not probed again. Each thread has its own cache.
+"""
+
+import inspect
+from inspect import Parameter, Signature
+import threading
+import types
+from typing import Any, MutableMapping, Union
+from weakref import WeakKeyDictionary
+
+# A weak dictionary is not safe to share between threads, so each thread has
+# its own.
+_LOCAL = threading.local()
+
+
+def _signatures() -> MutableMapping[Any, Union[Signature, ValueError]]:
+    signatures = getattr(_LOCAL, 'signatures', None)
+    if signatures is None:
+        signatures = _LOCAL.signatures = WeakKeyDictionary()
+    return signatures
+
+
+def get_signature(obj: Any) -> Signature:
+    """Get the signature of a callable, as `inspect.signature` would.
+
+    Args:
+        obj (Any): The callable
+
+    Raises:
+        ValueError: If the callable has no signature.
+
+    Returns:
+        Signature: The signature
+    """
+    if isinstance(obj, types.MethodType):
+        return _get_bound_signature(obj)
+
+    signatures = _signatures()
+    try:
+        result = signatures.get(obj)
+    except TypeError:
+        # The object cannot be weakly referenced.
+        return inspect.signature(obj)
+
+    if result is None:
+        try:
+            result = inspect.signature(obj)
+        except ValueError as error:
+            result = error
+        signatures[obj] = result
+
+    if isinstance(result, ValueError):
+        raise ValueError(*result.args)
+    return result
+
+
+def _get_bound_signature(method: types.MethodType) -> Signature:
+    # Bound methods are created on every access, so the signature of the
+    # function is cached and the bound argument dropped.
+    signature = get_signature(method.__func__)
+    parameters = tuple(signature.parameters.values())
+    if not parameters or parameters[0].kind in (
+            Parameter.VAR_POSITIONAL,
+            Parameter.KEYWORD_ONLY
+    ):
+        return inspect.signature(method)
+    return signature.replace(parameters=parameters[1:])
+
+
+def get_return_annotation(obj: Any) -> Any:
+    """Get the return annotation of a callable.
+
+    Plain functions are read from their annotations, without building the
+    signature.
+
+    Args:
+        obj (Any): The callable
+
+    Raises:
+        ValueError: If the callable has no signature.
+
+    Returns:
+        Any: The return annotation, or `Signature.empty` if there is none.
+    """
+    if (
+            type(obj) is types.FunctionType and  # pylint: disable=unidiomatic-typecheck
+            not hasattr(obj, '__wrapped__') and
+            not hasattr(obj, '__signature__')
+    ):
+        return obj.__annotations__.get('return', Signature.empty)
+    return get_signature(obj).return_annotation
@@ -1,14 +1,70 @@
 """Meta data utilities"""
 
 import inspect
+import os
 import sys
+import threading
 from types import ModuleType
-from typing import Any, Optional, Type
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Type
+
+
+class _SysPathIndex:
+    """An index of the folders in `sys.path`.
+
+    A file is resolved by walking up its parent folders, so the longest
+    matching path is found in time proportional to the length of the file
+    path. The results are memoized by file, up to a limit. Each thread has
+    its own index, so the memo needs no lock.
+    """
+
+    def __init__(self, paths: List[str], maxsize: int = 4096) -> None:
+        self.paths = paths
+        self.maxsize = maxsize
+        roots: Set[str] = set()
+        for path in paths:
+            # The empty path is the current folder, which is covered by its
+            # absolute path.
+            if path:
+                roots.add(path.rstrip(os.sep) or os.sep)
+            roots.add(os.path.normpath(os.path.abspath(path)))
+        self._roots: FrozenSet[str] = frozenset(roots)
+        self._files: Dict[str, str] = {}
+
+    def relative(self, file: str) -> str:
+        """Make a file relative to the longest matching path
+
+        Args:
+            file (str): The file path
+
+        Returns:
+            str: The relative file path, or the file if no path matched.
+        """
+        relative_file = self._files.get(file)
+        if relative_file is not None:
+            return relative_file
+
+        relative_file = file
+        folder, sep, _name = file.rpartition(os.sep)
+        while sep:
+            if (folder or os.sep) in self._roots:
+                relative_file = file[len(folder)+1:]
+                break
+            folder, sep, _name = folder.rpartition(os.sep)
+
+        if len(self._files) >= self.maxsize:
+            self._files.clear()
+        self._files[file] = relative_file
+        return relative_file
+
+
+_LOCAL = threading.local()
 
 
 def make_file_relative(file: Optional[str]) -> Optional[str]:
     """Make a file path relative
 
+    The file is made relative to the longest matching path in `sys.path`.
+
     Args:
         file (Optional[str]): The file path
 
@@ -18,11 +74,14 @@ def make_file_relative(file: Optional[str]) -> Optional[str]:
     if file is None:
         return None
 
-    for path in sys.path:
-        if file.startswith(path):
-            return file[len(path)+1:]
+    # The index holds a copy of the paths, so changes made in place are
+    # seen. The entries are usually the same objects, so the comparison is
+    # by identity.
+    index: Optional[_SysPathIndex] = getattr(_LOCAL, 'sys_path_index', None)
+    if index is None or index.paths != sys.path:
+        index = _LOCAL.sys_path_index = _SysPathIndex(list(sys.path))
 
-    return file
+    return index.relative(file)
 
 
 def is_named_tuple_type(obj: Type) -> bool:
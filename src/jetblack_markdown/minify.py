@@ -0,0 +1,95 @@
+"""Minified output.
+
+The templates are indented for reading, and the indentation is rendered into
+every page. The `MinifyExtension` removes it from the template source when the
+template is compiled, so rendering costs nothing extra. The MathML produced
+by `latex2mathml` wraps single elements in rows and writes every operator as a
+character reference, which `compact_mathml` removes.
+"""
+
+import html
+import re
+from typing import Optional
+from xml.etree.ElementTree import Element
+
+from jinja2.ext import Extension
+
+# A run of whitespace holding a line break between two tags, or a tag and a
+# Jinja2 statement, is layout. Whitespace next to text is kept, as it may
+# separate words.
+_LAYOUT_WHITESPACE = re.compile(r'(?:(?<=>)|(?<=%\}))\s*\n\s*(?=<|\{%)')
+# An expression may render text, so the layout next to one is reduced to a
+# line break, which separates words without the trailing spaces Markdown
+# renders as a line break.
+_EXPRESSION_WHITESPACE = re.compile(
+    r'(?:(?<=\}\})\s*\n\s*(?=[<{]))|(?:(?<=[>}])\s*\n\s*(?=\{\{))'
+)
+_CHARACTER_REFERENCE = re.compile(r'&#(?:x[0-9a-fA-F]+|[0-9]+);')
+
+# The elements which treat their children as a single row.
+_INFERRED_ROWS = {
+    'math', 'mrow', 'msqrt', 'mstyle', 'merror', 'mpadded', 'mphantom',
+    'menclose', 'mtd'
+}
+
+
+class MinifyExtension(Extension):
+    """A Jinja2 extension which removes the layout whitespace from templates
+    as they are compiled"""
+
+    def preprocess(
+            self,
+            source: str,
+            name: Optional[str],
+            filename: Optional[str] = None
+    ) -> str:
+        source = _LAYOUT_WHITESPACE.sub('', source)
+        return _EXPRESSION_WHITESPACE.sub('\n', source).strip()
+
+
+def _unescape(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return text
+    return _CHARACTER_REFERENCE.sub(
+        lambda match: html.unescape(match.group(0)),
+        text
+    )
+
+
+def compact_mathml(element: Element) -> Element:
+    """Compact MathML in place.
+
+    Rows without attributes are replaced by their child when they have only
+    one which is not an operator, or by their children when they are the
+    only child of an element which is itself a row. Otherwise the rows are
+    kept, as they decide the form of the operators within them. Character
+    references are replaced by the characters, which the serializer escapes
+    where necessary.
+
+    Args:
+        element (Element): The MathML element
+
+    Returns:
+        Element: The element
+    """
+    element.text = _unescape(element.text)
+    is_only_child_of_row = len(element) == 1 and element.tag in _INFERRED_ROWS
+    children = []
+    for child in element:
+        compact_mathml(child)
+        if (
+                child.tag == 'mrow' and
+                not child.attrib and
+                not child.text and
+                not child.tail and
+                (
+                    is_only_child_of_row or
+                    (len(child) == 1 and child[0].tag != 'mo')
+                )
+        ):
+            children.extend(child)
+        else:
+            children.append(child)
+        child.tail = _unescape(child.tail)
+    element[:] = children
+    return element
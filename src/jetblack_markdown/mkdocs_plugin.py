@@ -0,0 +1,272 @@
+"""An mkdocs plugin which shares state across the pages of a build.
+
+As a markdown extension autodoc cannot see the build as a whole, as mkdocs
+creates the extensions again for every page. The plugin owns an import
+resolver, and the descriptor, docstring fragment, template and MathML caches,
+and gives them to the extensions through their configuration, so every page
+of the build, and every build of `mkdocs serve`, shares them.
+
+The directives of the pages can be found before the pages are rendered, and
+the descriptors of pages with enough directives prepared in the background,
+by import worker processes or in this process. With `prewarm` the docs are
+scanned as soon as the configuration is loaded. A page waits only for its
+own descriptors, so later pages are prepared while the earlier ones render.
+The timings of the build are collected, and reported when it ends.
+
+```yaml
+plugins:
+  - search
+  - jetblack-markdown:
+      prerender_workers: 4
+      prewarm: true
+
+markdown_extensions:
+  - jetblack_markdown.autodoc
+  - jetblack_markdown.latex2mathml
+```
+
+The plugin requires mkdocs 1.4 or later.
+"""
+
+from __future__ import annotations
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from markdown import Markdown
+from mkdocs.config import config_options
+from mkdocs.config.base import Config
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.plugins import BasePlugin
+from mkdocs.structure.files import Files
+from mkdocs.structure.pages import Page
+
+from .autodoc_processor import AutodocBlockProcessor, find_directives
+from .caching import LRUCache, TemplateCache
+from .instrumentation import StatsCollector
+from .prewarm import Directive, Prewarmer, scan_directives
+from .utils import ImportResolver
+from .workers import ImportWorkerPool
+
+AUTODOC_EXTENSION = 'jetblack_markdown.autodoc'
+LATEX2MATHML_EXTENSION = 'jetblack_markdown.latex2mathml'
+
+log = logging.getLogger(f'mkdocs.plugins.{__name__}')
+
+
+class AutodocPluginConfig(Config):
+    """The configuration of the plugin"""
+    cache_size = config_options.Type(int, default=1024)
+    prerender_workers = config_options.Type(int, default=0)
+    prerender_min_directives = config_options.Type(int, default=1)
+    prewarm = config_options.Type(bool, default=False)
+    prewarm_concurrency = config_options.Type(int, default=4)
+    timings_report = config_options.Optional(config_options.Type(str))
+
+
+class AutodocPlugin(BasePlugin[AutodocPluginConfig]):
+    """An mkdocs plugin which shares the autodoc caches across the pages of a
+    build, and prepares the descriptors of the pages in the background"""
+
+    def __init__(self) -> None:
+        self.resolver = ImportResolver()
+        self.descriptor_cache: Optional[LRUCache] = None
+        self.fragment_cache: Optional[LRUCache] = None
+        self.mathml_cache: Optional[LRUCache] = None
+        self.template_cache = TemplateCache()
+        self.collector = StatsCollector()
+        self._worker_pool: Optional[ImportWorkerPool] = None
+        self._prewarmer: Optional[Prewarmer] = None
+        self._pages: Dict[str, List[Directive]] = {}
+        self._build_start = 0.0
+
+    def on_startup(self, *, command: str, dirty: bool) -> None:
+        # Defining this event keeps the plugin, and so its caches, across the
+        # builds of `mkdocs serve`.
+        pass
+
+    def on_config(self, config: MkDocsConfig) -> Optional[MkDocsConfig]:
+        self._build_start = time.perf_counter()
+        if self.descriptor_cache is None:
+            self.descriptor_cache = LRUCache(self.config.cache_size)
+            self.fragment_cache = LRUCache(self.config.cache_size)
+            self.mathml_cache = LRUCache(self.config.cache_size)
+        self.collector.reset()
+        self._close_prewarmer()
+        # Pages may have been fixed to refer to modules created since the
+        # last build.
+        self.resolver.invalidate_caches()
+
+        extensions = [
+            extension
+            for extension in config.markdown_extensions
+            if isinstance(extension, str)
+        ]
+        if AUTODOC_EXTENSION in extensions:
+            autodoc_config = config.mdx_configs.setdefault(AUTODOC_EXTENSION, {})
+            self._share(
+                autodoc_config,
+                resolver=self.resolver,
+                descriptor_cache=self.descriptor_cache,
+                fragment_cache=self.fragment_cache,
+                template_cache=self.template_cache,
+                instrumentation=self.collector
+            )
+            if self.config.prerender_workers > 0 or self.config.prewarm:
+                self._prewarmer = Prewarmer(
+                    self._create_processor(autodoc_config),
+                    self.config.prewarm_concurrency
+                )
+                if self.config.prewarm:
+                    # The docs are scanned now, so the descriptors are
+                    # prepared while mkdocs collects the files and loads the
+                    # theme.
+                    self._start(scan_directives(config.docs_dir))
+        if LATEX2MATHML_EXTENSION in extensions:
+            self._share(
+                config.mdx_configs.setdefault(LATEX2MATHML_EXTENSION, {}),
+                mathml_cache=self.mathml_cache,
+                instrumentation=self.collector
+            )
+        return config
+
+    @classmethod
+    def _share(cls, extension_config: Dict[str, Any], **kwargs: Any) -> None:
+        # Objects configured for the extension are kept, but the sizes of
+        # caches are replaced, as the caches they create last for one page.
+        for key, value in kwargs.items():
+            current = extension_config.get(key)
+            if current is None or current == '' or isinstance(current, int):
+                extension_config[key] = value
+
+    def _create_processor(
+            self,
+            autodoc_config: Dict[str, Any]
+    ) -> AutodocBlockProcessor:
+        md = Markdown(
+            extensions=[AUTODOC_EXTENSION],
+            extension_configs={
+                AUTODOC_EXTENSION: dict(autodoc_config, import_workers=0)
+            }
+        )
+        processor = md.parser.blockprocessors['autodoc']
+        assert isinstance(processor, AutodocBlockProcessor)
+        if self.config.prerender_workers > 0:
+            if self._worker_pool is None:
+                # The workers are started while mkdocs is rendering pages on
+                # other threads, so they are spawned rather than forked.
+                self._worker_pool = ImportWorkerPool(
+                    self.config.prerender_workers,
+                    start_method='spawn'
+                )
+            processor.worker_pool = self._worker_pool
+        return processor
+
+    def _start(self, pages: Dict[str, List[Directive]]) -> None:
+        assert self._prewarmer is not None
+        self._pages = {
+            page: directives
+            for page, directives in pages.items()
+            if len(directives) >= self.config.prerender_min_directives
+        }
+        self._prewarmer.start(
+            directive
+            for directives in self._pages.values()
+            for directive in directives
+        )
+
+    def on_files(self, files: Files, *, config: MkDocsConfig) -> Optional[Files]:
+        if self._prewarmer is None or self.config.prewarm:
+            return files
+
+        pages: Dict[str, List[Directive]] = {}
+        for file in files.documentation_pages():
+            try:
+                with open(file.abs_src_path, 'rt', encoding='utf-8') as file_ptr:
+                    pages[file.src_uri] = find_directives(file_ptr.read())
+            except (OSError, ValueError):
+                # The page reports the error when it is rendered.
+                continue
+        self._start(pages)
+        return files
+
+    def on_page_markdown(
+            self,
+            markdown: str,
+            *,
+            page: Page,
+            config: MkDocsConfig,
+            files: Files
+    ) -> Optional[str]:
+        directives = self._pages.get(page.file.src_uri)
+        if directives and self._prewarmer is not None:
+            # Only the directives of this page are waited for, so later
+            # pages are prepared while this one renders.
+            self._prewarmer.wait(directives)
+        return markdown
+
+    def on_post_build(self, *, config: MkDocsConfig) -> None:
+        report = self.report()
+        report['build_time'] = time.perf_counter() - self._build_start
+        stages = report['instrumentation']['stages']
+        log.info(
+            "autodoc: %d directives in %.2fs",
+            report['instrumentation']['counters'].get('directives', 0),
+            stages['directive']['total'] if 'directive' in stages else 0.0
+        )
+        if report['prewarm'] is not None:
+            log.info(
+                "autodoc: %d descriptors prepared in the background, "
+                "%.2fs waiting for them",
+                report['prewarm']['prepared'],
+                report['prewarm']['waited']
+            )
+        for name, stats in report['caches'].items():
+            log.info(
+                "autodoc: %s %d hits, %d misses",
+                name,
+                stats['hits'],
+                stats['misses']
+            )
+        if self.config.timings_report:
+            with open(self.config.timings_report, 'wt', encoding='utf-8') as file_ptr:
+                json.dump(report, file_ptr, indent=2)
+
+    def _close_prewarmer(self) -> None:
+        if self._prewarmer is not None:
+            self._prewarmer.close()
+            self._prewarmer = None
+        self._pages = {}
+
+    def on_shutdown(self) -> None:
+        self._close_prewarmer()
+        if self._worker_pool is not None:
+            self._worker_pool.close()
+            self._worker_pool = None
+
+    def report(self) -> Dict[str, Any]:
+        """Make a report of the timings and caches of the build.
+
+        Returns:
+            Dict[str, Any]: The report
+        """
+        caches = {
+            'descriptor_cache': self.descriptor_cache,
+            'fragment_cache': self.fragment_cache,
+            'template_cache': self.template_cache,
+            'mathml_cache': self.mathml_cache,
+        }
+        return {
+            'instrumentation': self.collector.report(),
+            'prewarm': (
+                self._prewarmer.stats()
+                if self._prewarmer is not None
+                else None
+            ),
+            'caches': {
+                name: cache.stats()
+                for name, cache in caches.items()
+                if cache is not None
+            }
+        }
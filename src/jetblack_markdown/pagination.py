@@ -0,0 +1,92 @@
+"""Splitting the documentation of a module tree into chunks.
+
+Following the module tree of a large package produces a single page holding
+every module, which browsers are slow to render. The tree can instead be
+split into chunks, one for each module, with modules holding many classes
+split further. Each chunk holds a copy of its module descriptor with only
+the members of the chunk, and no child modules, so it can be rendered on its
+own.
+"""
+
+import copy
+from typing import List, NamedTuple, Set
+
+from .metadata import ModuleDescriptor
+
+
+class Chunk(NamedTuple):
+    """A part of the documentation of a module tree
+
+    Attributes:
+        name (str): A name for the chunk which is unique within the tree,
+            suitable for a file name.
+        title (str): The title of the chunk
+        module (ModuleDescriptor): The module, with only the members of the
+            chunk
+    """
+    name: str
+    title: str
+    module: ModuleDescriptor
+
+
+def paginate(
+        module: ModuleDescriptor,
+        classes_per_chunk: int = 0
+) -> List[Chunk]:
+    """Split a module tree into chunks.
+
+    The modules are visited depth first, with a chunk for each module. A
+    module which is a child of more than one module in the tree, as when a
+    module imports a sibling, is only given chunks where it is first found. When
+    `classes_per_chunk` is given, a module with more classes is split into
+    several chunks. The first holds the description, attributes, functions
+    and the first of the classes, and the others hold the remaining classes.
+
+    Args:
+        module (ModuleDescriptor): The root of the module tree
+        classes_per_chunk (int, optional): The maximum number of classes in a
+            chunk, or zero for no limit. Defaults to 0.
+
+    Returns:
+        List[Chunk]: The chunks
+    """
+    chunks: List[Chunk] = []
+    _paginate(module, classes_per_chunk, chunks, set())
+    return chunks
+
+
+def _paginate(
+        module: ModuleDescriptor,
+        classes_per_chunk: int,
+        chunks: List[Chunk],
+        visited: Set[str]
+) -> None:
+    if module.name in visited:
+        return
+    visited.add(module.name)
+
+    size = classes_per_chunk if classes_per_chunk > 0 else len(module.classes)
+    groups = [
+        module.classes[start:start + size]
+        for start in range(0, len(module.classes), size or 1)
+    ] or [[]]
+
+    for part, classes in enumerate(groups, 1):
+        chunk = copy.copy(module)
+        chunk.classes = classes
+        chunk.modules = []
+        if part > 1:
+            chunk.description = None
+            chunk.attributes = []
+            chunk.examples = None
+            chunk.functions = []
+        chunks.append(
+            Chunk(
+                module.name if part == 1 else f'{module.name}-{part}',
+                module.name if len(groups) == 1 else f'{module.name} ({part} of {len(groups)})',
+                chunk
+            )
+        )
+
+    for child in module.modules:
+        _paginate(child, classes_per_chunk, chunks, visited)
@@ -0,0 +1,93 @@
+"""A pool of configured Markdown instances.
+
+A `Markdown` instance holds the state of the document it is converting, so it
+can only convert one document at a time. The processors of this package hold
+no state between calls, and share their caches through the extension
+configuration, so a pool of instances with the same configuration can render
+pages on many threads.
+
+```python
+pool = MarkdownPool(['jetblack_markdown.autodoc'], size=8)
+with ThreadPoolExecutor(8) as executor:
+    pages = list(executor.map(pool.convert, sources))
+```
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager
+import queue
+from typing import Any, Iterator, List, Mapping, Optional, Sequence
+
+from markdown import Markdown
+
+
+class MarkdownPool:
+    """A pool of Markdown instances with the same configuration"""
+
+    def __init__(
+            self,
+            extensions: Optional[Sequence[Any]] = None,
+            extension_configs: Optional[Mapping[str, Mapping[str, Any]]] = None,
+            size: int = 4
+    ) -> None:
+        """A pool of Markdown instances with the same configuration.
+
+        Instances are created when first needed.
+
+        Args:
+            extensions (Optional[Sequence[Any]], optional): The markdown
+                extensions. Defaults to None.
+            extension_configs (Optional[Mapping[str, Mapping[str, Any]]], optional):
+                The extension configurations. Defaults to None.
+            size (int, optional): The number of instances, and so the number
+                of concurrent conversions. Defaults to 4.
+
+        Raises:
+            ValueError: If the size is less than one.
+        """
+        if size < 1:
+            raise ValueError("The pool must have at least one instance")
+        self.extensions: List[Any] = list(extensions or [])
+        self.extension_configs = dict(extension_configs or {})
+        self.size = size
+        self._idle: queue.Queue[Optional[Markdown]] = queue.Queue()
+        for _ in range(size):
+            self._idle.put(None)
+
+    def _create(self) -> Markdown:
+        return Markdown(
+            extensions=self.extensions,
+            extension_configs=self.extension_configs
+        )
+
+    @contextmanager
+    def acquire(self) -> Iterator[Markdown]:
+        """Acquire an instance, waiting for one to be free.
+
+        The instance is reset before it is returned to the pool.
+
+        Yields:
+            Markdown: The instance
+        """
+        md = self._idle.get()
+        try:
+            if md is None:
+                md = self._create()
+            yield md
+        finally:
+            if md is not None:
+                md.reset()
+            self._idle.put(md)
+
+    def convert(self, text: str) -> str:
+        """Convert markdown to HTML
+
+        Args:
+            text (str): The markdown
+
+        Returns:
+            str: The HTML
+        """
+        with self.acquire() as md:
+            return md.convert(text)
+
@@ -0,0 +1,184 @@
+"""Preparing the descriptors of the directives in a docs tree in the
+background.
+
+The descriptors are otherwise created as each page is rendered, one page
+after another. A `Prewarmer` prepares them on a pool of threads through a
+processor, which caches them in its descriptor cache. When the processor has
+import workers the descriptors are created in parallel by the worker
+processes. The processors rendering the pages must share the descriptor
+cache, and can wait for the directives of their page before rendering it.
+
+```python
+prewarmer = Prewarmer(processor, concurrency=4)
+pages = scan_directives('documentation')
+prewarmer.start(directive for directives in pages.values() for directive in directives)
+...
+prewarmer.wait(pages['index.md'])
+```
+"""
+
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .autodoc_processor import AutodocBlockProcessor, find_directives
+from .metadata.selection import MemberSelection
+
+Directive = Tuple[str, Optional[MemberSelection]]
+
+log = logging.getLogger(__name__)
+
+
+def scan_directives(
+        folder: str,
+        suffixes: Tuple[str, ...] = ('.md', '.markdown')
+) -> Dict[str, List[Directive]]:
+    """Find the directives in the markdown files of a folder tree.
+
+    Files which cannot be read, or hold an invalid selection, are skipped, as
+    they are reported when they are rendered.
+
+    Args:
+        folder (str): The folder
+        suffixes (Tuple[str, ...], optional): The suffixes of the markdown
+            files. Defaults to ('.md', '.markdown').
+
+    Returns:
+        Dict[str, List[Directive]]: The directives of each file with any,
+            by the path of the file relative to the folder, with forward
+            slashes.
+    """
+    pages: Dict[str, List[Directive]] = {}
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(suffixes):
+                continue
+            path = os.path.join(root, name)
+            try:
+                with open(path, 'rt', encoding='utf-8') as file_ptr:
+                    directives = find_directives(file_ptr.read())
+            except (OSError, UnicodeDecodeError, ValueError):
+                continue
+            if directives:
+                page = os.path.relpath(path, folder).replace(os.sep, '/')
+                pages[page] = directives
+    return pages
+
+
+class Prewarmer:
+    """Prepares the descriptors of directives in the background"""
+
+    def __init__(
+            self,
+            processor: AutodocBlockProcessor,
+            concurrency: int = 4
+    ) -> None:
+        """Prepares the descriptors of directives in the background.
+
+        Args:
+            processor (AutodocBlockProcessor): The processor which creates
+                and caches the descriptors.
+            concurrency (int, optional): The number of directives prepared
+                at once. Defaults to 4.
+
+        Raises:
+            ValueError: If the concurrency is less than one.
+        """
+        if concurrency < 1:
+            raise ValueError("The concurrency must be at least one")
+        self.processor = processor
+        self.concurrency = concurrency
+        self.prepared = 0
+        self.errors = 0
+        self.waited = 0.0
+        self._futures: Dict[Directive, Future] = {}
+        self._executor = ThreadPoolExecutor(
+            concurrency,
+            thread_name_prefix='autodoc-prewarm'
+        )
+        self._lock = threading.Lock()
+
+    def start(self, directives: Iterable[Directive]) -> None:
+        """Start preparing directives. Directives already started are
+        skipped.
+
+        Args:
+            directives (Iterable[Directive]): The import strings and
+                selections.
+        """
+        with self._lock:
+            for directive in directives:
+                if directive not in self._futures:
+                    self._futures[directive] = self._executor.submit(
+                        self._prepare,
+                        directive
+                    )
+
+    def _prepare(self, directive: Directive) -> None:
+        import_str, selection = directive
+        try:
+            self.processor.prepare(import_str, selection)
+        except Exception as error:  # pylint: disable=broad-except
+            # The page reports the error when it is rendered.
+            log.debug("Failed to prepare %s: %s", import_str, error)
+            with self._lock:
+                self.errors += 1
+        else:
+            with self._lock:
+                self.prepared += 1
+
+    def wait(
+            self,
+            directives: Optional[Iterable[Directive]] = None,
+            timeout: Optional[float] = None
+    ) -> None:
+        """Wait for directives to be prepared.
+
+        Args:
+            directives (Optional[Iterable[Directive]], optional): The
+                directives, or None for every directive started. Directives
+                which were not started are ignored. Defaults to None.
+            timeout (Optional[float], optional): The maximum time to wait in
+                seconds. Defaults to None.
+        """
+        with self._lock:
+            futures = [
+                self._futures[directive]
+                for directive in (
+                    self._futures if directives is None else directives
+                )
+                if directive in self._futures
+            ]
+        if not futures:
+            return
+        start = time.perf_counter()
+        wait(futures, timeout)
+        with self._lock:
+            self.waited += time.perf_counter() - start
+
+    def stats(self) -> Dict[str, Any]:
+        """The progress of the preparation
+
+        Returns:
+            Dict[str, Any]: The number of directives started, prepared and
+                failed, and the time spent waiting for them.
+        """
+        with self._lock:
+            return {
+                'started': len(self._futures),
+                'prepared': self.prepared,
+                'errors': self.errors,
+                'waited': self.waited,
+            }
+
+    def close(self) -> None:
+        """Stop preparing directives, cancelling those not yet started"""
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+        self._executor.shutdown()
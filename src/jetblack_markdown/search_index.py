@@ -0,0 +1,179 @@
+"""A prebuilt search index for the documented symbols.
+
+The index is collected from the descriptors as they are built, so a search
+client can load it rather than tokenizing the rendered HTML. It is written as
+JSON with two parts:
+
+* "symbols": a table of `[name, qualified_name, kind, page, summary]` entries
+  sorted by the lower case name, so names can be matched by prefix with a
+  binary search.
+* "terms": an inverted index of the terms in the names and summaries to the
+  positions of the symbols in the table.
+"""
+
+from __future__ import annotations
+import atexit
+import json
+import re
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Union
+
+from .metadata import (
+    CallableDescriptor,
+    ClassDescriptor,
+    Descriptor,
+    ModuleDescriptor,
+    PropertyDescriptor
+)
+from .symbols import qualified_name
+
+_TERM_RE = re.compile(r'[a-z0-9]+')
+
+_STOP_WORDS = frozenset(
+    'a an and are as at be by for from if in is it of on or the this to '
+    'with'.split()
+)
+
+
+class SearchEntry(NamedTuple):
+    """A symbol in the search index"""
+    name: str
+    qualified_name: str
+    kind: str
+    page: str
+    summary: str
+
+
+def _terms(text: str) -> Set[str]:
+    return {
+        term
+        for term in _TERM_RE.findall(text.lower())
+        if term not in _STOP_WORDS and len(term) > 1
+    }
+
+
+class SearchIndex:
+    """Collects the documented symbols into a search index"""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, SearchEntry] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, descriptor: Descriptor, page: str = '') -> None:
+        """Add a descriptor, and the descriptors it contains, to the index
+
+        Args:
+            descriptor (Descriptor): The descriptor
+            page (str, optional): The URL of the page on which it is
+                rendered. Defaults to ''.
+        """
+        with self._lock:
+            self._add_descriptor(descriptor, page, None)
+
+    def _add_descriptor(
+            self,
+            descriptor: Descriptor,
+            page: str,
+            parent: Optional[str]
+    ) -> None:
+        if isinstance(descriptor, PropertyDescriptor):
+            if parent is None:
+                return
+            name = f'{parent}.{descriptor.name}'
+        else:
+            name = qualified_name(descriptor)  # type: ignore
+            if name is None:
+                return
+        kind = (
+            descriptor.callable_type.name.lower()
+            if isinstance(descriptor, CallableDescriptor)
+            else descriptor.descriptor_type
+        )
+        self._entries[name] = SearchEntry(
+            descriptor.name,  # type: ignore
+            name,
+            kind,
+            page,
+            descriptor.summary or ''  # type: ignore
+        )
+
+        children: List[Descriptor] = []
+        if isinstance(descriptor, ModuleDescriptor):
+            children = [
+                *descriptor.classes,
+                *descriptor.functions,
+                *descriptor.modules
+            ]
+        elif isinstance(descriptor, ClassDescriptor):
+            children = [
+                *descriptor.properties,
+                *descriptor.class_methods,
+                *descriptor.methods
+            ]
+        for child in children:
+            self._add_descriptor(child, page, name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Build the search index
+
+        Returns:
+            Dict[str, Any]: The symbol table and the inverted index of terms.
+        """
+        with self._lock:
+            entries = sorted(
+                self._entries.values(),
+                key=lambda entry: (entry.name.lower(), entry.qualified_name)
+            )
+
+        terms: Dict[str, List[int]] = {}
+        for position, entry in enumerate(entries):
+            for term in _terms(entry.name.replace('_', ' ')) | _terms(entry.summary):
+                terms.setdefault(term, []).append(position)
+
+        return {
+            'symbols': [list(entry) for entry in entries],
+            'terms': dict(sorted(terms.items())),
+        }
+
+    def write(self, path: str) -> None:
+        """Write the search index as compact JSON
+
+        Args:
+            path (str): The path of the file
+        """
+        with open(path, 'wt', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, separators=(',', ':'))
+
+
+_SHARED_INDEXES: Dict[str, SearchIndex] = {}
+_SHARED_INDEXES_LOCK = threading.Lock()
+
+
+def create_search_index(
+        value: Union[str, SearchIndex, None]
+) -> Optional[SearchIndex]:
+    """Create a search index from an extension config value.
+
+    Extensions with the same file share the index, which is written when the
+    interpreter exits.
+
+    Args:
+        value (Union[str, SearchIndex, None]): An index, or the path of the
+            file to which it is written.
+
+    Returns:
+        Optional[SearchIndex]: The index, or None if it is disabled.
+    """
+    if isinstance(value, SearchIndex):
+        return value
+    if not value:
+        return None
+    with _SHARED_INDEXES_LOCK:
+        index = _SHARED_INDEXES.get(value)
+        if index is None:
+            index = _SHARED_INDEXES[value] = SearchIndex()
+            atexit.register(index.write, value)
+        return index
@@ -0,0 +1,253 @@
+"""A symbol index for linking type names.
+
+The index maps the qualified names of the documented modules, classes and
+functions to the page on which they are rendered. It is collected as the
+descriptors are built, and the templates use it to link type names and class
+bases with a hash lookup for each name. The index can be persisted to a JSON
+file, so an incremental build can link to symbols on pages it does not
+rebuild.
+"""
+
+from __future__ import annotations
+import atexit
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, Optional, Union
+
+from .metadata import (
+    CallableDescriptor,
+    ClassDescriptor,
+    Descriptor,
+    ModuleDescriptor
+)
+
+_NAME_RE = re.compile(r'[A-Za-z_][\w.]*')
+
+
+def qualified_name(descriptor: Descriptor) -> Optional[str]:
+    """The qualified name of a descriptor
+
+    Args:
+        descriptor (Descriptor): The descriptor
+
+    Returns:
+        Optional[str]: The qualified name, or None if the descriptor has none.
+    """
+    if isinstance(descriptor, ModuleDescriptor):
+        return descriptor.name
+    if isinstance(descriptor, ClassDescriptor):
+        return f'{descriptor.module}.{descriptor.name}'
+    if isinstance(descriptor, CallableDescriptor):
+        if not descriptor.qualifier:
+            return f'{descriptor.module}.{descriptor.name}'
+        if descriptor.qualifier in (descriptor.module, descriptor.package):
+            return f'{descriptor.qualifier}.{descriptor.name}'
+        return f'{descriptor.module}.{descriptor.qualifier}.{descriptor.name}'
+    return None
+
+
+class SymbolIndex:
+    """An index of qualified names to the pages on which they are rendered.
+
+    Classes can also be found by their unqualified name, unless two classes
+    share it.
+    """
+
+    def __init__(
+            self,
+            symbols: Optional[Dict[str, str]] = None,
+            classes: Iterable[str] = (),
+            ambiguous: Iterable[str] = ()
+    ) -> None:
+        """An index of qualified names to the pages on which they are rendered
+
+        Args:
+            symbols (Optional[Dict[str, str]], optional): The qualified names
+                and their pages. Defaults to None.
+            classes (Iterable[str], optional): The qualified names which are
+                classes. Defaults to ().
+            ambiguous (Iterable[str], optional): The unqualified class names
+                shared by more than one class. Defaults to ().
+        """
+        self._symbols: Dict[str, str] = {}
+        self._classes: Dict[str, Optional[str]] = {
+            short_name: None
+            for short_name in ambiguous
+        }
+        self._lock = threading.Lock()
+        class_names = set(classes)
+        for name, page in (symbols or {}).items():
+            self._add(name, page, name in class_names)
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._symbols
+
+    def _add(self, name: str, page: str, is_class: bool) -> None:
+        self._symbols[name] = page
+        if is_class:
+            short_name = name.rpartition('.')[2]
+            existing = self._classes.get(short_name, name)
+            # Ambiguous names are not linked.
+            self._classes[short_name] = name if existing == name else None
+
+    def add(self, descriptor: Descriptor, page: str = '') -> None:
+        """Add a descriptor, and the descriptors it contains, to the index
+
+        Args:
+            descriptor (Descriptor): The descriptor
+            page (str, optional): The URL of the page on which it is
+                rendered. Defaults to ''.
+        """
+        with self._lock:
+            self._add_descriptor(descriptor, page)
+
+    def _add_descriptor(self, descriptor: Descriptor, page: str) -> None:
+        name = qualified_name(descriptor)
+        if name is None:
+            return
+        self._add(name, page, isinstance(descriptor, ClassDescriptor))
+
+        if isinstance(descriptor, ModuleDescriptor):
+            for child in (
+                    descriptor.classes +
+                    descriptor.functions +
+                    descriptor.modules
+            ):
+                self._add_descriptor(child, page)
+        elif isinstance(descriptor, ClassDescriptor):
+            for method in descriptor.class_methods + descriptor.methods:
+                self._add_descriptor(method, page)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Find the qualified name of a symbol
+
+        Args:
+            name (str): A qualified, or unqualified class, name
+
+        Returns:
+            Optional[str]: The qualified name, or None if it was not found.
+        """
+        if name in self._symbols:
+            return name
+        return self._classes.get(name.rpartition('.')[2])
+
+    def url(self, name: str) -> Optional[str]:
+        """The URL of a symbol
+
+        Args:
+            name (str): A qualified, or unqualified class, name
+
+        Returns:
+            Optional[str]: The URL, or None if it was not found.
+        """
+        qualified = self.resolve(name)
+        if qualified is None:
+            return None
+        return f'{self._symbols[qualified]}#{qualified}'
+
+    def link_name(self, name: str, text: Optional[str] = None) -> str:
+        """Link a name to its page
+
+        Args:
+            name (str): A qualified, or unqualified class, name
+            text (Optional[str], optional): The text of the link. Defaults to
+                the name.
+
+        Returns:
+            str: The link, or the text if the name was not found.
+        """
+        text = name if text is None else text
+        url = self.url(name)
+        if url is None:
+            return text
+        return f'<a class="autodoc-link" href="{url}">{text}</a>'
+
+    def link(self, text: str) -> str:
+        """Link the names in a type name to their pages
+
+        Args:
+            text (str): The type name, e.g. "Optional[MyClass]"
+
+        Returns:
+            str: The type name with the known names as links.
+        """
+        return _NAME_RE.sub(lambda match: self.link_name(match.group(0)), text)
+
+    @classmethod
+    def load(cls, path: str) -> SymbolIndex:
+        """Load an index from a JSON file
+
+        Args:
+            path (str): The path of the file
+
+        Returns:
+            SymbolIndex: The index, which is empty if the file does not exist.
+        """
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'rt', encoding='utf-8') as file:
+            data = json.load(file)
+        return cls(
+            data['symbols'],
+            data['classes'],
+            data.get('ambiguous', ())
+        )
+
+    def save(self, path: str) -> None:
+        """Save the index as a JSON file
+
+        Args:
+            path (str): The path of the file
+        """
+        with self._lock:
+            data = {
+                'symbols': dict(sorted(self._symbols.items())),
+                'classes': sorted(
+                    name
+                    for name in self._classes.values()
+                    if name is not None
+                ),
+                'ambiguous': sorted(
+                    short_name
+                    for short_name, name in self._classes.items()
+                    if name is None
+                )
+            }
+        with open(path, 'wt', encoding='utf-8') as file:
+            json.dump(data, file, indent=2)
+
+
+_SHARED_INDEXES: Dict[str, SymbolIndex] = {}
+_SHARED_INDEXES_LOCK = threading.Lock()
+
+
+def create_symbol_index(
+        value: Union[str, SymbolIndex, None]
+) -> Optional[SymbolIndex]:
+    """Create a symbol index from an extension config value.
+
+    Extensions with the same file share the index, which is loaded when it is
+    first used and saved when the interpreter exits.
+
+    Args:
+        value (Union[str, SymbolIndex, None]): An index, or the path of the
+            file in which it is persisted.
+
+    Returns:
+        Optional[SymbolIndex]: The index, or None if linking is disabled.
+    """
+    if isinstance(value, SymbolIndex):
+        return value
+    if not value:
+        return None
+    with _SHARED_INDEXES_LOCK:
+        index = _SHARED_INDEXES.get(value)
+        if index is None:
+            index = _SHARED_INDEXES[value] = SymbolIndex.load(value)
+            atexit.register(index.save, value)
+        return index
@@ -0,0 +1,209 @@
+"""Rendering type annotations as names.
+
+Annotations are rendered by walking the `typing` constructs, rather than by
+post-processing `str(annotation)`. The results are memoized by annotation
+object.
+"""
+
+import collections.abc
+from inspect import Parameter
+import re
+import threading
+import types
+import typing
+from typing import Any, Dict, Sequence, Tuple
+
+_TYPING_PREFIX_RE = re.compile(
+    r'\b(?:typing|typing_extensions|collections\.abc)\.'
+)
+
+_NONE_TYPE = type(None)
+
+_UNION_TYPE = getattr(types, 'UnionType', None)
+_ANNOTATED = getattr(typing, 'Annotated', None)
+_CONCATENATE = getattr(typing, 'Concatenate', None)
+_PARAM_SPEC = getattr(typing, 'ParamSpec', None)
+_TYPE_PARAMETERS = (typing.TypeVar,) + ((_PARAM_SPEC,) if _PARAM_SPEC else ())
+_PARAM_SPEC_MEMBERS = tuple(
+    member_type
+    for member_type in (
+        getattr(typing, 'ParamSpecArgs', None),
+        getattr(typing, 'ParamSpecKwargs', None)
+    )
+    if member_type is not None
+)
+_CALLABLES = (typing.Callable, collections.abc.Callable)
+
+
+def _normalise_name(text: str) -> str:
+    text = text.strip()
+    if len(text) > 1 and text[0] == text[-1] and text[0] in '\'"':
+        text = text[1:-1]
+    return _TYPING_PREFIX_RE.sub('', text)
+
+
+class TypeNameFormatter:
+    """Renders type annotations as names.
+
+    The results are memoized by the identity of the annotation, and the
+    annotation is held by the cache so the identity is not reused. String
+    annotations (forward references, or annotations under
+    `from __future__ import annotations`) are memoized by value.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """Renders type annotations as names.
+
+        Args:
+            maxsize (int, optional): The number of annotations to memoize
+                before the cache is cleared. Defaults to 4096.
+        """
+        self.maxsize = maxsize
+        self._objects: Dict[int, Tuple[Any, str]] = {}
+        self._strings: Dict[str, str] = {}
+
+    def clear(self) -> None:
+        """Clear the cache"""
+        self._objects = {}
+        self._strings = {}
+
+    def format(self, annotation: Any) -> str:
+        """Render an annotation as a name.
+
+        Args:
+            annotation (Any): The type annotation
+
+        Returns:
+            str: The name of the type
+        """
+        if isinstance(annotation, str):
+            name = self._strings.get(annotation)
+            if name is None:
+                if len(self._strings) >= self.maxsize:
+                    self._strings = {}
+                name = self._strings[annotation] = _normalise_name(annotation)
+            return name
+        if isinstance(annotation, list):
+            # Callable parameters are new lists each time.
+            return '[' + self._format_args(annotation) + ']'
+
+        entry = self._objects.get(id(annotation))
+        if entry is not None and entry[0] is annotation:
+            return entry[1]
+
+        name = self._format(annotation)
+        if len(self._objects) >= self.maxsize:
+            self._objects = {}
+        self._objects[id(annotation)] = (annotation, name)
+        return name
+
+    def _format(self, annotation: Any) -> str:
+        # pylint: disable=too-many-return-statements,too-many-branches
+        if annotation is None or annotation is _NONE_TYPE:
+            return 'None'
+        if annotation is Ellipsis:
+            return '...'
+        if annotation is Parameter.empty or annotation is typing.Any:
+            return 'Any'
+        if isinstance(annotation, typing.ForwardRef):
+            return self.format(annotation.__forward_arg__)
+        if isinstance(annotation, _TYPE_PARAMETERS):
+            return annotation.__name__
+        if isinstance(annotation, _PARAM_SPEC_MEMBERS):
+            # P.args and P.kwargs
+            return _normalise_name(repr(annotation))
+        if isinstance(annotation, tuple):
+            return '[' + self._format_args(annotation) + ']'
+
+        origin = typing.get_origin(annotation)
+        if origin is None:
+            if isinstance(annotation, type):
+                return annotation.__name__
+            special_name = getattr(annotation, '_name', None)
+            if special_name:
+                return special_name
+            return _normalise_name(str(annotation))
+
+        args = typing.get_args(annotation)
+
+        if origin is typing.Union or (
+                _UNION_TYPE is not None and origin is _UNION_TYPE
+        ):
+            if isinstance(annotation, _UNION_TYPE or ()):
+                return ' | '.join(self.format(arg) for arg in args)
+            if len(args) == 2 and _NONE_TYPE in args:
+                optional_arg = args[0] if args[1] is _NONE_TYPE else args[1]
+                return f'Optional[{self.format(optional_arg)}]'
+            return f'Union[{self._format_args(args)}]'
+
+        if _ANNOTATED is not None and origin is _ANNOTATED:
+            return self.format(args[0])
+
+        name = self._origin_name(annotation, origin)
+
+        if origin is typing.Literal:
+            return f'{name}[{", ".join(repr(arg) for arg in args)}]'
+
+        if origin in _CALLABLES and args:
+            parameters, result = args[:-1], args[-1]
+            if len(parameters) == 1 and (
+                    parameters[0] is Ellipsis or
+                    isinstance(parameters[0], list) or
+                    _is_param_spec(parameters[0])
+            ):
+                parameters_name = self.format(parameters[0])
+            else:
+                parameters_name = self.format(list(parameters))
+            return f'{name}[{parameters_name}, {self.format(result)}]'
+
+        if origin is tuple and args in ((), ((),)) and annotation is not typing.Tuple:
+            # The empty tuple.
+            return f'{name}[()]'
+        if not args:
+            return name
+
+        return f'{name}[{self._format_args(args)}]'
+
+    def _format_args(self, args: Sequence[Any]) -> str:
+        return ', '.join(self.format(arg) for arg in args)
+
+    @staticmethod
+    def _origin_name(annotation: Any, origin: Any) -> str:
+        special_name = getattr(annotation, '_name', None)
+        if special_name:
+            return special_name
+        if origin is typing.Literal:
+            return 'Literal'
+        if origin is collections.abc.Callable:
+            return 'Callable'
+        return getattr(origin, '__name__', None) or _normalise_name(str(origin))
+
+
+def _is_param_spec(annotation: Any) -> bool:
+    # The parameters of a callable given by a ParamSpec, or a Concatenate
+    # ending with one.
+    return (
+        (_PARAM_SPEC is not None and isinstance(annotation, _PARAM_SPEC)) or (
+            _CONCATENATE is not None and
+            typing.get_origin(annotation) is _CONCATENATE
+        )
+    )
+
+
+# Each thread has its own formatter, so threads never contend for the cache.
+_LOCAL = threading.local()
+
+
+def format_annotation(annotation: Any) -> str:
+    """Render a type annotation as a name.
+
+    Args:
+        annotation (Any): The type annotation
+
+    Returns:
+        str: The name of the type
+    """
+    formatter = getattr(_LOCAL, 'formatter', None)
+    if formatter is None:
+        formatter = _LOCAL.formatter = TypeNameFormatter()
+    return formatter.format(annotation)
@@ -2,15 +2,45 @@
 
 import importlib
 from inspect import Parameter
-import re
-from typing import Any, Optional, Union
+import sys
+import threading
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union
+)
 import xml.etree.ElementTree as etree
 
 from docstring_parser import Docstring, DocstringParam, DocstringReturns
 
+from .type_names import format_annotation
 
-def import_from_string(import_str: str) -> Any:
-    """Import some python object from a given string
+
+class ImportTarget(NamedTuple):
+    """The object an import string refers to
+
+    Attributes:
+        obj (Any): The imported object
+        parent (Any): The module or class containing the object, or None if
+            the object is a module.
+        name (Optional[str]): The name of the object in the parent, or None
+            if the object is a module.
+    """
+    obj: Any
+    parent: Any
+    name: Optional[str]
+
+
+def resolve_import_string(import_str: str) -> ImportTarget:
+    """Resolve the object an import string refers to.
+
+    The import string is of the form "module" or "module:member", where the
+    member may be a dotted path such as "Class.method" or "Outer.Inner".
 
     Args:
         import_str (str): The import string
@@ -20,7 +50,7 @@ def import_from_string(import_str: str) -> Any:
         ValueError: If the module could not be imported.
 
     Returns:
-        Any: The imported object
+        ImportTarget: The imported object with its parent
     """
     module_str, _, attr_str = import_str.partition(":")
 
@@ -33,14 +63,136 @@ def import_from_string(import_str: str) -> Any:
         raise ValueError(f"Could not import module {module_str!r}.") from exc
 
     if not attr_str:
-        return module
+        return ImportTarget(module, None, None)
 
-    try:
-        return getattr(module, attr_str)
-    except AttributeError as exc:
-        raise ValueError(
-            f"Attribute {attr_str!r} not found in module {module_str!r}."
-        ) from exc
+    parent: Any = None
+    obj: Any = module
+    name = attr_str
+    for name in attr_str.split('.'):
+        parent = obj
+        try:
+            obj = getattr(parent, name)
+        except AttributeError as exc:
+            raise ValueError(
+                f"Attribute {attr_str!r} not found in module {module_str!r}."
+            ) from exc
+
+    return ImportTarget(obj, parent, name)
+
+
+def import_from_string(import_str: str) -> Any:
+    """Import some python object from a given string
+
+    Args:
+        import_str (str): The import string
+
+    Raises:
+        ImportError: If the module could not be imported.
+        ValueError: If the module could not be imported.
+
+    Returns:
+        Any: The imported object
+    """
+    return resolve_import_string(import_str).obj
+
+
+class _ImportFailure(NamedTuple):
+    """A failed resolution, held without its traceback"""
+    error_type: Type[Exception]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    version: Tuple[int, int, int]
+
+    @classmethod
+    def create(
+            cls,
+            error: Exception,
+            version: Tuple[int, int, int]
+    ) -> '_ImportFailure':
+        kwargs = {
+            'name': error.name,
+            'path': error.path
+        } if isinstance(error, ImportError) else {}
+        return cls(type(error), error.args, kwargs, version)
+
+    def error(self) -> Exception:
+        return self.error_type(*self.args, **self.kwargs)
+
+
+class ImportResolver:
+    """A cache of resolved import strings.
+
+    Both successful and failed resolutions are cached, so each import string
+    is only resolved once. A failure is tried again when `sys.path` has been
+    replaced or changed length, or after `invalidate_caches` is called, as
+    the module may since have been created. The resolver may be shared
+    between threads.
+    """
+
+    def __init__(self) -> None:
+        self._results: Dict[str, Union[ImportTarget, _ImportFailure]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _version(self) -> Tuple[int, int, int]:
+        return id(sys.path), len(sys.path), self._generation
+
+    def resolve(self, import_str: str) -> ImportTarget:
+        """Resolve the object an import string refers to.
+
+        Args:
+            import_str (str): The import string
+
+        Raises:
+            ImportError: If the module could not be imported.
+            ValueError: If the module could not be imported.
+
+        Returns:
+            ImportTarget: The imported object with its parent
+        """
+        result = self._results.get(import_str)
+        if result is None or (
+                isinstance(result, _ImportFailure) and
+                result.version != self._version()
+        ):
+            version = self._version()
+            try:
+                result = resolve_import_string(import_str)
+            except (ImportError, ValueError) as error:
+                result = _ImportFailure.create(error, version)
+            with self._lock:
+                self._results[import_str] = result
+
+        if isinstance(result, _ImportFailure):
+            # A new exception is raised each time, so the frames of earlier
+            # failures are not kept alive by its traceback.
+            raise result.error()
+        return result
+
+    def packages(self) -> FrozenSet[str]:
+        """The top level packages of the import strings which were resolved
+
+        Returns:
+            FrozenSet[str]: The package names
+        """
+        with self._lock:
+            return frozenset(
+                import_str.partition(':')[0].partition('.')[0]
+                for import_str, result in self._results.items()
+                if not isinstance(result, _ImportFailure)
+            )
+
+    def invalidate_caches(self) -> None:
+        """Forget the failed resolutions, and invalidate the caches of the
+        import system, so modules created since are found"""
+        importlib.invalidate_caches()
+        with self._lock:
+            self._generation += 1
+
+    def clear(self) -> None:
+        """Clear the cache"""
+        with self._lock:
+            self._results.clear()
 
 
 def add_tag(tag: str, class_name: Optional[str], parent: etree.Element) -> etree.Element:
@@ -91,14 +243,4 @@ def get_type_name(
     if annotation is Parameter.empty:
         return 'Any'
 
-    type_name = getattr(annotation, '__name__', None)
-    if not type_name:
-        type_name = getattr(annotation, '_', None)
-    if not type_name:
-        type_name = str(annotation)
-
-    return re.sub(
-        r'[^a-zA-Z_]*typing\.([a-zA-Z_][a-zA-Z_0-9]*)',
-        r'\1',
-        type_name
-    )
+    return format_annotation(annotation)
@@ -0,0 +1,269 @@
+"""Worker processes for importing the documented code.
+
+Importing the documented code into the documentation process keeps it resident
+for the life of the process. An `ImportWorkerPool` imports the code in long
+lived worker processes, which build the descriptors with the `metadata`
+builders and send them back in serialized form. Workers are recycled after a
+number of jobs, or when their peak memory exceeds a threshold, so the
+documentation process keeps a flat memory profile.
+"""
+
+from __future__ import annotations
+import atexit
+import multiprocessing
+from multiprocessing.connection import Connection
+import pickle
+import queue
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .metadata import (
+    Descriptor,
+    DescriptorOptions,
+    create_descriptor,
+    deserialize_descriptor,
+    serialize_descriptor
+)
+from .utils import resolve_import_string
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+
+def _peak_memory() -> Optional[int]:
+    """The peak resident memory of this process in megabytes"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS reports bytes.
+    return peak // (1024 * 1024) if sys.platform == 'darwin' else peak // 1024
+
+
+def _picklable_error(error: Exception) -> Exception:
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:  # pylint: disable=broad-except
+        return RuntimeError(f'{type(error).__name__}: {error}')
+
+
+def _worker_main(connection: Connection) -> None:
+    while True:
+        try:
+            job = connection.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        import_str, options = job
+        try:
+            target = resolve_import_string(import_str)
+            descriptor = create_descriptor(
+                target.obj,
+                options,
+                target.parent,
+                target.name
+            )
+            response: Tuple[Optional[Exception], Any] = (
+                None,
+                serialize_descriptor(descriptor)
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            response = (_picklable_error(error), None)
+
+        connection.send((response, _peak_memory()))
+
+    connection.close()
+
+
+class _Worker:
+    """A worker process and the connection to it"""
+
+    def __init__(self, context: Any) -> None:
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_connection,),
+            daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.jobs = 0
+
+    def close(self) -> None:
+        """Stop the worker process"""
+        try:
+            self.connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self.connection.close()
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+
+
+class ImportWorkerPool:
+    """A pool of worker processes which create descriptors"""
+
+    def __init__(
+            self,
+            processes: int = 2,
+            max_jobs: int = 100,
+            max_memory: Optional[int] = None,
+            start_method: Optional[str] = None
+    ) -> None:
+        """A pool of worker processes which create descriptors
+
+        Workers are started when first needed.
+
+        Args:
+            processes (int, optional): The number of worker processes.
+                Defaults to 2.
+            max_jobs (int, optional): The number of jobs after which a worker
+                is recycled. Defaults to 100.
+            max_memory (Optional[int], optional): The peak memory in
+                megabytes after which a worker is recycled. Defaults to None.
+            start_method (Optional[str], optional): The multiprocessing start
+                method. Defaults to None.
+
+        Raises:
+            ValueError: If there are no processes.
+        """
+        if processes < 1:
+            raise ValueError("There must be at least one process")
+        self.processes = processes
+        self.max_jobs = max_jobs
+        self.max_memory = max_memory
+        self.jobs_completed = 0
+        self.workers_recycled = 0
+        self._context = multiprocessing.get_context(start_method)
+        self._idle: queue.Queue[Optional[_Worker]] = queue.Queue()
+        for _ in range(processes):
+            self._idle.put(None)
+        self._lock = threading.Lock()
+        self._is_closed = False
+
+    def create_descriptor(
+            self,
+            import_str: str,
+            options: DescriptorOptions
+    ) -> Descriptor:
+        """Create the descriptor for an import string in a worker process
+
+        Args:
+            import_str (str): The import string
+            options (DescriptorOptions): The descriptor options
+
+        Raises:
+            RuntimeError: If the pool is closed, or the worker exited.
+
+        Returns:
+            Descriptor: The descriptor
+        """
+        worker = self._idle.get()
+        try:
+            if self._is_closed:
+                raise RuntimeError("The import worker pool is closed")
+            if worker is not None and not worker.process.is_alive():
+                # The worker died while it was idle, so it is replaced.
+                worker.close()
+                worker = None
+            if worker is None:
+                worker = _Worker(self._context)
+
+            try:
+                worker.connection.send((import_str, options))
+                (error, data), peak_memory = worker.connection.recv()
+            except (EOFError, OSError) as exc:
+                worker.close()
+                worker = None
+                raise RuntimeError(
+                    f"The import worker exited while documenting {import_str!r}"
+                ) from exc
+
+            worker.jobs += 1
+            with self._lock:
+                self.jobs_completed += 1
+            if self._should_recycle(worker, peak_memory):
+                worker.close()
+                worker = None
+                with self._lock:
+                    self.workers_recycled += 1
+        finally:
+            self._idle.put(worker)
+
+        if error is not None:
+            raise error
+        return deserialize_descriptor(data)
+
+    def _should_recycle(self, worker: _Worker, peak_memory: Optional[int]) -> bool:
+        if self.max_jobs and worker.jobs >= self.max_jobs:
+            return True
+        return bool(
+            self.max_memory and
+            peak_memory is not None and
+            peak_memory >= self.max_memory
+        )
+
+    def close(self) -> None:
+        """Stop the worker processes, waiting for running jobs to finish"""
+        if self._is_closed:
+            return
+        self._is_closed = True
+        workers: List[Optional[_Worker]] = [
+            self._idle.get()
+            for _ in range(self.processes)
+        ]
+        for worker in workers:
+            if worker is not None:
+                worker.close()
+        for _ in range(self.processes):
+            self._idle.put(None)
+
+    def __enter__(self) -> ImportWorkerPool:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+_SHARED_POOLS: Dict[Tuple[int, int, Optional[int]], ImportWorkerPool] = {}
+_SHARED_POOLS_LOCK = threading.Lock()
+
+
+def get_shared_pool(
+        processes: int,
+        max_jobs: int,
+        max_memory: Optional[int]
+) -> ImportWorkerPool:
+    """Get a pool shared by all extensions with the same configuration.
+
+    Extensions are created for every page by mkdocs, so the pools are shared
+    to keep the workers warm across the build. Shared pools are closed when
+    the interpreter exits.
+
+    Args:
+        processes (int): The number of worker processes
+        max_jobs (int): The number of jobs after which a worker is recycled
+        max_memory (Optional[int]): The peak memory in megabytes after which a
+            worker is recycled
+
+    Returns:
+        ImportWorkerPool: The pool
+    """
+    key = (processes, max_jobs, max_memory)
+    with _SHARED_POOLS_LOCK:
+        pool = _SHARED_POOLS.get(key)
+        if pool is None:
+            pool = _SHARED_POOLS[key] = ImportWorkerPool(
+                processes,
+                max_jobs,
+                max_memory
+            )
+            atexit.register(pool.close)
+        return pool
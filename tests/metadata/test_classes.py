@@ -1,8 +1,17 @@
 """Tests for callables.py"""
 
-from jetblack_markdown.metadata.classes import ClassDescriptor
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import gc
+import weakref
 
-from ..mocks import MockClass, MockNamedTuple
+from jetblack_markdown.metadata.callables import CallableDescriptor
+from jetblack_markdown.metadata.classes import (
+    ClassDescriptor,
+    MemberDescriptorCache
+)
+
+from ..mocks import MockClass, MockNamedTuple, mock_func
 
 
 def test_default():
@@ -14,3 +23,66 @@ def test_named_tuple():
     """Test for NamedTuple"""
     class_desc = ClassDescriptor.create(MockNamedTuple, True, True, True, True)
     assert class_desc
+
+
+def test_inherited_members_are_shared():
+    """Test inherited members share their descriptors across subclasses"""
+
+    class First(MockClass):
+        """The first subclass"""
+
+    class Second(MockClass):
+        """The second subclass"""
+
+    first = ClassDescriptor.create(First, True, True, True, False)
+    second = ClassDescriptor.create(Second, True, True, True, False)
+
+    first_method, = first.methods
+    second_method, = second.methods
+    assert first_method.qualifier.endswith('First')
+    assert second_method.qualifier.endswith('Second')
+    assert first_method.arguments is second_method.arguments
+    assert first.class_methods[0].arguments is second.class_methods[0].arguments
+
+
+def test_member_cache_threads():
+    """Test each thread has its own member descriptors, and clearing the
+    cache clears them for every thread"""
+    cache = MemberDescriptorCache()
+
+    def describe() -> CallableDescriptor:
+        return cache.get(
+            mock_func,
+            'key',
+            'qualifier',
+            partial(CallableDescriptor.create, mock_func)
+        )
+
+    first = describe().arguments
+    assert describe().arguments is first
+    with ThreadPoolExecutor(1) as executor:
+        other = executor.submit(describe).result().arguments
+        assert other is not first
+        cache.clear()
+        assert executor.submit(describe).result().arguments is not other
+    assert describe().arguments is not first
+
+
+def test_member_cache_weak():
+    """Test the member cache does not keep the described objects alive"""
+    cache = MemberDescriptorCache()
+
+    def described(value: int) -> int:
+        """A function to describe"""
+        return value
+
+    cache.get(
+        described,
+        'key',
+        'qualifier',
+        partial(CallableDescriptor.create, described)
+    )
+    reference = weakref.ref(described)
+    del described
+    gc.collect()
+    assert reference() is None
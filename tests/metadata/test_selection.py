@@ -0,0 +1,139 @@
+"""Tests for selection.py"""
+
+from types import ModuleType
+from typing import List
+
+import markdown
+import pytest
+
+from jetblack_markdown.autodoc import AutodocExtension
+from jetblack_markdown.metadata import ClassDescriptor, ModuleDescriptor
+from jetblack_markdown.metadata.selection import (
+    is_name_selected,
+    is_selected,
+    parse_selection
+)
+
+from .. import mocks
+from ..mocks import MockOuter
+
+
+def test_parse_selection():
+    """Test parsing selections"""
+    assert parse_selection('MockClass, mock_*') == ('MockClass', 'mock_*')
+    assert parse_selection('class:, function:mock_*') == (
+        'class:*',
+        'function:mock_*'
+    )
+    assert parse_selection(' ') == ()
+    with pytest.raises(ValueError):
+        parse_selection('klass:*')
+
+
+def test_is_selected():
+    """Test matching members with a selection"""
+    assert is_selected(None, 'class', 'Anything')
+    assert is_selected(('Mock*',), 'class', 'MockClass')
+    assert is_selected(('class:*',), 'class', 'MockClass')
+    assert not is_selected(('class:*',), 'function', 'mock_func')
+    assert not is_selected((), 'class', 'MockClass')
+
+
+def test_is_name_selected():
+    """Test matching member names whatever their kind"""
+    assert is_name_selected(None, 'Anything')
+    assert is_name_selected(('class:Mock*',), 'MockClass')
+    assert is_name_selected(('function:*',), 'mock_func')
+    assert not is_name_selected(('class:Mock*', 'mock_func'), 'mock_factory')
+
+
+def test_module_selection(monkeypatch):
+    """Test unselected module members are not described"""
+    described = []
+    create = ClassDescriptor.create
+
+    def create_class(obj, *args, **kwargs):
+        described.append(obj.__name__)
+        return create(obj, *args, **kwargs)
+
+    monkeypatch.setattr(ClassDescriptor, 'create', create_class)
+
+    module_desc = ModuleDescriptor.create(
+        mocks, True, True, True, False, True, True, False,
+        ('MockClass', 'function:mock_func'),
+    )
+    assert [desc.name for desc in module_desc.classes] == ['MockClass']
+    assert [desc.name for desc in module_desc.functions] == ['mock_func']
+    assert described == ['MockClass']
+
+
+def test_class_selection():
+    """Test selecting the members of a class"""
+    class_desc = ClassDescriptor.create(
+        MockOuter, True, True, True, True,
+        selection=('property:*',)
+    )
+    assert [desc.name for desc in class_desc.properties] == ['a_property']
+    assert not class_desc.methods
+    assert not class_desc.class_methods
+
+
+def test_selection_directive():
+    """Test directives selecting the members of a module"""
+    output = markdown.markdown(
+        '@[tests.mocks]{class:, mock_func}',
+        extensions=[AutodocExtension()]
+    )
+    assert 'MockClass' in output
+    assert 'MockOuter' in output
+    assert '>mock_func<' in output
+    assert 'mock_func_with_kwargs' not in output
+    assert 'mock_factory' not in output
+
+
+ACCESSED: List[str] = []
+
+
+class _RecordingModule(ModuleType):
+
+    def __getattribute__(self, name):
+        ACCESSED.append(name)
+        return super().__getattribute__(name)
+
+
+class _RecordingType(type):
+
+    def __getattribute__(cls, name):
+        ACCESSED.append(name)
+        return super().__getattribute__(name)
+
+
+class Recorded(metaclass=_RecordingType):
+    """A class recording access to its attributes"""
+
+    def selected(self) -> None:
+        """A selected method"""
+
+    def unselected(self) -> None:
+        """An unselected method"""
+
+
+def test_unselected_not_fetched():
+    """Test the attributes of unselected members are not fetched"""
+    module = _RecordingModule(mocks.__name__)
+    module.__dict__.update(vars(mocks))
+    ACCESSED.clear()
+    ModuleDescriptor.create(
+        module, True, True, True, False, True, True, False,
+        ('MockClass',),
+    )
+    assert 'MockClass' in ACCESSED
+    assert 'mock_func' not in ACCESSED
+
+    ACCESSED.clear()
+    class_desc = ClassDescriptor.create(
+        Recorded, True, True, True, True,
+        selection=('method:selected',)
+    )
+    assert [desc.name for desc in class_desc.methods] == ['selected']
+    assert 'unselected' not in ACCESSED
@@ -0,0 +1,36 @@
+"""Tests for serialization.py"""
+
+import pickle
+
+from jetblack_markdown.metadata import (
+    ArgumentDescriptor,
+    DescriptorOptions,
+    create_descriptor,
+    deserialize_descriptor,
+    serialize_descriptor
+)
+
+from .. import mocks
+
+
+def test_round_trip():
+    """Test descriptors survive serialization"""
+    options = DescriptorOptions(prefer_docstring=False, follow_module_tree=True)
+    for obj in (mocks, mocks.MockClass, mocks.MockNamedTuple, mocks.mock_func):
+        data = serialize_descriptor(create_descriptor(obj, options))
+        data = pickle.loads(pickle.dumps(data))
+        descriptor = deserialize_descriptor(data)
+        assert serialize_descriptor(descriptor) == data
+
+
+def test_argument_defaults():
+    """Test argument defaults keep their optionality"""
+    descriptor = deserialize_descriptor(
+        serialize_descriptor(
+            create_descriptor(mocks.mock_func, DescriptorOptions())
+        )
+    )
+    arg_one, arg_two = descriptor.arguments
+    assert arg_one.default is ArgumentDescriptor.EMPTY
+    assert not arg_one.is_optional
+    assert arg_two.is_optional
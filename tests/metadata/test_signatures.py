@@ -0,0 +1,34 @@
+"""Tests for signatures.py"""
+
+import inspect
+
+import pytest
+
+from jetblack_markdown.metadata.signatures import (
+    get_return_annotation,
+    get_signature
+)
+
+from ..mocks import MockClass, MockOuter, mock_func
+
+
+def test_get_signature():
+    """Test the signatures match inspect.signature"""
+    for obj in (mock_func, MockClass, MockClass.a_class_method, MockClass(
+            'arg').an_instance_method):
+        assert get_signature(obj) == inspect.signature(obj)
+    assert get_signature(mock_func) is get_signature(mock_func)
+
+
+def test_no_signature():
+    """Test objects without a signature raise ValueError every time"""
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            get_signature(dict)
+
+
+def test_get_return_annotation():
+    """Test return annotations are read from the function"""
+    getter = MockOuter.a_property.fget
+    assert get_return_annotation(getter) == inspect.signature(getter).return_annotation
+    assert get_return_annotation(lambda: None) is inspect.Signature.empty
@@ -1,6 +1,11 @@
 """Tests on utils.py"""
 
-from jetblack_markdown.metadata.utils import is_named_tuple_type
+import sys
+
+from jetblack_markdown.metadata.utils import (
+    is_named_tuple_type,
+    make_file_relative
+)
 
 from ..mocks import MockNamedTuple, MockClass, mock_func
 
@@ -10,3 +15,39 @@ def test_is_named_tuple():
     assert is_named_tuple_type(MockNamedTuple)
     assert not is_named_tuple_type(MockClass)
     assert not is_named_tuple_type(mock_func)
+
+
+def test_make_file_relative(monkeypatch):
+    """Test files are made relative to the longest path"""
+    monkeypatch.setattr(
+        sys,
+        'path',
+        ['/venv/lib', '/venv/lib/site-packages', '/src/']
+    )
+    assert make_file_relative(
+        '/venv/lib/site-packages/pkg/mod.py'
+    ) == 'pkg/mod.py'
+    assert make_file_relative('/venv/lib/os.py') == 'os.py'
+    assert make_file_relative('/src/pkg/mod.py') == 'pkg/mod.py'
+    assert make_file_relative('/srcs/pkg/mod.py') == '/srcs/pkg/mod.py'
+    assert make_file_relative(None) is None
+
+    sys.path.append('/srcs')
+    assert make_file_relative('/srcs/pkg/mod.py') == 'pkg/mod.py'
+
+    monkeypatch.setattr(sys, 'path', ['/venv/lib', '/venv', '/src/', '/srcs'])
+    assert make_file_relative(
+        '/venv/lib/site-packages/pkg/mod.py'
+    ) == 'site-packages/pkg/mod.py'
+
+    sys.path[3] = '/opt'
+    assert make_file_relative('/opt/pkg/mod.py') == 'pkg/mod.py'
+    assert make_file_relative('/srcs/pkg/mod.py') == '/srcs/pkg/mod.py'
+
+
+def test_make_file_relative_cwd(monkeypatch, tmp_path):
+    """Test the empty path is the current folder, not the root"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'path', ['', '/venv/lib'])
+    assert make_file_relative(str(tmp_path / 'mod.py')) == 'mod.py'
+    assert make_file_relative('/opt/x/mod.py') == '/opt/x/mod.py'
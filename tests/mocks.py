@@ -87,3 +87,54 @@ class MockNamedTuple(NamedTuple):
     optional_int: Optional[int]
     str_with_default: str = 'string'
     optional_int_with_default: Optional[int] = None
+
+
+class MockOuter:
+    """An outer class"""
+
+    class Inner:
+        """An inner class"""
+
+        def inner_method(self, arg1: int) -> int:
+            """An inner method
+
+            Args:
+                arg1 (int): The first arg
+
+            Returns:
+                int: The return value
+            """
+            return arg1
+
+    @property
+    def a_property(self) -> Optional[str]:
+        """A property
+
+        Returns:
+            Optional[str]: The property value
+        """
+        return None
+
+    @staticmethod
+    def a_static_method(arg1: str) -> str:
+        """A static method
+
+        Args:
+            arg1 (str): The first arg
+
+        Returns:
+            str: The return value
+        """
+        return arg1
+
+
+def mock_factory(arg1: str) -> MockClass:
+    """Create a mock class
+
+    Args:
+        arg1 (str): The first arg
+
+    Returns:
+        MockClass: The mock class
+    """
+    return MockClass(arg1)
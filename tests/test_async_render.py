@@ -0,0 +1,52 @@
+"""Tests for rendering from asyncio"""
+
+import asyncio
+import threading
+
+from jetblack_markdown.async_render import AsyncRenderer
+
+
+def test_render():
+    """Test concurrent identical renders are coalesced"""
+
+    async def run():
+        async with AsyncRenderer(['jetblack_markdown.autodoc']) as renderer:
+            results = await asyncio.gather(*[
+                renderer.render('@[tests.mocks:MockClass]')
+                for _ in range(10)
+            ])
+            assert len(set(results)) == 1
+            assert 'autodoc-class' in results[0]
+            assert renderer.stats()['renders'] == 1
+            assert renderer.stats()['pending'] == 0
+
+    asyncio.run(run())
+
+
+def test_cancel():
+    """Test a render nobody is waiting for is cancelled before it starts"""
+
+    async def run():
+        renderer = AsyncRenderer(['jetblack_markdown.autodoc'], max_workers=1)
+        release = threading.Event()
+        original_render = renderer.daemon.render
+
+        def blocking_render(text: str) -> str:
+            release.wait()
+            return original_render(text)
+
+        renderer.daemon.render = blocking_render  # type: ignore
+
+        blocked = asyncio.ensure_future(renderer.render('# Blocked'))
+        queued = asyncio.ensure_future(renderer.render('# Queued'))
+        await asyncio.sleep(0.1)
+        queued.cancel()
+        await asyncio.sleep(0.1)
+        release.set()
+
+        assert await blocked == '<h1>Blocked</h1>'
+        assert queued.cancelled()
+        assert renderer.stats()['renders'] == 1
+        await renderer.close()
+
+    asyncio.run(run())
@@ -0,0 +1,72 @@
+"""Tests for the autodoc block processor"""
+
+import io
+import os
+import xml.etree.ElementTree as etree
+
+import markdown
+
+import jetblack_markdown
+from jetblack_markdown.autodoc import AutodocExtension
+
+
+def test_render_stream():
+    """Test streamed rendering matches rendering to a string"""
+    md = markdown.Markdown(extensions=[AutodocExtension(follow_module_tree=True)])
+    processor = md.parser.blockprocessors['autodoc']
+    fragments = list(processor.render_stream('tests.mocks'))
+    assert len(fragments) > 1
+
+    sink = io.StringIO()
+    length = processor.render_to('tests.mocks', sink)
+    assert sink.getvalue() == ''.join(fragments)
+    assert length == len(sink.getvalue())
+    assert etree.fromstring(sink.getvalue()).tag == 'div'
+    assert sink.getvalue() == processor.template.render(
+        obj=processor.prepare('tests.mocks'),
+        directive='tests.mocks'
+    )
+
+
+def test_render_module_override(tmp_path):
+    """Test an overridden render_module macro is used for modules"""
+    macros_file = os.path.join(
+        os.path.dirname(jetblack_markdown.__file__),
+        'templates',
+        'macros.jinja2'
+    )
+    with open(macros_file, 'rt', encoding='utf-8') as file_ptr:
+        macros = file_ptr.read()
+    start = macros.index('{% macro render_module(module) -%}')
+    end = macros.index('{%- endmacro %}', start)
+    (tmp_path / 'macros.jinja2').write_text(
+        macros[:start] +
+        '{% macro render_module(module) -%}\n' +
+        '<div class="custom-module">{{ module.name }}</div>\n' +
+        macros[end:]
+    )
+    output = markdown.markdown(
+        '@[tests.mocks]',
+        extensions=[AutodocExtension(template_folder=str(tmp_path))]
+    )
+    assert output == '<div class="custom-module">tests.mocks</div>'
+
+
+def documented_with_code() -> None:
+    """A function with code.
+
+    The description has a code block.
+
+        def __init__(self, *args, **kwargs):
+            pass
+    """
+
+
+def test_code_blocks():
+    """Test the code blocks of docstrings are not processed as markdown"""
+    output = markdown.markdown(
+        '@[tests.test_autodoc_processor:documented_with_code]',
+        extensions=[AutodocExtension()]
+    )
+    assert 'def __init__(self, *args, **kwargs):' in output
+    assert '<strong>' not in output and '<em>' not in output
@@ -0,0 +1,81 @@
+"""Tests for the benchmark suite"""
+
+import json
+
+from benchmarks.bench_autodoc import STAGES, run_benchmark
+from benchmarks.bench_corpus import VARIANTS, run_corpus
+from benchmarks.regression import CASES, compare, main, measure
+from benchmarks.synthetic import PackageSpec
+
+
+def test_synthetic_benchmark():
+    """Check the benchmark runs over a small synthetic package"""
+    spec = PackageSpec(
+        name='tiny_synthetic_pkg',
+        modules=2,
+        classes=3,
+        depth=2,
+        width=3,
+        docstring_lines=2,
+        named_tuples=1
+    )
+    result = run_benchmark(spec, 1)
+    assert set(result['stages']) == set(STAGES)
+    assert result['html_length'] > 0
+    assert result['md_format_calls'] > 0
+
+
+def test_regression_check():
+    """Check the regression harness measures the cases and flags slowdowns"""
+    current = measure(2)
+    assert set(current['cases']) == set(CASES)
+
+    baseline = {
+        'threshold': 0.25,
+        'cases': {
+            'autodoc': {'normalised': 1.0},
+            'descriptor': {'normalised': 1.0, 'threshold': 0.5},
+        }
+    }
+    slower = {
+        'cases': {
+            'autodoc': {'normalised': 1.3},
+            'descriptor': {'normalised': 1.3},
+            'latex': {'normalised': 1.0},
+        }
+    }
+    results = {result.name: result for result in compare(baseline, slower)}
+    assert set(results) == {'autodoc', 'descriptor'}
+    assert results['autodoc'].is_regression
+    assert not results['descriptor'].is_regression
+    assert not any(
+        result.is_regression
+        for result in compare(baseline, slower, threshold=0.5)
+    )
+
+
+
+def test_regression_baseline_threshold(tmp_path, monkeypatch):
+    """Check an explicit threshold of zero is written to the baseline"""
+    monkeypatch.setattr(
+        'benchmarks.regression.measure',
+        lambda repeat: {'cases': {}}
+    )
+    baseline = tmp_path / 'baseline.json'
+    assert main(['--baseline', str(baseline), '--threshold', '0', '--update']) == 0
+    with open(baseline, 'rt', encoding='utf-8') as file_ptr:
+        assert json.load(file_ptr)['threshold'] == 0
+
+
+def test_corpus_equivalence():
+    """Check the faster paths match the reference over part of the corpus"""
+    modules = ['configparser', 'json.decoder']
+    variants = [
+        variant
+        for variant in VARIANTS
+        if variant.name in ('caches', 'element')
+    ]
+    result = run_corpus(modules, variants)
+    assert set(result['hashes']) == set(modules)
+    assert set(result['timings']) == {'reference', 'caches', 'element'}
+    assert result['mismatches'] == {'caches': [], 'element': []}
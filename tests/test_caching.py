@@ -0,0 +1,49 @@
+"""Tests for the caches"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from jetblack_markdown.caching import LRUCache, create_cache
+
+
+def test_lru_cache():
+    """Test the least recently used entries are evicted"""
+    cache: LRUCache[int] = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get_or_create('c', lambda: 4) == 3
+    assert cache.stats() == {
+        'hits': 2,
+        'misses': 1,
+        'hit_rate': 2 / 3,
+        'size': 2,
+        'maxsize': 2,
+    }
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == 0
+
+
+def test_sharded_cache():
+    """Test a sharded cache shared between threads"""
+    cache: LRUCache[int] = LRUCache(1000, shards=8)
+
+    def fill(offset: int) -> None:
+        for value in range(100):
+            cache.get_or_create((offset, value), lambda: value)
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(fill, range(8)))
+
+    assert len(cache) == 800
+    assert cache.misses == 800
+    assert cache.get((3, 42)) == 42
+
+
+def test_create_cache():
+    """Test creating caches from config values"""
+    cache = LRUCache()
+    assert create_cache(cache) is cache
+    assert create_cache(0) is None
+    assert create_cache(10).maxsize == 10
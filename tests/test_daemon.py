@@ -0,0 +1,99 @@
+"""Tests for the render daemon"""
+
+from concurrent.futures import ThreadPoolExecutor
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+
+from jetblack_markdown.daemon import RenderClient, RenderDaemon, RenderServer, serve_stdio
+
+
+def test_render_caches():
+    """Test renders share the descriptor, fragment and MathML caches"""
+    daemon = RenderDaemon(instances=2)
+    html = daemon.render('@[tests.mocks:mock_func]\n\n$$x^2$$')
+    assert 'autodoc-callable' in html
+    assert '<math' in html
+    assert daemon.render('@[tests.mocks:mock_func]\n\n$$x^2$$') == html
+
+    stats = daemon.stats()
+    assert stats['renders'] == 2
+    assert stats['descriptor_cache']['hits'] == 1
+    assert stats['fragment_cache']['hits'] > 0
+    assert stats['mathml_cache']['hits'] == 1
+
+    daemon.reset()
+    assert daemon.stats()['descriptor_cache']['size'] == 0
+
+
+def test_stdio():
+    """Test the stdin and stdout protocol"""
+    daemon = RenderDaemon(extensions=['jetblack_markdown.autodoc'])
+    reader = io.StringIO(
+        json.dumps({'id': 1, 'markdown': '@[tests.mocks:mock_func]'}) + '\n' +
+        json.dumps({'id': 2, 'command': 'unknown'}) + '\n' +
+        'not json\n'
+    )
+    writer = io.StringIO()
+    serve_stdio(daemon, reader, writer)
+    responses = {
+        response['id']: response
+        for response in map(json.loads, writer.getvalue().splitlines())
+    }
+    assert 'autodoc-callable' in responses[1]['html']
+    assert 'error' in responses[2]
+    assert 'error' in responses[None]
+
+
+def test_socket():
+    """Test concurrent clients over a Unix socket"""
+    daemon = RenderDaemon(extensions=['jetblack_markdown.autodoc'])
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'daemon.sock')
+        with RenderServer(path, daemon) as server:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                with RenderClient(path) as first, RenderClient(path) as second:
+                    expected = first.render('@[tests.mocks:MockClass]')
+                    assert second.render('@[tests.mocks:MockClass]') == expected
+                    assert first.request('ping')['ok']
+            finally:
+                server.shutdown()
+
+
+def test_reset_reimports(tmp_path, monkeypatch):
+    """Test a reset imports the documented code again"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module_file = tmp_path / 'edited_module.py'
+    module_file.write_text('"""The first version"""\n')
+    daemon = RenderDaemon(extensions=['jetblack_markdown.autodoc'])
+    try:
+        assert 'The first version' in daemon.render('@[edited_module]')
+
+        module_file.write_text('"""The second, edited version"""\n')
+        daemon.reset()
+        assert 'The second, edited version' in daemon.render('@[edited_module]')
+    finally:
+        sys.modules.pop('edited_module', None)
+
+
+def test_reset_during_renders():
+    """Test a reset waits for the renders in progress"""
+    daemon = RenderDaemon(extensions=['jetblack_markdown.autodoc'], instances=2)
+    expected = daemon.render('@[tests.mocks:MockClass]')
+
+    def render(_index):
+        return daemon.render('@[tests.mocks:MockClass]')
+
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(render, index) for index in range(40)]
+        for _ in range(10):
+            daemon.reset()
+        results = [future.result() for future in futures]
+
+    assert results == [expected] * 40
+    assert 'tests.mocks' in sys.modules
@@ -0,0 +1,69 @@
+"""Tests for the element renderer"""
+
+from typing import Any, Dict, Optional
+import xml.etree.ElementTree as etree
+from xml.etree.ElementTree import Element
+
+import markdown
+import pytest
+
+from jetblack_markdown.symbols import SymbolIndex
+
+DIRECTIVES = [
+    'tests.mocks',
+    'tests.mocks:MockClass',
+    'tests.mocks:mock_func',
+    'tests.mocks:mock_func_with_kwargs',
+    'tests.mocks:MockOuter',
+    'tests.mocks:MockOuter.a_property',
+    'tests.mocks:MockNamedTuple',
+    'jetblack_markdown.caching',
+    'builtins:dict',
+    'tests.test_element_renderer:undocumented',
+]
+
+
+def undocumented(value: int) -> int:
+    return value
+
+
+def _normalize(element: Element) -> Any:
+    # Whitespace between the elements is not reproduced.
+    text = (element.text or '').strip()
+    return (
+        element.tag,
+        sorted(element.attrib.items()),
+        text,
+        [
+            item
+            for child in element
+            for item in (_normalize(child), (child.tail or '').strip())
+            if item
+        ]
+    )
+
+
+def _render(directive: str, config: Optional[Dict[str, Any]] = None) -> Any:
+    html = markdown.markdown(
+        f'@[{directive}]',
+        extensions=['jetblack_markdown.autodoc'],
+        extension_configs={'jetblack_markdown.autodoc': config or {}}
+    )
+    return _normalize(etree.fromstring(f'<body>{html}</body>'))
+
+
+@pytest.mark.parametrize('directive', DIRECTIVES)
+def test_element_matches_template(directive: str):
+    """Test the element renderer matches the templates"""
+    assert _render(directive, {'renderer': 'element'}) == _render(directive)
+
+
+def test_element_matches_template_with_links():
+    """Test the element renderer links types as the templates do"""
+    index = SymbolIndex()
+    _render('tests.mocks', {'symbol_index': index})
+    for directive in DIRECTIVES:
+        assert _render(
+            directive,
+            {'renderer': 'element', 'symbol_index': index}
+        ) == _render(directive, {'symbol_index': index})
@@ -0,0 +1,88 @@
+"""Tests for caching the docstring fragments"""
+
+import markdown
+import pytest
+
+from jetblack_markdown import StatsCollector
+from jetblack_markdown.caching import LRUCache
+
+PAGE = '\n\n'.join([
+    '@[tests.mocks]',
+    '@[tests.mocks:MockClass]',
+    '@[tests.mocks:mock_func]',
+    '@[tests.mocks:MockOuter]',
+])
+
+
+@pytest.mark.parametrize('renderer', ['template', 'element'])
+def test_cached_fragments_match(renderer: str):
+    """Test pages rendered with cached fragments are unchanged"""
+    expected = markdown.markdown(
+        PAGE,
+        extensions=['jetblack_markdown.autodoc'],
+        extension_configs={
+            'jetblack_markdown.autodoc': {'renderer': renderer}
+        }
+    )
+
+    cache = LRUCache()
+    collector = StatsCollector()
+    for _ in range(2):
+        html = markdown.markdown(
+            PAGE,
+            extensions=['jetblack_markdown.autodoc'],
+            extension_configs={
+                'jetblack_markdown.autodoc': {
+                    'renderer': renderer,
+                    'fragment_cache': cache,
+                    'instrumentation': collector,
+                }
+            }
+        )
+        assert html == expected
+
+    stats = cache.stats()
+    assert stats['hits'] > stats['size'] > 0
+    assert collector.counters['fragment_cache_hits'] == stats['hits']
+
+
+def test_parser_configuration():
+    """Test fragments are not shared between parser configurations"""
+    cache = LRUCache()
+    for extensions in (
+            ['jetblack_markdown.autodoc'],
+            ['jetblack_markdown.autodoc', 'admonition']
+    ):
+        markdown.markdown(
+            '@[tests.mocks:mock_func]',
+            extensions=extensions,
+            extension_configs={
+                'jetblack_markdown.autodoc': {'fragment_cache': cache}
+            }
+        )
+    assert cache.stats()['hits'] == 0
+
+
+def documented_with_footnote() -> None:
+    """A function with a footnote.
+
+    The description has a footnote[^1].
+
+    [^1]: The footnote text
+    """
+
+
+def test_stateful_extensions():
+    """Test fragments are parsed again when an extension keeps the
+    definitions it parses"""
+    cache = LRUCache()
+    for _ in range(2):
+        html = markdown.markdown(
+            '@[tests.test_fragment_cache:documented_with_footnote]',
+            extensions=['footnotes', 'jetblack_markdown.autodoc'],
+            extension_configs={
+                'jetblack_markdown.autodoc': {'fragment_cache': cache}
+            }
+        )
+        assert 'The footnote text' in html
+    assert cache.stats()['size'] == 0
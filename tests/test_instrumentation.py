@@ -0,0 +1,110 @@
+"""Tests for instrumentation.py"""
+
+import io
+import json
+
+import markdown
+import pytest
+
+from jetblack_markdown.autodoc import AutodocExtension
+from jetblack_markdown.instrumentation import (
+    NULL_INSTRUMENTATION,
+    MemoryProfiler,
+    StatsCollector,
+    create_instrumentation,
+    write_json_report
+)
+from jetblack_markdown.latex2mathml import Latex2MathMLExtension
+
+
+def test_stats_collector():
+    """Test the stages of the processors are collected"""
+    collector = StatsCollector()
+    content = """
+An inline formula $x^2$.
+
+@[tests.mocks:mock_func]
+"""
+    markdown.markdown(
+        content,
+        extensions=[
+            AutodocExtension(instrumentation=collector),
+            Latex2MathMLExtension(instrumentation=collector)
+        ]
+    )
+    report = collector.report()
+    for stage in ('import', 'descriptor', 'render', 'md_format', 'parse', 'convert'):
+        assert report['stages'][stage]['count'] > 0
+    assert report['counters']['directives'] == 1
+    assert report['counters']['formulas'] == 1
+    assert report['targets']['tests.mocks:mock_func']['stages']['md_format']['count'] > 0
+
+    buf = io.StringIO()
+    write_json_report(collector, buf)
+    assert json.loads(buf.getvalue()) == report
+
+
+def test_create_instrumentation():
+    """Test the instrumentation config"""
+    assert create_instrumentation('') is NULL_INSTRUMENTATION
+    collector = StatsCollector()
+    assert create_instrumentation(collector) is collector
+    assert isinstance(
+        create_instrumentation('jetblack_markdown.instrumentation:StatsCollector'),
+        StatsCollector
+    )
+
+
+def test_report_file_conflicts(tmp_path, monkeypatch):
+    """Test extensions share the collector of a report file, but may not ask
+    for a different instrumentation"""
+    monkeypatch.setattr('atexit.register', lambda *args: None)
+    report_file = str(tmp_path / 'report.json')
+    collector = create_instrumentation(None, report_file)
+    assert isinstance(collector, StatsCollector)
+    assert create_instrumentation('', report_file) is collector
+    assert create_instrumentation(
+        'jetblack_markdown.instrumentation:StatsCollector',
+        report_file
+    ) is collector
+    assert create_instrumentation(collector, report_file) is collector
+
+    with pytest.raises(ValueError):
+        create_instrumentation(
+            'jetblack_markdown.instrumentation:MemoryProfiler',
+            report_file
+        )
+    with pytest.raises(ValueError):
+        create_instrumentation(StatsCollector(), report_file)
+
+
+def test_memory_profiler():
+    """Test the memory of each directive is measured"""
+    profiler = MemoryProfiler()
+    with profiler.stage('outer', 'target'):
+        with profiler.stage('inner', 'target'):
+            buf = bytearray(1_000_000)
+        del buf
+        kept = bytearray(100_000)
+
+    outer = profiler.targets['target']['outer']
+    inner = profiler.targets['target']['inner']
+    assert inner.peak >= 1_000_000 and inner.retained >= 1_000_000
+    assert outer.peak >= inner.peak
+    assert 100_000 <= outer.retained < 1_000_000
+    del kept
+
+    profiler.reset()
+    markdown.markdown(
+        '@[tests.mocks:mock_func]\n\n@[tests.mocks]',
+        extensions=[AutodocExtension(instrumentation=profiler)]
+    )
+    report = profiler.report()
+    assert {target['target'] for target in report['targets']} == {
+        'tests.mocks',
+        'tests.mocks:mock_func'
+    }
+    peaks = [target['peak'] for target in report['targets']]
+    assert peaks == sorted(peaks, reverse=True)
+    for stage in ('directive', 'import', 'descriptor', 'render', 'parse'):
+        assert report['stages'][stage]['count'] == 2
@@ -0,0 +1,107 @@
+"""Tests for minified output"""
+
+import re
+from typing import List
+import xml.etree.ElementTree as etree
+
+from jinja2 import Environment
+from latex2mathml.converter import convert_to_element
+import markdown
+
+from jetblack_markdown.minify import MinifyExtension, compact_mathml
+
+
+def test_minify_template():
+    """Test the layout whitespace is removed from templates"""
+    env = Environment(extensions=[MinifyExtension])
+    template = env.from_string(
+        '<div>\n'
+        '  {% if name -%}\n'
+        '    <span>{{ name }} </span>\n'
+        '    <span> </span><span>one\n'
+        '    two</span>\n'
+        '  {%- endif %}\n'
+        '</div>\n'
+    )
+    assert template.render(name='x') == (
+        '<div><span>x </span><span> </span><span>one\n    two</span></div>'
+    )
+
+
+def test_minify_expressions():
+    """Test the layout next to an expression is reduced to a line break"""
+    env = Environment(extensions=[MinifyExtension])
+    template = env.from_string(
+        '<p>\n'
+        '  {{ first }}\n'
+        '  {{ second }}\n'
+        '  <span>{{ third }}</span>\n'
+        '</p>\n'
+    )
+    assert template.render(first='one', second='two', third='three') == (
+        '<p>\none\ntwo\n<span>three</span></p>'
+    )
+
+
+def _text_nodes(html: str) -> List[str]:
+    # The text and tails of the elements, with the runs of whitespace
+    # collapsed, and without those which are only whitespace.
+    root = etree.fromstring(f'<body>{html}</body>')
+    return [
+        text
+        for element in root.iter()
+        for text in (
+            re.sub(r'\s+', ' ', element.text or ''),
+            re.sub(r'\s+', ' ', element.tail or '')
+        )
+        if text.strip()
+    ]
+
+
+def documented_inline() -> None:
+    """A summary with *emphasised words* and `code spans` in it."""
+
+
+def test_minify_autodoc():
+    """Test the minified templates render the same text"""
+    def render(import_str: str, **config) -> str:
+        return markdown.markdown(
+            f'@[{import_str}]',
+            extensions=['jetblack_markdown.autodoc'],
+            extension_configs={'jetblack_markdown.autodoc': config}
+        )
+
+    for template_file in ('main.jinja2', 'main_verbose.jinja2'):
+        expected = render('tests.mocks', template_file=template_file)
+        actual = render('tests.mocks', template_file=template_file, minify=True)
+        assert len(actual) < len(expected)
+        # Whitespace within text is kept, so words are never joined.
+        assert _text_nodes(actual) == _text_nodes(expected)
+
+        actual = render(
+            'tests.test_minify:documented_inline',
+            template_file=template_file,
+            minify=True
+        )
+        assert (
+            'A summary with <em>emphasised words</em> and '
+            '<code>code spans</code> in it.'
+        ) in actual
+        assert 'function </span>' in actual
+
+    assert render('tests.mocks', minify=True) == render(
+        'tests.mocks',
+        minify=True,
+        renderer='element'
+    )
+
+
+def test_compact_mathml():
+    """Test redundant rows and character references are removed"""
+    element = compact_mathml(convert_to_element(r'\frac{a+b}{2} \le -x_1'))
+    assert etree.tostring(element, encoding='unicode') == (
+        '<math xmlns="http://www.w3.org/1998/Math/MathML" display="inline">'
+        '<mfrac><mrow><mi>a</mi><mo>+</mo><mi>b</mi></mrow><mn>2</mn></mfrac>'
+        '<mo>≤</mo><mo>−</mo><msub><mi>x</mi><mn>1</mn></msub>'
+        '</math>'
+    )
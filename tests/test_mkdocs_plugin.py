@@ -0,0 +1,76 @@
+"""Tests for the mkdocs plugin"""
+
+import json
+import os
+
+import pytest
+
+pytest.importorskip('mkdocs')
+
+# pylint: disable=wrong-import-position
+from mkdocs.commands.build import build
+from mkdocs.config import load_config
+
+from jetblack_markdown.mkdocs_plugin import AutodocPlugin
+
+
+def _write(path, text):
+    with open(path, 'wt', encoding='utf-8') as file_ptr:
+        file_ptr.write(text)
+
+
+def _load_config(root, options):
+    docs_dir = os.path.join(root, 'docs')
+    os.makedirs(docs_dir)
+    _write(
+        os.path.join(docs_dir, 'index.md'),
+        '# Mocks\n\n@[tests.mocks:MockClass]\n\n@[tests.mocks:mock_func]\n'
+    )
+    _write(
+        os.path.join(docs_dir, 'other.md'),
+        '# Other\n\n@[tests.mocks:mock_func]\n\n$$x^2$$\n'
+    )
+    _write(
+        os.path.join(root, 'mkdocs.yml'),
+        f"""
+site_name: test
+docs_dir: docs
+site_dir: site
+plugins:
+  - jetblack-markdown:
+      {options}
+      timings_report: {os.path.join(root, 'timings.json')}
+markdown_extensions:
+  - jetblack_markdown.autodoc:
+      descriptor_cache: 16
+  - jetblack_markdown.latex2mathml
+"""
+    )
+    return load_config(os.path.join(root, 'mkdocs.yml'))
+
+
+@pytest.mark.parametrize(
+    'options',
+    ['prerender_workers: 2', 'prewarm: true']
+)
+def test_build(tmp_path, options):
+    """Test a build shares the caches between pages and reports the timings"""
+    config = _load_config(str(tmp_path), options)
+    plugin = config.plugins['jetblack-markdown']
+    assert isinstance(plugin, AutodocPlugin)
+
+    build(config)
+
+    with open(tmp_path / 'site' / 'index.html', 'rt', encoding='utf-8') as file_ptr:
+        assert 'autodoc-class' in file_ptr.read()
+
+    with open(tmp_path / 'timings.json', 'rt', encoding='utf-8') as file_ptr:
+        report = json.load(file_ptr)
+    assert report['prewarm']['prepared'] == 2
+    assert report['prewarm']['errors'] == 0
+    assert report['instrumentation']['counters']['directives'] == 3
+    # The pages found the descriptors prepared in the background.
+    assert report['caches']['descriptor_cache']['hits'] >= 3
+    # The templates were compiled once for the build.
+    assert report['caches']['template_cache']['hits'] > 0
+    plugin.on_shutdown()
@@ -0,0 +1,104 @@
+"""Tests for pagination.py"""
+
+import os
+
+import markdown
+
+from jetblack_markdown.metadata import DescriptorOptions, create_descriptor
+from jetblack_markdown.pagination import paginate
+from jetblack_markdown.utils import import_from_string
+
+
+def test_paginate():
+    """Test a module tree is split into chunks"""
+    module = create_descriptor(
+        import_from_string('jetblack_markdown.metadata'),
+        DescriptorOptions(False, True, True, False, True, True, True)
+    )
+    chunks = paginate(module, 2)
+    names = [chunk.name for chunk in chunks]
+    assert len(names) == len(set(names))
+    assert names[0] == 'jetblack_markdown.metadata'
+    assert all(len(chunk.module.classes) <= 2 for chunk in chunks)
+    assert all(not chunk.module.modules for chunk in chunks)
+    assert sum(len(chunk.module.classes) for chunk in chunks) == sum(
+        len(child.classes) for child in [module, *module.modules]
+    )
+    # The original tree is unchanged.
+    assert module.modules
+
+
+def test_paginate_repeated_module():
+    """Test a module found more than once in the tree has one chunk"""
+    module = create_descriptor(
+        import_from_string('jetblack_markdown.metadata'),
+        DescriptorOptions(False, True, True, False, True, True, True)
+    )
+    # A module which imports its sibling has it as a child.
+    first, second, *_rest = module.modules
+    second.modules = [*second.modules, first]
+    names = [chunk.name for chunk in paginate(module)]
+    assert len(names) == len(set(names))
+    assert names.count(first.name) == 1
+
+
+def test_chunked_directive(tmp_path):
+    """Test a directive is written in chunks with an index on the page"""
+    expected = markdown.markdown(
+        '@[tests.mocks]',
+        extensions=['jetblack_markdown.autodoc']
+    )
+    html = markdown.markdown(
+        '@[tests.mocks]',
+        extensions=['jetblack_markdown.autodoc'],
+        extension_configs={
+            'jetblack_markdown.autodoc': {
+                'chunk_folder': str(tmp_path),
+                'chunk_url': 'api/',
+            }
+        }
+    )
+    assert 'autodoc-index' in html
+    assert 'href="api/tests.mocks.html"' in html
+    assert os.listdir(tmp_path) == ['tests.mocks.html']
+    with open(tmp_path / 'tests.mocks.html', encoding='utf-8') as file_ptr:
+        assert file_ptr.read().strip() == expected
+
+
+def test_chunked_selection(tmp_path):
+    """Test the chunks of a selection do not replace those of the module"""
+    config = {
+        'jetblack_markdown.autodoc': {
+            'chunk_folder': str(tmp_path),
+            'chunk_url': 'api/',
+        }
+    }
+    markdown.markdown(
+        '@[tests.mocks]\n\n@[tests.mocks]{MockClass}',
+        extensions=['jetblack_markdown.autodoc'],
+        extension_configs=config
+    )
+    file_names = sorted(os.listdir(tmp_path))
+    assert len(file_names) == 2
+    assert 'tests.mocks.html' in file_names
+    for file_name in file_names:
+        with open(tmp_path / file_name, encoding='utf-8') as file_ptr:
+            html = file_ptr.read()
+        assert ('mock_factory' in html) == (file_name == 'tests.mocks.html')
+
+
+def test_chunked_verbose_index(tmp_path):
+    """Test the index of a verbose template uses the verbose macros"""
+    html = markdown.markdown(
+        '@[tests.mocks]',
+        extensions=['jetblack_markdown.autodoc'],
+        extension_configs={
+            'jetblack_markdown.autodoc': {
+                'template_file': 'main_verbose.jinja2',
+                'chunk_folder': str(tmp_path),
+            }
+        }
+    )
+    assert 'autodoc-index' in html
+    # The verbose summary is not wrapped in a description.
+    assert 'autodoc-description' not in html
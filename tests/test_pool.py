@@ -0,0 +1,56 @@
+"""Tests for rendering on many threads"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import markdown
+
+from jetblack_markdown import StatsCollector
+from jetblack_markdown.caching import LRUCache
+from jetblack_markdown.pool import MarkdownPool
+from jetblack_markdown.utils import ImportResolver
+
+EXTENSIONS = ['jetblack_markdown.autodoc', 'jetblack_markdown.latex2mathml']
+
+PAGES = [
+    f'# Page {index}\n\n@[{directive}]\n\n$$x^{index}$$\n\nInline $y_{index}$.'
+    for index, directive in enumerate(
+        [
+            'tests.mocks',
+            'tests.mocks:MockClass',
+            'tests.mocks:mock_func',
+            'tests.mocks:MockOuter',
+            'tests.mocks:MockOuter.a_property',
+            'tests.mocks:MockNamedTuple',
+        ] * 4
+    )
+]
+
+
+def test_concurrent_matches_serial():
+    """Test pages rendered concurrently match pages rendered serially"""
+    expected = [
+        markdown.markdown(page, extensions=EXTENSIONS)
+        for page in PAGES
+    ]
+
+    collector = StatsCollector()
+    pool = MarkdownPool(
+        EXTENSIONS,
+        {
+            'jetblack_markdown.autodoc': {
+                'resolver': ImportResolver(),
+                'descriptor_cache': LRUCache(),
+                'instrumentation': collector,
+            },
+            'jetblack_markdown.latex2mathml': {
+                'mathml_cache': LRUCache(),
+            },
+        },
+        size=4
+    )
+    with ThreadPoolExecutor(8) as executor:
+        for _ in range(3):
+            assert list(executor.map(pool.convert, PAGES)) == expected
+
+    assert collector.counters['directives'] == 3 * len(PAGES)
+
@@ -0,0 +1,52 @@
+"""Tests for prewarm.py"""
+
+import markdown
+
+from jetblack_markdown.caching import LRUCache
+from jetblack_markdown.prewarm import Prewarmer, scan_directives
+
+
+def test_scan_directives(tmp_path):
+    """Test the directives of a docs tree are found"""
+    (tmp_path / 'api').mkdir()
+    (tmp_path / 'index.md').write_text(
+        '# Index\n\n@[tests.mocks:mock_func]\n\n```\n@[tests.fenced]\n```\n'
+    )
+    (tmp_path / 'api' / 'mocks.md').write_text('@[tests.mocks]{class:}\n')
+    (tmp_path / 'empty.md').write_text('# Nothing\n')
+    (tmp_path / 'notes.txt').write_text('@[tests.mocks]\n')
+
+    assert scan_directives(str(tmp_path)) == {
+        'api/mocks.md': [('tests.mocks', ('class:*',))],
+        'index.md': [('tests.mocks:mock_func', None)],
+    }
+
+
+def test_prewarmer():
+    """Test the descriptors are prepared in the descriptor cache"""
+    cache = LRUCache()
+    md = markdown.Markdown(
+        extensions=['jetblack_markdown.autodoc'],
+        extension_configs={
+            'jetblack_markdown.autodoc': {'descriptor_cache': cache}
+        }
+    )
+    prewarmer = Prewarmer(md.parser.blockprocessors['autodoc'], concurrency=2)
+    directives = [
+        ('tests.mocks:mock_func', None),
+        ('tests.mocks', ('class:*',)),
+        ('tests.missing', None),
+    ]
+    prewarmer.start(directives)
+    prewarmer.start(directives[:1])
+    prewarmer.wait()
+    prewarmer.close()
+
+    assert prewarmer.stats()['started'] == 3
+    assert prewarmer.stats()['prepared'] == 2
+    assert prewarmer.stats()['errors'] == 1
+    assert len(cache) == 2
+
+    html = md.convert('@[tests.mocks:mock_func]')
+    assert 'autodoc-callable' in html
+    assert cache.hits == 1
@@ -0,0 +1,35 @@
+"""Tests for the search index"""
+
+import markdown
+
+from jetblack_markdown import AutodocExtension
+from jetblack_markdown.search_index import SearchIndex
+
+
+def test_search_index():
+    """Test the symbols and terms are collected while rendering"""
+    index = SearchIndex()
+    markdown.markdown(
+        '@[tests.mocks]\n\n@[tests.mocks:MockOuter]',
+        extensions=[AutodocExtension(search_index=index, symbol_page='mocks.html')]
+    )
+    data = index.to_dict()
+    symbols = data['symbols']
+    names = [symbol[0].lower() for symbol in symbols]
+    assert names == sorted(names)
+
+    by_name = {symbol[1]: symbol for symbol in symbols}
+    assert by_name['tests.mocks.mock_func'] == [
+        'mock_func',
+        'tests.mocks.mock_func',
+        'function',
+        'mocks.html',
+        'The short description'
+    ]
+    assert by_name['tests.mocks.MockOuter.a_property'][2] == 'property'
+    assert by_name['tests.mocks.MockClass.an_instance_method'][2] == 'method'
+
+    position = names.index('mock_func')
+    assert position in data['terms']['short']
+    assert position in data['terms']['mock']
+    assert 'the' not in data['terms']
@@ -0,0 +1,81 @@
+"""Tests for the symbol index"""
+
+import os
+import tempfile
+
+import markdown
+
+from jetblack_markdown import AutodocExtension
+from jetblack_markdown.metadata import DescriptorOptions, create_descriptor
+from jetblack_markdown.symbols import SymbolIndex, qualified_name
+
+import tests.mocks
+
+
+def test_index():
+    """Test descriptors are indexed and names linked"""
+    descriptor = create_descriptor(tests.mocks, DescriptorOptions())
+    assert qualified_name(descriptor) == 'tests.mocks'
+
+    index = SymbolIndex()
+    index.add(descriptor, 'api/mocks.html')
+    assert 'tests.mocks.MockClass' in index
+    assert 'tests.mocks.mock_func' in index
+    assert 'tests.mocks.MockClass.an_instance_method' in index
+    assert index.url('MockClass') == 'api/mocks.html#tests.mocks.MockClass'
+    assert index.url('mock_func') is None
+    assert index.link('Optional[MockClass]') == (
+        'Optional[<a class="autodoc-link" '
+        'href="api/mocks.html#tests.mocks.MockClass">MockClass</a>]'
+    )
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'symbols.json')
+        index.save(path)
+        loaded = SymbolIndex.load(path)
+        assert len(loaded) == len(index)
+        assert loaded.url('MockClass') == index.url('MockClass')
+        assert loaded.url('mock_func') is None
+
+
+def test_ambiguous():
+    """Test classes sharing a name are not linked by the name"""
+    index = SymbolIndex(
+        {'a.Thing': 'a.html', 'b.Thing': 'b.html'},
+        ['a.Thing', 'b.Thing']
+    )
+    assert index.url('Thing') is None
+    assert index.url('a.Thing') == 'a.html#a.Thing'
+
+
+def test_ambiguous_persisted():
+    """Test a loaded index keeps the names shared by classes ambiguous"""
+    index = SymbolIndex(
+        {
+            'tests.mocks.MockClass': 'mocks.html',
+            'other.MockClass': 'other.html'
+        },
+        ['tests.mocks.MockClass', 'other.MockClass']
+    )
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'symbols.json')
+        index.save(path)
+        loaded = SymbolIndex.load(path)
+    loaded.add(
+        create_descriptor(tests.mocks.MockClass, DescriptorOptions()),
+        'mocks.html'
+    )
+    assert loaded.url('MockClass') is None
+    assert loaded.url('other.MockClass') == 'other.html#other.MockClass'
+
+
+def test_render_links():
+    """Test the rendered types link to the indexed symbols"""
+    index = SymbolIndex()
+    content = '@[tests.mocks:MockClass]\n\n@[tests.mocks:mock_factory]'
+    html = markdown.markdown(
+        content,
+        extensions=[AutodocExtension(symbol_index=index)]
+    )
+    assert 'id="tests.mocks.MockClass"' in html
+    assert 'href="#tests.mocks.MockClass">MockClass</a>' in html
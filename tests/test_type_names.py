@@ -0,0 +1,95 @@
+"""Tests for type_names.py"""
+
+from __future__ import annotations
+
+import collections.abc
+import inspect
+import sys
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union
+)
+
+import pytest
+
+from jetblack_markdown.type_names import TypeNameFormatter, format_annotation
+
+T = TypeVar('T')
+
+
+def test_typing_constructs():
+    """Test typing constructs are rendered structurally"""
+    assert format_annotation(int) == 'int'
+    assert format_annotation(None) == 'None'
+    assert format_annotation(Any) == 'Any'
+    assert format_annotation(List[Any]) == 'List[Any]'
+    assert format_annotation(Optional[int]) == 'Optional[int]'
+    assert format_annotation(Union[int, str, None]) == 'Union[int, str, None]'
+    assert format_annotation(Dict[str, List[int]]) == 'Dict[str, List[int]]'
+    assert format_annotation(Callable[[int, str], bool]) == 'Callable[[int, str], bool]'
+    assert format_annotation(Callable[..., int]) == 'Callable[..., int]'
+    assert format_annotation(
+        collections.abc.Callable[[int], str]
+    ) == 'Callable[[int], str]'
+    assert format_annotation(Literal['a', 1]) == "Literal['a', 1]"
+    assert format_annotation(Tuple[int, ...]) == 'Tuple[int, ...]'
+    assert format_annotation(Tuple[()]) == 'Tuple[()]'
+    assert format_annotation(T) == 'T'
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="requires PEP 604")
+def test_pep_604():
+    """Test PEP 604 unions"""
+    assert format_annotation(int | None) == 'int | None'
+    assert format_annotation(list[int | str]) == 'list[int | str]'
+
+
+def test_string_annotations():
+    """Test forward references and postponed annotations"""
+
+    def func(arg: Optional[List[int]], other: 'Forward') -> Dict[str, Any]:
+        pass
+
+    signature = inspect.signature(func)
+    assert format_annotation(
+        signature.parameters['arg'].annotation
+    ) == 'Optional[List[int]]'
+    assert format_annotation(signature.parameters['other'].annotation) == 'Forward'
+    assert format_annotation('typing.Optional[typing.List[int]]') == 'Optional[List[int]]'
+
+
+def test_memoized():
+    """Test results are memoized by annotation"""
+    formatter = TypeNameFormatter(maxsize=2)
+    annotation = Dict[str, List[int]]
+    assert formatter.format(annotation) is formatter.format(annotation)
+    for value in (int, str, float):
+        formatter.format(value)
+    assert formatter.format(annotation) == 'Dict[str, List[int]]'
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="requires PEP 612")
+def test_param_spec():
+    """Test callables with parameter specifications"""
+    # pylint: disable=import-outside-toplevel
+    from typing import Concatenate, ParamSpec
+
+    P = ParamSpec('P')
+    assert format_annotation(P) == 'P'
+    assert format_annotation(P.args) == 'P.args'
+    assert format_annotation(P.kwargs) == 'P.kwargs'
+    assert format_annotation(Callable[P, int]) == 'Callable[P, int]'
+    assert format_annotation(
+        collections.abc.Callable[P, int]
+    ) == 'Callable[P, int]'
+    assert format_annotation(Concatenate[int, P]) == 'Concatenate[int, P]'
+    assert format_annotation(
+        Callable[Concatenate[int, P], int]
+    ) == 'Callable[Concatenate[int, P], int]'
@@ -0,0 +1,112 @@
+"""Tests for utils.py"""
+
+from concurrent.futures import ThreadPoolExecutor
+import sys
+
+import markdown
+import pytest
+
+from jetblack_markdown.autodoc import AutodocExtension
+from jetblack_markdown.utils import ImportResolver, resolve_import_string
+
+from . import mocks
+
+
+def test_resolve_import_string():
+    """Test resolving nested members"""
+    target = resolve_import_string('tests.mocks')
+    assert target.obj is mocks and target.parent is None
+
+    target = resolve_import_string('tests.mocks:MockOuter.Inner.inner_method')
+    assert target.obj is mocks.MockOuter.Inner.inner_method
+    assert target.parent is mocks.MockOuter.Inner
+    assert target.name == 'inner_method'
+
+    with pytest.raises(ValueError):
+        resolve_import_string('tests.mocks:MockOuter.Missing')
+    with pytest.raises(ValueError):
+        resolve_import_string('missing_package.module')
+
+
+def test_member_directives():
+    """Test directives for members of classes"""
+    content = """
+@[tests.mocks:MockClass.a_class_method]
+
+@[tests.mocks:MockOuter.Inner.inner_method]
+
+@[tests.mocks:MockOuter.a_property]
+
+@[tests.mocks:MockOuter.a_static_method]
+"""
+    output = markdown.markdown(content, extensions=[AutodocExtension()])
+    assert 'class method </span><span class="autodoc-qualifier">MockClass<' in output
+    assert 'method </span><span class="autodoc-qualifier">MockOuter.Inner<' in output
+    assert 'property </span><span class="autodoc-qualifier">MockOuter<' in output
+    assert 'function </span><span class="autodoc-qualifier">MockOuter<' in output
+
+
+def test_import_resolver(monkeypatch):
+    """Test successes and failures are cached"""
+    calls = []
+
+    def resolve(import_str):
+        calls.append(import_str)
+        return resolve_import_string(import_str)
+
+    monkeypatch.setattr('jetblack_markdown.utils.resolve_import_string', resolve)
+    resolver = ImportResolver()
+    for _ in range(2):
+        assert resolver.resolve('tests.mocks:MockClass').obj is mocks.MockClass
+        with pytest.raises(ValueError):
+            resolver.resolve('tests.mocks:Missing')
+    assert calls == ['tests.mocks:MockClass', 'tests.mocks:Missing']
+
+    resolver.clear()
+    resolver.resolve('tests.mocks:MockClass')
+    assert len(calls) == 3
+
+
+def test_import_resolver_failures(tmp_path, monkeypatch):
+    """Test failures are raised as new errors, and are tried again when the
+    module may have been created"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    resolver = ImportResolver()
+    errors = []
+    for _ in range(2):
+        with pytest.raises(ValueError) as error:
+            resolver.resolve('late_module')
+        errors.append(error.value)
+    assert errors[0] is not errors[1]
+
+    (tmp_path / 'late_module.py').write_text('"""Created late"""\n')
+    with pytest.raises(ValueError):
+        resolver.resolve('late_module')
+    resolver.invalidate_caches()
+    assert resolver.resolve('late_module').obj.__doc__ == 'Created late'
+
+    other_path = tmp_path / 'other'
+    other_path.mkdir()
+    (other_path / 'other_module.py').write_text('"""On another path"""\n')
+    with pytest.raises(ValueError):
+        resolver.resolve('other_module')
+    monkeypatch.syspath_prepend(str(other_path))
+    assert resolver.resolve('other_module').obj.__doc__ == 'On another path'
+
+    del sys.modules['late_module']
+    del sys.modules['other_module']
+
+
+def test_import_resolver_threads():
+    """Test a resolver shared between threads"""
+    resolver = ImportResolver()
+    import_strs = ['tests.mocks:MockClass', 'tests.mocks:mock_func'] * 50
+
+    def resolve(import_str):
+        if import_str.endswith('func'):
+            resolver.clear()
+        return resolver.resolve(import_str).obj
+
+    with ThreadPoolExecutor(8) as executor:
+        objs = list(executor.map(resolve, import_strs))
+    assert objs == [mocks.MockClass, mocks.mock_func] * 50
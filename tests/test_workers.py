@@ -0,0 +1,72 @@
+"""Tests for workers.py"""
+
+import os
+import signal
+
+import markdown
+import pytest
+
+from jetblack_markdown.autodoc import AutodocExtension
+from jetblack_markdown.metadata import DescriptorOptions
+from jetblack_markdown.workers import ImportWorkerPool
+
+
+def test_worker_output_matches():
+    """Test rendering with workers matches rendering in process"""
+    content = """
+@[tests.mocks]
+
+@[tests.mocks:MockClass]
+"""
+    expected = markdown.markdown(content, extensions=[AutodocExtension()])
+    actual = markdown.markdown(
+        content,
+        extensions=[AutodocExtension(import_workers=1)]
+    )
+    assert actual == expected
+
+
+def test_worker_recycling():
+    """Test workers are recycled and errors are returned"""
+    with ImportWorkerPool(processes=1, max_jobs=2) as pool:
+        for _ in range(3):
+            descriptor = pool.create_descriptor(
+                'tests.mocks:mock_func',
+                DescriptorOptions()
+            )
+            assert descriptor.name == 'mock_func'
+        assert pool.jobs_completed == 3
+        assert pool.workers_recycled == 1
+
+        with pytest.raises(ValueError):
+            pool.create_descriptor('tests.mocks:Missing', DescriptorOptions())
+
+
+def test_dead_worker_replaced():
+    """Test a worker which died while idle is replaced"""
+    with ImportWorkerPool(processes=1) as pool:
+        pool.create_descriptor('tests.mocks:mock_func', DescriptorOptions())
+        worker = pool._idle.queue[0]  # pylint: disable=protected-access
+        os.kill(worker.process.pid, signal.SIGKILL)
+        worker.process.join()
+
+        descriptor = pool.create_descriptor(
+            'tests.mocks:mock_func',
+            DescriptorOptions()
+        )
+        assert descriptor.name == 'mock_func'
+
+        # A worker which dies after it was checked fails the job, and is
+        # replaced for the next one.
+        worker = pool._idle.queue[0]  # pylint: disable=protected-access
+        os.kill(worker.process.pid, signal.SIGKILL)
+        worker.process.join()
+        worker.process.is_alive = lambda: True
+        with pytest.raises(RuntimeError):
+            pool.create_descriptor('tests.mocks:mock_func', DescriptorOptions())
+
+        descriptor = pool.create_descriptor(
+            'tests.mocks:mock_func',
+            DescriptorOptions()
+        )
+        assert descriptor.name == 'mock_func'